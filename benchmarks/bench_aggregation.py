@@ -0,0 +1,68 @@
+"""
+Benchmark of the aggregation backends of report 1
+
+Compares the pandas groupby and the numpy segmented reduction
+aggregating the trades per ISIN and day.
+
+Usage: python -m benchmarks.bench_aggregation --rows 100000 1000000 10000000 --days 5
+"""
+import argparse
+import statistics
+import time
+
+import pandas as pd
+
+from tradeETL.transformers.aggregations import aggregate_ohlcv_pandas, aggregate_ohlcv_numpy
+from tradeETL.transformers.etl_transformer import etlSourceConfig, etlTargetConfig
+from benchmarks.xetra_data import make_xetra_frame, SRC_COLUMNS
+
+SRC_ARGS = etlSourceConfig(
+    src_first_extract_date='2021-04-01', src_columns=SRC_COLUMNS, src_col_date='Date',
+    src_col_isin='ISIN', src_col_time='Time', src_col_start_price='StartPrice',
+    src_col_min_price='MinPrice', src_col_max_price='MaxPrice',
+    src_col_traded_vol='TradedVolume')
+TRG_ARGS = etlTargetConfig(
+    trg_col_isin='isin', trg_col_date='date', trg_col_op_price='opening_price_eur',
+    trg_col_clos_price='closing_price_eur', trg_col_min_price='minimum_price_eur',
+    trg_col_max_price='maximum_price_eur', trg_col_dail_trad_vol='daily_traded_volume',
+    trg_col_ch_prev_clos='change_prev_closing_%', trg_key='report1/Trade_daily_report1_',
+    trg_key_date_format='%Y%m%d_%H%M%S', trg_format='parquet')
+BACKENDS = (('pandas', aggregate_ohlcv_pandas), ('numpy', aggregate_ohlcv_numpy))
+
+def aggregation_time(aggregate, data_frame: pd.DataFrame, repeat: int):
+    """
+    Returns the median wall clock time of the aggregation in seconds
+    """
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        aggregate(data_frame, SRC_ARGS, TRG_ARGS)
+        timings.append(time.perf_counter() - start)
+    return statistics.median(timings)
+
+def main():
+    """
+    Entry point of the benchmark
+    """
+    parser = argparse.ArgumentParser(description='Benchmark the aggregation backends.')
+    parser.add_argument('--rows', type=int, nargs='+', default=[100000, 1000000, 10000000])
+    parser.add_argument('--days', type=int, default=5)
+    parser.add_argument('--category', action='store_true',
+                        help='use category ISINs like the arrow engine with a schema')
+    parser.add_argument('--repeat', type=int, default=3)
+    args = parser.parse_args()
+    print(f'{"rows":>10} {"groups":>8} {"backend":>8} {"ms":>9} {"speedup":>8}')
+    for n_rows in args.rows:
+        data_frame = make_xetra_frame(n_rows, n_days=args.days)
+        if args.category:
+            data_frame['ISIN'] = data_frame['ISIN'].astype('category')
+        n_groups = len(aggregate_ohlcv_numpy(data_frame, SRC_ARGS, TRG_ARGS))
+        baseline = None
+        for backend, aggregate in BACKENDS:
+            seconds = aggregation_time(aggregate, data_frame, args.repeat)
+            baseline = baseline or seconds
+            print(f'{n_rows:>10} {n_groups:>8} {backend:>8} {seconds * 1000:>9.1f} '
+                  f'{baseline / seconds:>7.2f}x')
+
+if __name__ == '__main__':
+    main()
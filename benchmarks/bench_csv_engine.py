@@ -0,0 +1,78 @@
+"""
+Benchmark of the csv engines used by S3BucketConnector.read_csv_to_df
+
+Shows the peak memory of the whole read_csv_* call, from the bytes of the
+body to the data frame, and the parse time of the pandas and the arrow engine.
+
+Usage: python -m benchmarks.bench_csv_engine --rows 10000 100000 1000000
+"""
+import argparse
+import statistics
+import time
+import tracemalloc
+
+import pyarrow as pa
+
+from tradeETL.common.csv_engines import read_csv_pandas, read_csv_arrow
+from benchmarks.xetra_data import make_xetra_csv
+
+DTYPE = {'Date': 'str', 'Time': 'str'}
+
+def read_peak_bytes(read_csv, body: bytes):
+    """
+    Measures the peak memory of parsing body into a data frame
+
+    The Python heap, which also holds the numpy arrays and str objects of the
+    data frame, is traced with tracemalloc. The Arrow buffers are allocated
+    outside of it and are counted by a proxy of the Arrow memory pool, so
+    the conversion of the arrow engine with to_pandas is included.
+
+    returns:
+    python_peak: peak bytes allocated on the Python heap during the call
+    arrow_peak: peak bytes allocated by the Arrow memory pool during the call
+    """
+    default_pool = pa.default_memory_pool()
+    proxy_pool = pa.proxy_memory_pool(default_pool)
+    pa.set_memory_pool(proxy_pool)
+    tracemalloc.start()
+    try:
+        data_frame = read_csv(body, dtype=DTYPE)
+        _, python_peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+        pa.set_memory_pool(default_pool)
+    del data_frame
+    return python_peak, proxy_pool.max_memory()
+
+def parse_time(read_csv, body: bytes, repeat: int):
+    """
+    Returns the median wall clock time of parsing body in seconds
+    """
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        read_csv(body, dtype=DTYPE)
+        timings.append(time.perf_counter() - start)
+    return statistics.median(timings)
+
+def main():
+    """
+    Entry point of the benchmark
+    """
+    parser = argparse.ArgumentParser(description='Benchmark the csv engines.')
+    parser.add_argument('--rows', type=int, nargs='+', default=[10000, 100000, 1000000])
+    parser.add_argument('--repeat', type=int, default=5)
+    args = parser.parse_args()
+    print(f'{"rows":>10} {"body MiB":>9} {"engine":>7} {"python MiB":>11} {"arrow MiB":>10} '
+          f'{"parse ms":>9}')
+    for n_rows in args.rows:
+        body = make_xetra_csv(n_rows)
+        for engine, read_csv in (('pandas', read_csv_pandas), ('arrow', read_csv_arrow)):
+            python_peak, arrow_peak = read_peak_bytes(read_csv, body)
+            seconds = parse_time(read_csv, body, args.repeat)
+            print(f'{n_rows:>10} {len(body) / 2**20:>9.1f} {engine:>7} '
+                  f'{python_peak / 2**20:>11.1f} {arrow_peak / 2**20:>10.1f} '
+                  f'{seconds * 1000:>9.1f}')
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,98 @@
+"""
+Benchmark of the parquet writer options of the report 1 target files
+
+Writes a report 1 of synthetic trades with every setting of the grid below
+into memory, the same way TradeETL.load passes the options of etlTargetConfig
+to the parquet writer, and records the file size, the write time and the
+time of reading the file back.
+
+Usage: python -m benchmarks.bench_parquet --rows 1000000 --days 20 --output parquet.csv
+"""
+import argparse
+import csv
+import statistics
+import time
+
+import pyarrow as pa
+import pyarrow.parquet as pq
+
+from tradeETL.transformers.etl_transformer import aggregate_report1, parquet_write_options
+from benchmarks.bench_aggregation import SRC_ARGS, TRG_ARGS
+from benchmarks.xetra_data import make_xetra_frame
+
+# Settings of the grid, each one changes the defaults of etlTargetConfig
+SETTINGS = (
+    ('default snappy', {}),
+    ('none', {'trg_parquet_compression': 'none'}),
+    ('lz4', {'trg_parquet_compression': 'lz4'}),
+    ('gzip', {'trg_parquet_compression': 'gzip'}),
+    ('brotli', {'trg_parquet_compression': 'brotli'}),
+    ('zstd 1', {'trg_parquet_compression': 'zstd', 'trg_parquet_compression_level': 1}),
+    ('zstd 3', {'trg_parquet_compression': 'zstd', 'trg_parquet_compression_level': 3}),
+    ('zstd 9', {'trg_parquet_compression': 'zstd', 'trg_parquet_compression_level': 9}),
+    ('zstd 19', {'trg_parquet_compression': 'zstd', 'trg_parquet_compression_level': 19}),
+    ('no dictionary', {'trg_parquet_dictionary': []}),
+    ('dictionary keys', {'trg_parquet_dictionary': ['ISIN', 'Date']}),
+    ('zstd 3 dict keys', {'trg_parquet_compression': 'zstd', 'trg_parquet_compression_level': 3,
+                          'trg_parquet_dictionary': ['ISIN', 'Date']}),
+    ('page 64 KiB', {'trg_parquet_data_page_size': 64 * 1024}),
+    ('page 8 MiB', {'trg_parquet_data_page_size': 8 * 1024 * 1024}),
+    ('no statistics', {'trg_parquet_statistics': False}),
+    ('version 1.0', {'trg_parquet_version': '1.0'}),
+    ('version 2.6', {'trg_parquet_version': '2.6'}))
+
+def write_parquet(table: pa.Table, parquet_options: dict):
+    """
+    Writes the table to an in-memory parquet file like S3BucketConnector.write_table_to_s3
+    """
+    out_buffer = pa.BufferOutputStream()
+    with pq.ParquetWriter(out_buffer, table.schema, **parquet_options) as writer:
+        writer.write_table(table)
+    return out_buffer.getvalue()
+
+def median_time(func, repeat: int):
+    """
+    Returns the median wall clock time of func in seconds and its last result
+    """
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = func()
+        timings.append(time.perf_counter() - start)
+    return statistics.median(timings), result
+
+def main():
+    """
+    Entry point of the benchmark
+    """
+    parser = argparse.ArgumentParser(description='Benchmark the parquet writer options.')
+    parser.add_argument('--rows', type=int, default=1000000, help='number of trades')
+    parser.add_argument('--days', type=int, default=20)
+    parser.add_argument('--repeat', type=int, default=5)
+    parser.add_argument('--output', help='optional csv file the results are written to')
+    args = parser.parse_args()
+    df_report = aggregate_report1(make_xetra_frame(args.rows, n_days=args.days),
+                                  SRC_ARGS, TRG_ARGS).round(decimals=2)
+    table = pa.Table.from_pandas(df_report, preserve_index=False)
+    print(f'report 1 with {table.num_rows} rows, {table.nbytes / 1024:.0f} KiB in memory')
+    print(f'{"setting":>18} {"KiB":>9} {"ratio":>6} {"write ms":>9} {"read ms":>8}')
+    results = []
+    for name, setting in SETTINGS:
+        parquet_options = parquet_write_options(TRG_ARGS._replace(**setting))
+        write_seconds, body = median_time(lambda: write_parquet(table, parquet_options),
+                                          args.repeat)
+        read_seconds, _ = median_time(lambda: pq.read_table(pa.BufferReader(body)),
+                                      args.repeat)
+        results.append({'setting': name, 'bytes': body.size,
+                        'write_ms': round(write_seconds * 1000, 2),
+                        'read_ms': round(read_seconds * 1000, 2)})
+        print(f'{name:>18} {body.size / 1024:>9.1f} {table.nbytes / body.size:>6.2f} '
+              f'{write_seconds * 1000:>9.1f} {read_seconds * 1000:>8.1f}')
+    if args.output:
+        with open(args.output, 'w', newline='', encoding='utf-8') as out_file:
+            writer = csv.DictWriter(out_file, fieldnames=list(results[0]))
+            writer.writeheader()
+            writer.writerows(results)
+
+if __name__ == '__main__':
+    main()
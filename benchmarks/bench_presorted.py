@@ -0,0 +1,68 @@
+"""
+Benchmark of the aggregation of report 1 for source files that are ordered by time
+
+Compares sorting the concatenated trades by time before grouping with
+src_presorted, which checks the order in one pass and only groups them.
+The check is included in the presorted timings.
+
+Usage: python -m benchmarks.bench_presorted --rows 100000 1000000 10000000 --days 5
+"""
+import argparse
+import statistics
+import time
+
+import pyarrow as pa
+
+from tradeETL.transformers.aggregations import aggregate_ohlcv_pandas, aggregate_ohlcv_numpy,\
+    add_time_key
+from tradeETL.transformers.backends import ArrowBackend
+from benchmarks.bench_aggregation import SRC_ARGS, TRG_ARGS
+from benchmarks.xetra_data import make_xetra_frame
+
+TIME_KEY = 'TimeKey'
+
+def median_time(func, repeat: int):
+    """
+    Returns the median wall clock time of func in seconds
+    """
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        timings.append(time.perf_counter() - start)
+    return statistics.median(timings)
+
+def main():
+    """
+    Entry point of the benchmark
+    """
+    parser = argparse.ArgumentParser(description='Benchmark presorted source files.')
+    parser.add_argument('--rows', type=int, nargs='+', default=[100000, 1000000, 10000000])
+    parser.add_argument('--days', type=int, default=5)
+    parser.add_argument('--repeat', type=int, default=3)
+    args = parser.parse_args()
+    arrow_backend = ArrowBackend()
+    print(f'{"rows":>10} {"kernel":>16} {"sorted ms":>10} {"presorted ms":>13} {"speedup":>8}')
+    for n_rows in args.rows:
+        # The synthetic files are ordered by date and time like the hourly source files
+        data_frame = make_xetra_frame(n_rows, n_days=args.days)
+        key_args = SRC_ARGS._replace(src_col_time_key=TIME_KEY)
+        key_frame = add_time_key(data_frame, key_args)
+        for name, src_args, data, aggregate in (
+                ('pandas', SRC_ARGS, data_frame, aggregate_ohlcv_pandas),
+                ('numpy', SRC_ARGS, data_frame, aggregate_ohlcv_numpy),
+                ('pandas time key', key_args, key_frame, aggregate_ohlcv_pandas),
+                ('numpy time key', key_args, key_frame, aggregate_ohlcv_numpy),
+                ('arrow time key', key_args,
+                 pa.Table.from_pandas(key_frame, preserve_index=False), arrow_backend.aggregate)):
+            sorted_seconds = median_time(
+                lambda: aggregate(data, src_args, TRG_ARGS), args.repeat)
+            presorted_args = src_args._replace(src_presorted=True)
+            presorted_seconds = median_time(
+                lambda: aggregate(data, presorted_args, TRG_ARGS), args.repeat)
+            print(f'{n_rows:>10} {name:>16} {sorted_seconds * 1000:>10.1f} '
+                  f'{presorted_seconds * 1000:>13.1f} '
+                  f'{sorted_seconds / presorted_seconds:>7.2f}x')
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,69 @@
+"""
+Benchmark of the integer time key of report 1
+
+Compares ordering and aggregating the trades by the time strings with
+ordering them by the int64 time key of src_col_time_key, and measures
+the cost of adding the key while extracting.
+
+Usage: python -m benchmarks.bench_time_key --rows 100000 1000000 10000000 --days 5
+"""
+import argparse
+import statistics
+import time
+
+import numpy as np
+
+from tradeETL.transformers.aggregations import aggregate_ohlcv_pandas, aggregate_ohlcv_numpy,\
+    add_time_key
+from benchmarks.bench_aggregation import SRC_ARGS, TRG_ARGS
+from benchmarks.xetra_data import make_xetra_frame
+
+TIME_KEY = 'TimeKey'
+KEY_ARGS = SRC_ARGS._replace(src_col_time_key=TIME_KEY)
+
+def median_time(func, repeat: int):
+    """
+    Returns the median wall clock time of func in seconds
+    """
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        timings.append(time.perf_counter() - start)
+    return statistics.median(timings)
+
+def main():
+    """
+    Entry point of the benchmark
+    """
+    parser = argparse.ArgumentParser(description='Benchmark the integer time key.')
+    parser.add_argument('--rows', type=int, nargs='+', default=[100000, 1000000, 10000000])
+    parser.add_argument('--days', type=int, default=5)
+    parser.add_argument('--shuffle', action='store_true',
+                        help='shuffle the rows instead of keeping the source file order')
+    parser.add_argument('--repeat', type=int, default=3)
+    args = parser.parse_args()
+    print(f'{"rows":>10} {"step":>16} {"time ms":>9} {"key ms":>9} {"speedup":>8}')
+    for n_rows in args.rows:
+        data_frame = make_xetra_frame(n_rows, n_days=args.days)
+        if args.shuffle:
+            data_frame = data_frame.sample(frac=1, random_state=0).reset_index(drop=True)
+        key_seconds = median_time(lambda: add_time_key(data_frame, KEY_ARGS), args.repeat)
+        key_frame = add_time_key(data_frame, KEY_ARGS)
+        print(f'{n_rows:>10} {"add_time_key":>16} {"":>9} {key_seconds * 1000:>9.1f}')
+        steps = (
+            ('sort', lambda frame, src_args: np.argsort(
+                frame[src_args.src_col_time_key or src_args.src_col_time].to_numpy(),
+                kind='stable')),
+            ('agg pandas', lambda frame, src_args: aggregate_ohlcv_pandas(
+                frame, src_args, TRG_ARGS)),
+            ('agg numpy', lambda frame, src_args: aggregate_ohlcv_numpy(
+                frame, src_args, TRG_ARGS)))
+        for step, func in steps:
+            string_seconds = median_time(lambda: func(data_frame, SRC_ARGS), args.repeat)
+            int_seconds = median_time(lambda: func(key_frame, KEY_ARGS), args.repeat)
+            print(f'{n_rows:>10} {step:>16} {string_seconds * 1000:>9.1f} '
+                  f'{int_seconds * 1000:>9.1f} {string_seconds / int_seconds:>7.2f}x')
+
+if __name__ == '__main__':
+    main()
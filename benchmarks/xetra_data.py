@@ -0,0 +1,61 @@
+"""
+Synthetic Xetra trade data for the benchmarks
+"""
+from datetime import date, timedelta
+
+import numpy as np
+import pandas as pd
+
+SRC_COLUMNS = ['ISIN', 'Mnemonic', 'SecurityDesc', 'SecurityType', 'Currency', 'SecurityID',
+               'Date', 'Time', 'StartPrice', 'MaxPrice', 'MinPrice', 'EndPrice',
+               'TradedVolume', 'NumberOfTrades']
+
+def make_xetra_frame(n_rows: int, n_isins: int = 3000, n_days: int = 1, seed: int = 42):
+    """
+    Creates a DataFrame that looks like the concatenated Xetra source files
+
+    Parameters:
+      n_rows: number of trade rows
+      n_isins: number of distinct ISINs
+      n_days: number of trading days the rows are spread over
+      seed: seed of the random generator
+
+    Returns:
+      data_frame: Pandas DataFrame with the Xetra source columns,
+                  ordered by date and time like the hourly source files
+    """
+    rng = np.random.default_rng(seed)
+    isins = np.array([f'DE{i:010d}' for i in range(n_isins)])
+    days = np.array([(date(2021, 4, 1) + timedelta(days=day)).isoformat() for day in range(n_days)])
+    minutes = np.sort(rng.integers(8 * 60, 20 * 60, n_rows))
+    day_idx = np.sort(rng.integers(0, n_days, n_rows))
+    isin_idx = rng.integers(0, n_isins, n_rows)
+    start_price = np.round(rng.uniform(1, 500, n_rows), 2)
+    spread = np.round(rng.uniform(0, 2, n_rows), 2)
+    data_frame = pd.DataFrame({
+        'ISIN': isins[isin_idx],
+        'Mnemonic': 'MNE',
+        'SecurityDesc': 'DESC',
+        'SecurityType': 'Common stock',
+        'Currency': 'EUR',
+        'SecurityID': isin_idx,
+        'Date': days[day_idx],
+        'Time': [f'{minute // 60:02d}:{minute % 60:02d}' for minute in minutes],
+        'StartPrice': start_price,
+        'MaxPrice': start_price + spread,
+        'MinPrice': start_price - spread,
+        'EndPrice': start_price,
+        'TradedVolume': rng.integers(1, 10000, n_rows),
+        'NumberOfTrades': rng.integers(1, 50, n_rows)
+    }, columns=SRC_COLUMNS)
+    return data_frame
+
+def make_xetra_csv(n_rows: int, seed: int = 42):
+    """
+    Creates the bytes of a Xetra source csv file
+
+    Parameters:
+      n_rows: number of trade rows
+      seed: seed of the random generator
+    """
+    return make_xetra_frame(n_rows, seed=seed).to_csv(index=False).encode('utf-8')
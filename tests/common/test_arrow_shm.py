@@ -0,0 +1,57 @@
+"""
+Test shared memory Arrow IPC methods
+"""
+import unittest
+from multiprocessing import shared_memory
+
+import pandas as pd
+
+from tradeETL.common.arrow_shm import write_frame_to_shm, read_frame_from_shm, unlink_shm
+
+
+class TestArrowShmMethods( unittest.TestCase ):
+    """
+    Testing the shared memory Arrow IPC methods
+    """
+
+    def test_write_read_frame( self ):
+        """
+        Tests that a data frame written to shared memory is read back
+        with its dtypes and the block is unlinked after reading
+        """
+        # Expected results
+        df_exp = pd.DataFrame( {
+            'ISIN': pd.Categorical( [ 'B', 'A', 'B' ], categories=[ 'B', 'A', 'C' ] ),
+            'Date': pd.to_datetime( [ '2021-04-16', '2021-04-16', '2021-04-17' ] ),
+            'Time': [ '08:00', '09:00', '08:00' ],
+            'StartPrice': [ 20.19, 18.27, 20.21 ],
+            'TradedVolume': [ 877, 987, 633 ] } )
+
+        # Method execution
+        name, size = write_frame_to_shm( df_exp )
+        df_result = read_frame_from_shm( name, size )
+
+        # Test after method execution
+        pd.testing.assert_frame_equal( df_exp, df_result )
+        with self.assertRaises( FileNotFoundError ):
+            shared_memory.SharedMemory( name=name )
+
+    def test_unlink_shm( self ):
+        """
+        Tests that unlink_shm removes a block that was not read
+        and ignores blocks that are already unlinked
+        """
+        # Test init
+        name, _ = write_frame_to_shm( pd.DataFrame( { 'col1': [ 1, 2 ] } ) )
+
+        # Method execution
+        unlink_shm( name )
+        unlink_shm( name )
+
+        # Test after method execution
+        with self.assertRaises( FileNotFoundError ):
+            shared_memory.SharedMemory( name=name )
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,110 @@
+"""
+Test local disk cache methods
+"""
+import os
+import unittest
+import tempfile
+
+from tradeETL.common.cache import S3DiskCache
+
+
+class TestS3DiskCacheMethods( unittest.TestCase ):
+    """
+    Testing the S3DiskCache Class
+    """
+
+    def setUp(self):
+        """
+        Setting up the environment
+        """
+        self.tmp_dir = tempfile.TemporaryDirectory()
+        self.cache_dir = os.path.join(self.tmp_dir.name, 'cache')
+
+    def tearDown(self):
+        """
+        Executing after unit test
+        """
+        self.tmp_dir.cleanup()
+
+    def test_get_put(self):
+        """
+        Tests a cache miss, put and hit of the same object
+        """
+        # Expected results
+        body_exp = b'col1,col2\nval1,val2'
+
+        # Test init
+        cache = S3DiskCache(self.cache_dir, max_bytes=1024)
+
+        # Method execution
+        miss_result = cache.get('bucket', 'key.csv', '"etag1"')
+        cache.put('bucket', 'key.csv', '"etag1"', body_exp)
+        hit_result = cache.get('bucket', 'key.csv', '"etag1"')
+        changed_result = cache.get('bucket', 'key.csv', '"etag2"')
+
+        # Test after method execution
+        self.assertIsNone(miss_result)
+        self.assertEqual(body_exp, hit_result)
+        self.assertIsNone(changed_result)
+        self.assertEqual(1, cache.hits)
+        self.assertEqual(2, cache.misses)
+
+    def test_lru_eviction(self):
+        """
+        Tests that the least recently used object is evicted
+        when the byte budget is exceeded
+        """
+        # Test init
+        cache = S3DiskCache(self.cache_dir, max_bytes=25)
+        cache.put('bucket', 'key1', 'etag', b'1' * 10)
+        cache.put('bucket', 'key2', 'etag', b'2' * 10)
+        cache.get('bucket', 'key1', 'etag')
+
+        # Method execution
+        cache.put('bucket', 'key3', 'etag', b'3' * 10)
+
+        # Test after method execution
+        self.assertEqual(20, cache.size)
+        self.assertEqual(2, len(os.listdir(self.cache_dir)))
+        self.assertIsNotNone(cache.get('bucket', 'key1', 'etag'))
+        self.assertIsNone(cache.get('bucket', 'key2', 'etag'))
+        self.assertIsNotNone(cache.get('bucket', 'key3', 'etag'))
+
+    def test_existing_cache_dir(self):
+        """
+        Tests that entries of an existing cache directory are reused
+        """
+        # Test init
+        S3DiskCache(self.cache_dir, max_bytes=100).put('bucket', 'key', 'etag', b'body')
+
+        # Method execution
+        cache = S3DiskCache(self.cache_dir, max_bytes=100)
+
+        # Test after method execution
+        self.assertEqual(4, cache.size)
+        self.assertEqual(b'body', cache.get('bucket', 'key', 'etag'))
+
+    def test_removed_entry(self):
+        """
+        Tests that an entry whose file was removed outside of the cache
+        is a miss and that a failed put leaves no temporary file
+        """
+        # Test init
+        cache = S3DiskCache(self.cache_dir, max_bytes=100)
+        path = cache.put('bucket', 'key', 'etag', b'body')
+        os.remove(path)
+
+        # Method execution
+        result = cache.get_path('bucket', 'key', 'etag')
+        with self.assertRaises(TypeError):
+            cache.put('bucket', 'key2', 'etag', 'not bytes')
+
+        # Test after method execution
+        self.assertIsNone(result)
+        self.assertEqual(1, cache.misses)
+        self.assertEqual(0, cache.size)
+        self.assertEqual([], os.listdir(self.cache_dir))
+
+
+if __name__ == "__main__":
+    unittest.main()
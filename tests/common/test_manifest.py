@@ -0,0 +1,126 @@
+"""
+Test manifest methods
+"""
+import os
+import unittest
+
+import pandas as pd
+import pyarrow as pa
+import boto3
+from moto import mock_s3
+
+from tradeETL.common.s3 import S3BucketConnector
+from tradeETL.common.manifest import ReportManifest
+
+
+class TestReportManifestMethods( unittest.TestCase ):
+    """
+    Testing manifest class
+    """
+
+    def setUp(self):
+        """
+        Setting up the environment
+        """
+
+        # mocking s3 connection start
+        self.mock_s3 = mock_s3()
+        self.mock_s3.start()
+
+        # defining class arguments
+        self.s3_access_key = 'AWS_ACCESS_KEY_ID'
+        self.s3_secret_key = 'AWS_SECRET_ACCESS_KEY'
+        self.s3_endpoint_url = 'https://s3.eu-central-1.amazonaws.com'
+        self.s3_bucket_name = 'test-bucket'
+        self.manifest_key = 'manifest/report1.parquet'
+
+        # creating s3 access keys as environment variables
+        os.environ[self.s3_access_key] = 'KEY1'
+        os.environ[self.s3_secret_key] = 'KEY2'
+
+        # Creating a bucket on the mocked s3
+        self.s3 = boto3.resource(
+            service_name = 's3',
+            endpoint_url = self.s3_endpoint_url
+        )
+
+        self.s3.create_bucket(Bucket=self.s3_bucket_name,
+            CreateBucketConfiguration={
+                'LocationConstraint': 'eu-central-1'
+            }
+        )
+        self.s3_bucket = self.s3.Bucket( self.s3_bucket_name )
+
+        # Creating a S3BucketConnector instance
+        self.s3_bucket_trg = S3BucketConnector( self.s3_access_key,
+                                                self.s3_secret_key,
+                                                self.s3_endpoint_url,
+                                                self.s3_bucket_name
+                                                )
+
+    def tearDown(self):
+        """
+        Executing after unit test
+        """
+
+        # mocking s3 connection stop
+        self.mock_s3.stop()
+
+    def test_read_manifest_no_manifest( self ):
+        """
+        Tests the read_manifest and list_files_in_manifest methods
+        when there is no manifest
+        """
+        # Method execution
+        result = ReportManifest.read_manifest( self.manifest_key, self.s3_bucket_trg )
+        files_result = self.s3_bucket_trg.list_files_in_manifest( self.manifest_key )
+
+        # Test after method execution
+        self.assertIsNone( result )
+        self.assertIsNone( files_result )
+
+    def test_update_manifest( self ):
+        """
+        Tests that update_manifest adds the entries of the written files,
+        replaces rewritten keys, removes deleted keys and writes the manifest
+        """
+        # Expected results
+        keys_exp = [ 'report1/date=2021-04-18/report1_1.parquet', 'report1/report1_1.parquet' ]
+        dates_exp = [ [ '2021-04-18', '2021-04-18' ], [ '2021-04-16', '2021-04-17' ] ]
+        isins_exp = [ [ 'A', 'A' ], [ 'A', 'C' ] ]
+        rows_exp = [ 1, 3 ]
+
+        # Test init
+        table_flat = pa.Table.from_pandas( pd.DataFrame( {
+            'ISIN': pd.Categorical( [ 'C', 'A', 'B' ] ),
+            'Date': pd.to_datetime( [ '2021-04-16', '2021-04-17', '2021-04-17' ] ),
+            'opening_price_eur': [ 20.19, 18.27, 21.01 ] } ), preserve_index=False )
+        table_partition = pa.table( { 'ISIN': [ 'A' ], 'opening_price_eur': [ 20.58 ] } )
+        entries = []
+        for key, table, date in ( ( keys_exp[1], table_flat, None ),
+                                  ( keys_exp[0], table_partition, '2021-04-18' ),
+                                  ( 'report1/report1_0.parquet', table_flat, None ) ):
+            self.s3_bucket_trg.write_table_to_s3( table, key, 'parquet' )
+            entries.append( ReportManifest.file_entry( key, table, 'Date', 'ISIN',
+                                                       self.s3_bucket_trg, date=date ) )
+        ReportManifest.update_manifest( [ entries[0], entries[2] ], [], self.manifest_key,
+                                        self.s3_bucket_trg )
+
+        # Method execution
+        result = ReportManifest.update_manifest( entries[:2], [ 'report1/report1_0.parquet' ],
+                                                 self.manifest_key, self.s3_bucket_trg )
+
+        # Test after method execution
+        self.assertEqual( keys_exp, result[ 'key' ].tolist() )
+        self.assertEqual( dates_exp, result[ [ 'min_date', 'max_date' ] ].values.tolist() )
+        self.assertEqual( isins_exp, result[ [ 'min_isin', 'max_isin' ] ].values.tolist() )
+        self.assertEqual( rows_exp, result[ 'rows' ].tolist() )
+        for key, size, etag in result[ [ 'key', 'bytes', 'etag' ] ].values.tolist():
+            obj = self.s3_bucket.Object( key=key )
+            self.assertEqual( ( obj.content_length, obj.e_tag ), ( size, etag ) )
+        df_result = ReportManifest.read_manifest( self.manifest_key, self.s3_bucket_trg )
+        pd.testing.assert_frame_equal( result, df_result )
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,70 @@
+"""
+Test hive-style date partition methods
+"""
+import unittest
+from datetime import datetime
+
+import pandas as pd
+import pyarrow as pa
+
+from tradeETL.common.partitions import partition_prefix, partition_key, date_partitions
+
+
+class TestPartitionsMethods( unittest.TestCase ):
+    """
+    Testing the hive-style date partition methods
+    """
+
+    def test_partition_key( self ):
+        """
+        Tests that the partition directory is placed between the
+        directory and the file name of the target key
+        """
+        # Expected results
+        today = datetime.today().strftime( '%Y%m%d' )
+        key_exp = f'report1/date=2021-04-17/Trade_daily_report1_{today}.parquet'
+
+        # Method execution
+        key_result = partition_key( 'report1/Trade_daily_report1_', '%Y%m%d', 'parquet',
+                                    'date', '2021-04-17' )
+        prefix_result = partition_prefix( 'Trade_daily_report1_', 'date', '2021-04-17' )
+        root_result = partition_prefix( 'report1/Trade_daily_report1_', 'date' )
+
+        # Test after method execution
+        self.assertEqual( key_exp, key_result )
+        self.assertEqual( 'date=2021-04-17/', prefix_result )
+        self.assertEqual( 'report1/date=', root_result )
+
+    def test_date_partitions( self ):
+        """
+        Tests that every date gets a table ordered by ISIN without the date column,
+        for string dates and ISINs and for datetime dates and category ISINs
+        """
+        # Expected results
+        dates_exp = [ '2021-04-16', '2021-04-17' ]
+        isins_exp = [ [ 'A', 'B', 'C' ], [ 'A', 'B' ] ]
+        prices_exp = [ [ 18.27, 20.19, 21.01 ], [ 20.58, 20.21 ] ]
+
+        # Test init
+        df_report = pd.DataFrame( {
+            'ISIN': [ 'B', 'C', 'B', 'A', 'A' ],
+            'Date': [ '2021-04-16', '2021-04-16', '2021-04-17', '2021-04-16', '2021-04-17' ],
+            'opening_price_eur': [ 20.19, 21.01, 20.21, 18.27, 20.58 ] } )
+        df_schema = df_report.astype( { 'Date': 'datetime64[ns]' } )
+        df_schema[ 'ISIN' ] = pd.Categorical( df_report[ 'ISIN' ], categories=[ 'C', 'B', 'A' ] )
+
+        for data_frame in ( df_report, df_schema ):
+            # Method execution
+            partitions = date_partitions( pa.Table.from_pandas( data_frame, preserve_index=False ),
+                                          'Date', 'ISIN' )
+
+            # Test after method execution
+            self.assertEqual( dates_exp, [ date for date, _ in partitions ] )
+            for ( _, table ), isins, prices in zip( partitions, isins_exp, prices_exp ):
+                self.assertEqual( [ 'ISIN', 'opening_price_eur' ], table.column_names )
+                self.assertEqual( isins, table[ 'ISIN' ].to_pylist() )
+                self.assertEqual( prices, table[ 'opening_price_eur' ].to_pylist() )
+
+
+if __name__ == "__main__":
+    unittest.main()
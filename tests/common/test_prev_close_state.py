@@ -0,0 +1,107 @@
+"""
+Test prior close state methods
+"""
+import os
+import unittest
+
+import pandas as pd
+import boto3
+from moto import mock_s3
+
+from tradeETL.common.s3 import S3BucketConnector
+from tradeETL.common.prev_close_state import PrevCloseState
+
+
+class TestPrevCloseStateMethods( unittest.TestCase ):
+    """
+    Testing prior close state class
+    """
+
+    def setUp(self):
+        """
+        Setting up the environment
+        """
+
+        # mocking s3 connection start
+        self.mock_s3 = mock_s3()
+        self.mock_s3.start()
+
+        # defining class arguments
+        self.s3_access_key = 'AWS_ACCESS_KEY_ID'
+        self.s3_secret_key = 'AWS_SECRET_ACCESS_KEY'
+        self.s3_endpoint_url = 'https://s3.eu-central-1.amazonaws.com'
+        self.s3_bucket_name = 'test-bucket'
+        self.state_key = 'state/report1/prev_close.parquet'
+
+        # creating s3 access keys as environment variables
+        os.environ[self.s3_access_key] = 'KEY1'
+        os.environ[self.s3_secret_key] = 'KEY2'
+
+        # Creating a bucket on the mocked s3
+        self.s3 = boto3.resource(
+            service_name = 's3',
+            endpoint_url = self.s3_endpoint_url
+        )
+
+        self.s3.create_bucket(Bucket=self.s3_bucket_name,
+            CreateBucketConfiguration={
+                'LocationConstraint': 'eu-central-1'
+            }
+        )
+
+        # Creating a S3BucketConnector instance
+        self.s3_bucket_state = S3BucketConnector( self.s3_access_key,
+                                                  self.s3_secret_key,
+                                                  self.s3_endpoint_url,
+                                                  self.s3_bucket_name
+                                                  )
+
+    def tearDown(self):
+        """
+        Executing after unit test
+        """
+
+        # mocking s3 connection stop
+        self.mock_s3.stop()
+
+    def test_read_state_no_state_file( self ):
+        """
+        Tests the read_state method when there is no state file
+        """
+        # Method execution
+        result = PrevCloseState.read_state( self.state_key, self.s3_bucket_state )
+
+        # Test after method execution
+        self.assertIsNone( result )
+
+    def test_update_state( self ):
+        """
+        Tests that update_state keeps the latest price per ISIN
+        of the old state and the new prices and writes the state
+        """
+        # Expected results
+        df_exp = pd.DataFrame( [ [ 'A', '2021-04-19', 12.5 ],
+                                 [ 'B', '2021-04-16', 20.0 ],
+                                 [ 'C', '2021-04-19', 30.0 ] ],
+                               columns=[ 'isin', 'date', 'price' ] )
+
+        # Test init
+        df_state = pd.DataFrame( [ [ 'A', '2021-04-16', 10.0 ], [ 'B', '2021-04-16', 20.0 ] ],
+                                 columns=[ 'isin', 'date', 'price' ] )
+        df_prices = pd.DataFrame( {
+            'isin': pd.Categorical( [ 'A', 'A', 'C' ] ),
+            'date': pd.to_datetime( [ '2021-04-18', '2021-04-19', '2021-04-19' ] ),
+            'price': [ 11.0, 12.5, 30.0 ] } )
+
+        # Method execution
+        result = PrevCloseState.update_state( df_prices, df_state, self.state_key,
+                                              self.s3_bucket_state )
+
+        # Test after method execution
+        pd.testing.assert_frame_equal( df_exp, result )
+        df_result = PrevCloseState.read_state( self.state_key, self.s3_bucket_state )
+        pd.testing.assert_frame_equal( df_exp, df_result )
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -2,15 +2,24 @@
 Test S3 bucket connector methods
 """
 import os
+import gzip
 import unittest
+from unittest.mock import patch
+import tempfile
+from concurrent.futures import ThreadPoolExecutor
 
+import numpy as np
 import pandas as pd
+import pyarrow as pa
+import pyarrow.parquet as pq
 from io import StringIO, BytesIO
 import boto3
 from moto import mock_s3
-from tradeETL.common.custom_exceptions import WrongFormatException
+from tradeETL.common.cache import S3DiskCache
+from tradeETL.common.custom_exceptions import WrongFormatException, WrongEngineException
 
 from tradeETL.common.s3 import S3BucketConnector
+from tradeETL.common.s3_read_policy import S3ReadPolicy
 
 
 class TestS3BucketConnectorMethods( unittest.TestCase ):
@@ -119,6 +128,30 @@ class TestS3BucketConnectorMethods( unittest.TestCase ):
         # Tests after method execution
         self.assertTrue( not list_result )
 
+    def test_list_files_in_date_range(self):
+        """
+        Tests the list_files_in_date_range method returns the keys
+        of the requested dates grouped by date
+        """
+        # Expected Results
+        files_exp = {
+            '2021-04-16': ['2021-04-16/2021-04-16_BINS_XETR08.csv',
+                           '2021-04-16/2021-04-16_BINS_XETR09.csv'],
+            '2021-04-18': ['2021-04-18/2021-04-18_BINS_XETR08.csv']
+        }
+        keys_outside = ['2021-04-15/2021-04-15_BINS_XETR08.csv',
+                        '2021-04-19/2021-04-19_BINS_XETR08.csv']
+
+        # Test init
+        for key in [key for keys in files_exp.values() for key in keys] + keys_outside:
+            self.s3_bucket.put_object(Body='col1,col2', Key=key)
+
+        # Method execution
+        files_result = self.s3_bucket_conn.list_files_in_date_range('2021-04-16', '2021-04-18')
+
+        # Tests after method execution
+        self.assertEqual(files_exp, files_result)
+
     def test_read_csv_to_df_success(self):
         """
         Tests the read_csv_to_df method for reading a .csv file
@@ -165,6 +198,180 @@ class TestS3BucketConnectorMethods( unittest.TestCase ):
             }
         )
 
+    def test_read_csv_to_df_threads(self):
+        """
+        Tests that worker threads can read from the mocked s3 bucket
+        through the shared client of the connector
+        """
+        # Expected Results
+        key_exp = 'test.csv'
+        csv_content = 'col1,col2\nval1,val2'
+
+        # Test init
+        self.s3_bucket.put_object(Body=csv_content, Key=key_exp)
+
+        # Method Execution
+        with ThreadPoolExecutor(max_workers=4) as executor:
+            df_results = list(executor.map(self.s3_bucket_conn.read_csv_to_df, [key_exp] * 8))
+
+        # Test after method execution
+        self.assertEqual(['val1'] * 8, [df_result['col1'][0] for df_result in df_results])
+
+    def test_read_csv_to_df_arrow(self):
+        """
+        Tests the read_csv_to_df method with the arrow engine returns
+        the same data frame as the pandas engine
+        """
+        # Expected Results
+        key_exp = 'test.csv'
+        dtype_exp = {'Date': 'str', 'Time': 'str'}
+
+        # Test init
+        csv_content = 'ISIN,Date,Time,Price,Volume\nAT0000A0E9W5,2021-04-17,13:00,20.21,633'
+        self.s3_bucket.put_object(Body=csv_content, Key=key_exp)
+
+        # Method Execution
+        df_exp = self.s3_bucket_conn.read_csv_to_df(key_exp, dtype=dtype_exp)
+        df_result = self.s3_bucket_conn.read_csv_to_df(key_exp, engine='arrow', dtype=dtype_exp)
+
+        # Test after method execution
+        self.assertTrue(df_exp.equals(df_result))
+
+    def test_read_csv_to_df_missing_int(self):
+        """
+        Tests that the pandas and the arrow engine both parse an integer
+        schema column with a missing value into float64 with NaN
+        """
+        # Expected Results
+        key_exp = 'test.csv'
+        dtype_exp = {'ISIN': 'category', 'Price': 'float64', 'Volume': 'int64'}
+        volumes_exp = [633.0, None]
+
+        # Test init
+        csv_content = 'ISIN,Price,Volume\nAT0000A0E9W5,20.21,633\nDE0005140008,30.10,'
+        self.s3_bucket.put_object(Body=csv_content, Key=key_exp)
+
+        for engine in ('pandas', 'arrow'):
+            # Method Execution
+            df_result = self.s3_bucket_conn.read_csv_to_df(key_exp, engine=engine,
+                                                           dtype=dtype_exp)
+
+            # Test after method execution
+            self.assertEqual('float64', df_result['Volume'].dtype)
+            self.assertEqual(volumes_exp, [None if pd.isna(value) else value
+                                           for value in df_result['Volume']])
+            # The row with the missing volume is dropped by the transformation
+            self.assertEqual(1, len(df_result.dropna()))
+
+    def test_read_csv_to_df_wrong_engine(self):
+        """
+        Tests the read_csv_to_df method with an unsupported engine
+        """
+        # Expected Results
+        engine_exp = 'wrong_engine'
+        log_exp = f'The csv engine {engine_exp} is not supported'
+
+        # Method Execution
+        with self.assertLogs() as log_msg:
+            with self.assertRaises(WrongEngineException):
+                self.s3_bucket_conn.read_csv_to_df('test.csv', engine=engine_exp)
+
+            # Log test after method execution
+            self.assertIn(log_exp, log_msg.output[0])
+
+    def test_read_csv_to_df_cached(self):
+        """
+        Tests that the read_csv_to_df method serves unchanged objects
+        from the local cache and re-reads changed objects
+        """
+        # Expected Results
+        key_exp = 'prefix/test.csv'
+
+        # Test init
+        self.s3_bucket.put_object(Body='col1,col2\nval1,val2', Key=key_exp)
+        with tempfile.TemporaryDirectory() as cache_dir:
+            s3_bucket_conn = S3BucketConnector( self.s3_access_key,
+                                                self.s3_secret_key,
+                                                self.s3_endpoint_url,
+                                                self.s3_bucket_name,
+                                                cache=S3DiskCache(cache_dir, 1024)
+                                                )
+
+            # Method Execution
+            s3_bucket_conn.list_files_in_prefix('prefix/')
+            s3_bucket_conn.read_csv_to_df(key_exp)
+            df_cached = s3_bucket_conn.read_csv_to_df(key_exp)
+            self.s3_bucket.put_object(Body='col1,col2\nval3,val4', Key=key_exp)
+            s3_bucket_conn.list_files_in_prefix('prefix/')
+            df_changed = s3_bucket_conn.read_csv_to_df(key_exp)
+
+            # Test after method execution
+            self.assertEqual('val1', df_cached['col1'][0])
+            self.assertEqual('val3', df_changed['col1'][0])
+            self.assertEqual(1, s3_bucket_conn.cache.hits)
+            self.assertEqual(2, s3_bucket_conn.cache.misses)
+            # The cached connector reuses the client of the registry
+            self.assertIs(self.s3_bucket_conn._client, s3_bucket_conn._client)
+
+    def test_read_csv_to_df_read_policy(self):
+        """
+        Tests the read_csv_to_df method with a timeout and hedging policy
+        """
+        # Expected Results
+        key_exp = 'test.csv'
+
+        # Test init
+        self.s3_bucket.put_object(Body='col1,col2\nval1,val2', Key=key_exp)
+        read_policy = S3ReadPolicy(timeout=30, hedge_percentile=99, hedge_min_samples=1)
+        s3_bucket_conn = S3BucketConnector( self.s3_access_key,
+                                            self.s3_secret_key,
+                                            self.s3_endpoint_url,
+                                            self.s3_bucket_name,
+                                            read_policy=read_policy
+                                            )
+
+        # Method Execution
+        df_results = [s3_bucket_conn.read_csv_to_df(key_exp) for _ in range(3)]
+
+        # Test after method execution
+        self.assertEqual(['val1'] * 3, [df_result['col1'][0] for df_result in df_results])
+        self.assertEqual(0, read_policy.retries)
+
+    def test_read_parquet_to_df(self):
+        """
+        Test read_parquet_to_df method for reading a parquet
+        file with a subset of its columns
+        """
+        # Expected results
+        key_exp = 'test.parquet'
+        df_exp = pd.DataFrame([['A', 1], ['C', 2]], columns=['col1', 'col2'])
+        log_exp = f'Reading file {self.s3_endpoint_url}/{self.s3_bucket_name}/{key_exp}'
+
+        # Test init
+        out_buffer = BytesIO()
+        df_exp.assign(col3=['B', 'D']).to_parquet(out_buffer, index=False)
+        self.s3_bucket.put_object(Body=out_buffer.getvalue(), Key=key_exp)
+
+        # Method execution
+        with self.assertLogs() as log_msg:
+            df_result = self.s3_bucket_conn.read_parquet_to_df(key_exp, columns=['col1', 'col2'])
+            # Log test after method execution
+            self.assertIn(log_exp, log_msg.output[0])
+
+        # Test after method execution
+        pd.testing.assert_frame_equal(df_exp, df_result)
+
+        # Clean up after test
+        self.s3_bucket.delete_objects(
+            Delete={
+                'Objects': [
+                    {
+                        'Key': key_exp
+                    }
+                ]
+            }
+        )
+
     def test_write_df_to_s3_empty( self ):
         """
         Tests the write_df_to_s3 method with an empty DataFrame
@@ -273,6 +480,267 @@ class TestS3BucketConnectorMethods( unittest.TestCase ):
             }
         )
 
+    def test_write_df_to_s3_multipart(self):
+        """
+        Test write_df_to_s3 method streaming csv and parquet files
+        as multipart upload
+        """
+        # Expected Results
+        return_exp = True
+        df_exp = pd.DataFrame({
+            'col1': np.arange(300000),
+            'col2': np.random.default_rng(1).random(300000)
+        })
+
+        # Test init
+        s3_bucket_conn = S3BucketConnector( self.s3_access_key,
+                                            self.s3_secret_key,
+                                            self.s3_endpoint_url,
+                                            self.s3_bucket_name,
+                                            multipart_part_size=5 * 1024 * 1024
+                                            )
+
+        for file_format in ('csv', 'parquet'):
+            key_exp = f'test.{file_format}'
+
+            # Method Execution
+            result = s3_bucket_conn.write_df_to_s3(df_exp, key_exp, file_format)
+
+            # Test after method execution
+            data = self.s3_bucket.Object(key=key_exp).get().get('Body').read()
+            if file_format == 'csv':
+                df_result = pd.read_csv(BytesIO(data))
+            else:
+                df_result = pd.read_parquet(BytesIO(data))
+
+            self.assertEqual(return_exp, result)
+            self.assertTrue(np.allclose(df_exp, df_result))
+
+    def test_write_df_to_s3_multipart_row_groups(self):
+        """
+        Test write_df_to_s3 method converting and writing a parquet
+        multipart upload in row groups
+        """
+        # Expected Results
+        row_groups_exp = 3
+        key_exp = 'test.parquet'
+        df_exp = pd.DataFrame({
+            'col1': np.arange(2500),
+            'col2': pd.Categorical(np.where(np.arange(2500) < 2000, 'A', 'B'))
+        })
+
+        # Test init
+        s3_bucket_conn = S3BucketConnector( self.s3_access_key,
+                                            self.s3_secret_key,
+                                            self.s3_endpoint_url,
+                                            self.s3_bucket_name,
+                                            multipart_part_size=5 * 1024 * 1024
+                                            )
+
+        # Method Execution
+        with patch('tradeETL.common.s3.PARQUET_CHUNK_ROWS', 1000):
+            s3_bucket_conn.write_df_to_s3(df_exp, key_exp, 'parquet')
+
+        # Test after method execution
+        data = self.s3_bucket.Object(key=key_exp).get().get('Body').read()
+        self.assertEqual(row_groups_exp, pq.ParquetFile(BytesIO(data)).num_row_groups)
+        pd.testing.assert_frame_equal(df_exp, pd.read_parquet(BytesIO(data)))
+
+    def test_write_read_compressed_csv(self):
+        """
+        Test write_df_to_s3 and read_csv_to_df methods with csv files
+        compressed according to the key suffix
+        """
+        # Expected Results
+        df_exp = pd.DataFrame(
+            [['A', 'B'], ['c', 'D']],
+            columns = ['col1', 'col2']
+        )
+
+        for key_exp in ('test.csv.gz', 'test.csv.zst'):
+            # Method Execution
+            self.s3_bucket_conn.write_df_to_s3(df_exp, key_exp, 'csv')
+            df_pandas = self.s3_bucket_conn.read_csv_to_df(key_exp)
+            df_arrow = self.s3_bucket_conn.read_csv_to_df(key_exp, engine='arrow')
+
+            # Test after method execution
+            self.assertTrue(df_exp.equals(df_pandas))
+            self.assertTrue(df_exp.equals(df_arrow))
+
+        data = self.s3_bucket.Object(key='test.csv.gz').get().get('Body').read()
+        self.assertTrue(df_exp.equals(pd.read_csv(BytesIO(gzip.decompress(data)))))
+
+    def test_write_read_table(self):
+        """
+        Test write_table_to_s3 and read_csv_to_table methods with
+        parquet, csv and compressed csv files
+        """
+        # Expected Results
+        table_exp = pa.table({'col1': ['A', 'c'], 'col2': [1.5, 2.0]})
+        return_exp = True
+
+        for key_exp, file_format in (('test.parquet', 'parquet'), ('test.csv', 'csv'),
+                                     ('test.csv.gz', 'csv')):
+            # Method Execution
+            result = self.s3_bucket_conn.write_table_to_s3(table_exp, key_exp, file_format)
+            if file_format == 'csv':
+                table_result = self.s3_bucket_conn.read_csv_to_table(key_exp)
+            else:
+                table_result = self.s3_bucket_conn.read_parquet_to_table(key_exp)
+
+            # Test after method execution
+            self.assertEqual(return_exp, result)
+            self.assertTrue(table_exp.equals(table_result))
+
+        data = self.s3_bucket.Object(key='test.csv.gz').get().get('Body').read()
+        self.assertTrue(table_exp.to_pandas().equals(pd.read_csv(BytesIO(gzip.decompress(data)))))
+
+    def test_write_read_arrow(self):
+        """
+        Test write_df_to_s3 and read_arrow_to_table methods with uncompressed,
+        lz4 and zstd compressed arrow files, memory-mapping the cached copy
+        """
+        # Expected Results
+        df_exp = pd.DataFrame({'col1': ['A', 'c'], 'col2': [1.5, 2.0]})
+        tmp_dir = tempfile.TemporaryDirectory()
+        self.s3_bucket_conn.cache = S3DiskCache(tmp_dir.name, max_bytes=1024 * 1024)
+
+        for key_exp, compression in (('test.arrow', None), ('test_lz4.arrow', 'lz4'),
+                                     ('test_zstd.arrow', 'zstd')):
+            # Method Execution
+            result = self.s3_bucket_conn.write_df_to_s3(df_exp, key_exp, 'arrow',
+                                                        compression=compression)
+            df_result = self.s3_bucket_conn.read_arrow_to_df(key_exp)
+            table_result = self.s3_bucket_conn.read_arrow_to_table(key_exp, columns=['col2'])
+
+            # Test after method execution
+            self.assertTrue(result)
+            self.assertTrue(df_exp.equals(df_result))
+            self.assertEqual(df_exp['col2'].tolist(), table_result['col2'].to_pylist())
+        # The second read of every file maps the cached copy
+        self.assertEqual(3, self.s3_bucket_conn.cache.hits)
+        self.assertIsInstance(self.s3_bucket_conn._open_object('test.arrow'), pa.MemoryMappedFile)
+        tmp_dir.cleanup()
+
+    def test_write_arrow_wrong_compression(self):
+        """
+        Test write_df_to_s3 method with a compression arrow files do not support
+        """
+        # Expected Results
+        df_exp = pd.DataFrame([['A', 'B']], columns = ['col1', 'col2'])
+        log_exp = 'The arrow compression gzip is not supported'
+
+        # Method Execution
+        with self.assertLogs() as logm:
+            with self.assertRaises(WrongFormatException):
+                self.s3_bucket_conn.write_df_to_s3(df_exp, 'test.arrow', 'arrow',
+                                                   compression='gzip')
+            # Log test after method execution
+            self.assertIn(log_exp, logm.output[-1])
+
+    def test_list_files_in_manifest(self):
+        """
+        Test list_files_in_manifest method choosing the files that
+        overlap a date and ISIN range without listing the bucket
+        """
+        # Expected results
+        df_manifest = pd.DataFrame(
+            [['f1.parquet', 3, 100, '2021-04-16', '2021-04-16', 'A', 'C', '"e1"'],
+             ['f2.parquet', 3, 100, '2021-04-17', '2021-04-18', 'A', 'B', '"e2"'],
+             ['f3.parquet', 3, 100, '2021-04-19', '2021-04-19', 'D', 'F', '"e3"']],
+            columns=['key', 'rows', 'bytes', 'min_date', 'max_date', 'min_isin',
+                     'max_isin', 'etag'])
+        tmp_dir = tempfile.TemporaryDirectory()
+        self.s3_bucket_conn.cache = S3DiskCache(tmp_dir.name, max_bytes=1024 * 1024)
+
+        # Test init
+        self.s3_bucket_conn.write_df_to_s3(df_manifest, 'manifest.parquet', 'parquet')
+
+        # Method execution
+        all_result = self.s3_bucket_conn.list_files_in_manifest('manifest.parquet')
+        date_result = self.s3_bucket_conn.list_files_in_manifest(
+            'manifest.parquet', start_date='2021-04-18', end_date='2021-04-19')
+        isin_result = self.s3_bucket_conn.list_files_in_manifest(
+            'manifest.parquet', end_date='2021-04-18', isin_min='B', isin_max='B')
+
+        # Test after method execution
+        self.assertEqual(['f1.parquet', 'f2.parquet', 'f3.parquet'], all_result)
+        self.assertEqual(['f2.parquet', 'f3.parquet'], date_result)
+        self.assertEqual(['f1.parquet', 'f2.parquet'], isin_result)
+        # The ETags of the manifest are used for cached reads
+        self.assertEqual('"e3"', self.s3_bucket_conn._etag('f3.parquet'))
+        tmp_dir.cleanup()
+
+    def test_read_parquet_to_df_missing(self):
+        """
+        Test read_parquet_to_df method returning None for a missing file with
+        missing_ok, with and without a cache, and raising NoSuchKey without it
+        """
+        # Test init
+        tmp_dir = tempfile.TemporaryDirectory()
+
+        for cache in (None, S3DiskCache(tmp_dir.name, max_bytes=1024)):
+            self.s3_bucket_conn.cache = cache
+            # Method execution
+            result = self.s3_bucket_conn.read_parquet_to_df('missing.parquet', missing_ok=True)
+
+            # Test after method execution
+            self.assertIsNone(result)
+        self.s3_bucket_conn.cache = None
+        with self.assertRaises(self.s3_bucket_conn.exceptions.NoSuchKey):
+            self.s3_bucket_conn.read_parquet_to_df('missing.parquet')
+        tmp_dir.cleanup()
+
+    def test_read_parquet_metadata(self):
+        """
+        Test read_parquet_metadata method reading the footer of a parquet file
+        with one ranged request and with a second one for a larger footer
+        """
+        # Expected results
+        df_exp = pd.DataFrame({'Date': ['2021-04-17', '2021-04-18'], 'col2': [1.5, 2.0]})
+
+        # Test init
+        self.s3_bucket_conn.write_df_to_s3(df_exp, 'test.parquet', 'parquet')
+
+        for footer_bytes in (64 * 1024, 16):
+            # Method execution
+            with patch('tradeETL.common.s3.PARQUET_FOOTER_BYTES', footer_bytes):
+                metadata = self.s3_bucket_conn.read_parquet_metadata('test.parquet')
+
+            # Test after method execution
+            statistics = metadata.row_group(0).column(0).statistics
+            self.assertEqual(2, metadata.num_rows)
+            self.assertEqual(('2021-04-17', '2021-04-18'), (statistics.min, statistics.max))
+
+    def test_delete_files(self):
+        """
+        Test delete_files method deleting some of the files of the bucket
+        """
+        # Expected results
+        keys_exp = ['prefix/test2.csv']
+
+        # Test init
+        for key in ('prefix/test1.csv', 'prefix/test2.csv', 'prefix/test3.csv'):
+            self.s3_bucket.put_object(Body='col1\nA', Key=key)
+
+        # Method execution
+        result = self.s3_bucket_conn.delete_files(['prefix/test1.csv', 'prefix/test3.csv'])
+
+        # Test after method execution
+        self.assertTrue(result)
+        self.assertEqual(keys_exp, self.s3_bucket_conn.list_files_in_prefix('prefix/'))
+
+    def test_write_df_to_s3_wrong_compression(self):
+        """
+        Test write_df_to_s3 method with an unsupported compression
+        """
+        # Expected Results
+        df_exp = pd.DataFrame([['A', 'B']], columns = ['col1', 'col2'])
+
+        # Method Execution
+        with self.assertRaises(WrongFormatException):
+            self.s3_bucket_conn.write_df_to_s3(df_exp, 'test.csv', 'csv', compression='lzma')
+
     def test_write_df_to_s3_wrong_format(self):
         """
         Test write_df_to_s3 method to check whether writing csv file is unsuccessful
@@ -0,0 +1,152 @@
+"""
+Test async S3 bucket connector methods
+"""
+import os
+import asyncio
+import unittest
+
+import pandas as pd
+import pyarrow.parquet as pq
+from io import StringIO, BytesIO
+import boto3
+from moto import mock_s3
+
+from tradeETL.common.s3 import S3BucketConnector
+from tradeETL.common.s3_async import AsyncS3BucketConnector
+
+
+class TestAsyncS3BucketConnectorMethods( unittest.TestCase ):
+    """
+    Testing the AsyncS3BucketConnector Class
+    """
+
+    def setUp(self):
+        """
+        Setting up the environment
+        """
+
+        # mocking s3 connection start
+        self.mock_s3 = mock_s3()
+        self.mock_s3.start()
+
+        # defining class arguments
+        self.s3_access_key = 'AWS_ACCESS_KEY_ID'
+        self.s3_secret_key = 'AWS_SECRET_ACCESS_KEY'
+        self.s3_endpoint_url = 'https://s3.eu-central-1.amazonaws.com'
+        self.s3_bucket_name = 'test-bucket'
+
+        # creating s3 access keys as environment variables
+        os.environ[self.s3_access_key] = 'KEY1'
+        os.environ[self.s3_secret_key] = 'KEY2'
+
+        # Creating a bucket on the mocked s3
+        self.s3 = boto3.resource(
+            service_name = 's3',
+            endpoint_url = self.s3_endpoint_url
+        )
+
+        self.s3.create_bucket(Bucket=self.s3_bucket_name,
+            CreateBucketConfiguration={
+                'LocationConstraint': 'eu-central-1'
+            }
+        )
+
+        self.s3_bucket = self.s3.Bucket( self.s3_bucket_name )
+
+        # Creating a testing instance
+        self.s3_bucket_conn = S3BucketConnector( self.s3_access_key,
+                                                 self.s3_secret_key,
+                                                 self.s3_endpoint_url,
+                                                 self.s3_bucket_name
+                                                 )
+
+    def tearDown(self):
+        """
+        Executing after unit test
+        """
+
+        # mocking s3 connection stop
+        self.mock_s3.stop()
+
+    def test_read_csv_to_df_concurrent(self):
+        """
+        Tests listing and reading many files concurrently
+        on one event loop
+        """
+        # Expected Results
+        prefix_exp = 'prefix/'
+        keys_exp = [f'{prefix_exp}test{i:02d}.csv' for i in range(20)]
+
+        # Test init
+        for i, key in enumerate(keys_exp):
+            self.s3_bucket.put_object(Body=f'col1,col2\n{i},val{i}', Key=key)
+
+        async def run():
+            async with AsyncS3BucketConnector(self.s3_bucket_conn, max_in_flight=4) as conn:
+                keys = await conn.list_files_in_prefix(prefix_exp)
+                data_frames = await asyncio.gather(*[conn.read_csv_to_df(key) for key in keys])
+            return keys, data_frames
+
+        # Method Execution
+        keys_result, df_results = asyncio.run(run())
+
+        # Test after method execution
+        self.assertEqual(keys_exp, keys_result)
+        self.assertEqual(list(range(20)), [df['col1'][0] for df in df_results])
+
+    def test_write_df_to_s3_csv(self):
+        """
+        Tests writing a csv file with the async connector
+        """
+        # Expected Results
+        return_exp = True
+        df_exp = pd.DataFrame(
+            [['A', 'B'], ['c', 'D']],
+            columns = ['col1', 'col2']
+        )
+        key_exp = 'test.csv'
+
+        async def run():
+            async with AsyncS3BucketConnector(self.s3_bucket_conn) as conn:
+                return await conn.write_df_to_s3(df_exp, key_exp, 'csv')
+
+        # Method Execution
+        result = asyncio.run(run())
+
+        # Test after method execution
+        data = self.s3_bucket.Object(key=key_exp).get().get('Body').read().decode('utf-8')
+        df_result = pd.read_csv(StringIO(data))
+
+        self.assertEqual(return_exp, result)
+        self.assertTrue(df_exp.equals(df_result))
+
+
+    def test_write_df_to_s3_parquet_options(self):
+        """
+        Tests that the async connector passes the writer
+        options to S3BucketConnector.write_df_to_s3
+        """
+        # Expected Results
+        df_exp = pd.DataFrame(
+            [['A', 'B'], ['c', 'D']],
+            columns = ['col1', 'col2']
+        )
+        key_exp = 'test.parquet'
+
+        async def run():
+            async with AsyncS3BucketConnector(self.s3_bucket_conn) as conn:
+                return await conn.write_df_to_s3(df_exp, key_exp, 'parquet',
+                                                 parquet_options={'compression': 'zstd'})
+
+        # Method Execution
+        asyncio.run(run())
+
+        # Test after method execution
+        data = self.s3_bucket.Object(key=key_exp).get().get('Body').read()
+        parquet_file = pq.ParquetFile(BytesIO(data))
+        self.assertEqual('ZSTD', parquet_file.metadata.row_group(0).column(0).compression)
+        self.assertTrue(df_exp.equals(parquet_file.read().to_pandas()))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,115 @@
+"""
+Test S3 client registry methods
+"""
+import os
+import unittest
+
+from moto import mock_s3
+
+from tradeETL.common.s3 import S3BucketConnector
+from tradeETL.common.s3_clients import S3ClientRegistry
+from tradeETL.common.s3_read_policy import S3ReadPolicy
+
+
+class TestS3ClientRegistryMethods( unittest.TestCase ):
+    """
+    Testing the S3ClientRegistry Class
+    """
+
+    def setUp(self):
+        """
+        Setting up the environment
+        """
+
+        # mocking s3 connection start
+        self.mock_s3 = mock_s3()
+        self.mock_s3.start()
+
+        # defining class arguments
+        self.s3_access_key = 'AWS_ACCESS_KEY_ID'
+        self.s3_secret_key = 'AWS_SECRET_ACCESS_KEY'
+        self.s3_endpoint_url = 'https://s3.eu-central-1.amazonaws.com'
+
+        # creating s3 access keys as environment variables
+        os.environ[self.s3_access_key] = 'KEY1'
+        os.environ[self.s3_secret_key] = 'KEY2'
+
+    def tearDown(self):
+        """
+        Executing after unit test
+        """
+
+        # resetting the registry
+        S3ClientRegistry.configure()
+        S3ClientRegistry.clear()
+
+        # mocking s3 connection stop
+        self.mock_s3.stop()
+
+    def test_connectors_share_client(self):
+        """
+        Tests that connectors with the same endpoint and credentials
+        share one client and other endpoints get their own client
+        """
+        # Method execution
+        s3_bucket_src = S3BucketConnector(self.s3_access_key, self.s3_secret_key,
+                                          self.s3_endpoint_url, 'src-bucket')
+        s3_bucket_trg = S3BucketConnector(self.s3_access_key, self.s3_secret_key,
+                                          self.s3_endpoint_url, 'trg-bucket')
+        s3_bucket_other = S3BucketConnector(self.s3_access_key, self.s3_secret_key,
+                                            'https://s3.eu-west-2.amazonaws.com', 'trg-bucket')
+
+        # Test after method execution
+        self.assertIs(s3_bucket_src._client, s3_bucket_trg._client)
+        self.assertIsNot(s3_bucket_src._client, s3_bucket_other._client)
+
+    def test_configure(self):
+        """
+        Tests that the configured pool size and retries are
+        used for the clients created afterwards
+        """
+        # Expected results
+        max_pool_connections_exp = 50
+        max_attempts_exp = 7
+
+        # Method execution
+        S3ClientRegistry.configure(max_pool_connections=max_pool_connections_exp,
+                                   tcp_keepalive=True, max_attempts=max_attempts_exp)
+        _, client = S3ClientRegistry.get_client('KEY1', 'KEY2', self.s3_endpoint_url)
+
+        # Test after method execution
+        self.assertEqual(max_pool_connections_exp, client.meta.config.max_pool_connections)
+        self.assertTrue(client.meta.config.tcp_keepalive)
+        self.assertEqual(max_attempts_exp, client.meta.config.retries['total_max_attempts'])
+
+
+    def test_read_policy_client(self):
+        """
+        Tests that a connector with a read policy gets a client without
+        botocore retries and with the timeout of the policy
+        """
+        # Expected results
+        timeout_exp = 2
+        retry_mode_exp = 'adaptive'
+
+        # Test init
+        S3ClientRegistry.configure(max_attempts=5, retry_mode=retry_mode_exp)
+        read_policy = S3ReadPolicy(timeout=timeout_exp)
+
+        # Method execution
+        s3_bucket_src = S3BucketConnector(self.s3_access_key, self.s3_secret_key,
+                                          self.s3_endpoint_url, 'src-bucket',
+                                          read_policy=read_policy)
+        s3_bucket_trg = S3BucketConnector(self.s3_access_key, self.s3_secret_key,
+                                          self.s3_endpoint_url, 'trg-bucket')
+
+        # Test after method execution
+        config = s3_bucket_src._client.meta.config
+        self.assertIsNot(s3_bucket_src._client, s3_bucket_trg._client)
+        self.assertEqual(1, config.retries['total_max_attempts'])
+        self.assertEqual(retry_mode_exp, config.retries['mode'])
+        self.assertEqual((timeout_exp, timeout_exp), (config.connect_timeout, config.read_timeout))
+        self.assertEqual(5, s3_bucket_trg._client.meta.config.retries['total_max_attempts'])
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,114 @@
+"""
+Test streaming multipart upload methods
+"""
+import os
+import unittest
+
+import boto3
+from moto import mock_s3
+
+from tradeETL.common.s3_multipart import S3MultipartWriter, MIN_PART_SIZE
+
+
+class TestS3MultipartWriterMethods( unittest.TestCase ):
+    """
+    Testing the S3MultipartWriter Class
+    """
+
+    def setUp(self):
+        """
+        Setting up the environment
+        """
+
+        # mocking s3 connection start
+        self.mock_s3 = mock_s3()
+        self.mock_s3.start()
+
+        # defining class arguments
+        self.s3_endpoint_url = 'https://s3.eu-central-1.amazonaws.com'
+        self.s3_bucket_name = 'test-bucket'
+
+        # creating s3 access keys as environment variables
+        os.environ['AWS_ACCESS_KEY_ID'] = 'KEY1'
+        os.environ['AWS_SECRET_ACCESS_KEY'] = 'KEY2'
+
+        # Creating a bucket on the mocked s3
+        self.s3 = boto3.resource(
+            service_name = 's3',
+            endpoint_url = self.s3_endpoint_url
+        )
+
+        self.s3.create_bucket(Bucket=self.s3_bucket_name,
+            CreateBucketConfiguration={
+                'LocationConstraint': 'eu-central-1'
+            }
+        )
+
+        self.s3_bucket = self.s3.Bucket( self.s3_bucket_name )
+
+    def tearDown(self):
+        """
+        Executing after unit test
+        """
+
+        # mocking s3 connection stop
+        self.mock_s3.stop()
+
+    def test_write_single_part(self):
+        """
+        Tests that objects smaller than one part are written with put_object
+        """
+        # Expected results
+        key_exp = 'small.bin'
+        body_exp = b'a' * 1024
+
+        # Method execution
+        with S3MultipartWriter(self.s3.meta.client, self.s3_bucket_name, key_exp) as out_stream:
+            out_stream.write(body_exp[:512])
+            out_stream.write(body_exp[512:])
+
+        # Test after method execution
+        body_result = self.s3_bucket.Object(key=key_exp).get().get('Body').read()
+        self.assertEqual(body_exp, body_result)
+        self.assertEqual(len(body_exp), out_stream.tell())
+
+    def test_write_multiple_parts(self):
+        """
+        Tests that large objects are uploaded in several parts
+        """
+        # Expected results
+        key_exp = 'large.bin'
+        chunk = os.urandom(1024 * 1024)
+        body_exp = chunk * 12
+
+        # Method execution
+        with S3MultipartWriter(self.s3.meta.client, self.s3_bucket_name, key_exp,
+                               MIN_PART_SIZE, max_workers=2) as out_stream:
+            for _ in range(12):
+                out_stream.write(chunk)
+
+        # Test after method execution
+        obj = self.s3_bucket.Object(key=key_exp)
+        self.assertEqual(body_exp, obj.get().get('Body').read())
+        self.assertTrue(obj.e_tag.endswith('-3"'))
+
+    def test_write_abort(self):
+        """
+        Tests that the upload is aborted when an exception is raised
+        """
+        # Expected results
+        key_exp = 'aborted.bin'
+
+        # Method execution
+        with self.assertRaises(ValueError):
+            with S3MultipartWriter(self.s3.meta.client, self.s3_bucket_name, key_exp) as out_stream:
+                out_stream.write(os.urandom(MIN_PART_SIZE + 1))
+                raise ValueError
+
+        # Test after method execution
+        self.assertEqual([], list(self.s3_bucket.objects.all()))
+        self.assertEqual([], list(self.s3_bucket.multipart_uploads.all()))
+
+
+if __name__ == "__main__":
+    unittest.main()
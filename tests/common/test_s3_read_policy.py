@@ -0,0 +1,136 @@
+"""
+Test S3 read policy methods
+"""
+import time
+import unittest
+
+from botocore.exceptions import ClientError
+
+from tradeETL.common.s3_read_policy import S3ReadPolicy
+
+
+def client_error(code: str):
+    """
+    Creates a botocore ClientError with the given error code
+    """
+    return ClientError({'Error': {'Code': code, 'Message': code}}, 'GetObject')
+
+
+class TestS3ReadPolicyMethods( unittest.TestCase ):
+    """
+    Testing the S3ReadPolicy Class
+    """
+
+    def test_call_retry(self):
+        """
+        Tests that retryable errors are retried with backoff
+        """
+        # Expected results
+        result_exp = b'body'
+        retries_exp = 2
+
+        # Test init
+        errors = [client_error('SlowDown'), client_error('503')]
+        def fetch():
+            if errors:
+                raise errors.pop(0)
+            return result_exp
+        policy = S3ReadPolicy(max_attempts=3, backoff_base=0.001)
+
+        # Method execution
+        result = policy.call(fetch)
+
+        # Test after method execution
+        self.assertEqual(result_exp, result)
+        self.assertEqual(retries_exp, policy.retries)
+
+    def test_call_no_retry(self):
+        """
+        Tests that errors that are not retryable are raised at once
+        """
+        # Test init
+        calls = []
+        def fetch():
+            calls.append(1)
+            raise client_error('NoSuchKey')
+        policy = S3ReadPolicy(max_attempts=3, backoff_base=0.001)
+
+        # Method execution
+        with self.assertRaises(ClientError):
+            policy.call(fetch)
+
+        # Test after method execution
+        self.assertEqual(1, len(calls))
+        self.assertEqual(0, policy.retries)
+
+    def test_call_timeout(self):
+        """
+        Tests that a read exceeding the timeout is retried
+        """
+        # Expected results
+        result_exp = b'body'
+
+        # Test init
+        delays = [0.5, 0]
+        def fetch():
+            time.sleep(delays.pop(0))
+            return result_exp
+        policy = S3ReadPolicy(timeout=0.05, max_attempts=2, backoff_base=0.001)
+
+        # Method execution
+        result = policy.call(fetch)
+
+        # Test after method execution
+        self.assertEqual(result_exp, result)
+        self.assertEqual(1, policy.timeouts)
+        self.assertEqual(1, policy.retries)
+
+    def test_call_hedge(self):
+        """
+        Tests that a hedged request is fired for a slow read
+        and its response is used
+        """
+        # Expected results
+        result_exp = b'body'
+
+        # Test init
+        policy = S3ReadPolicy(hedge_percentile=50, hedge_min_samples=5)
+        for _ in range(5):
+            policy.call(lambda: result_exp)
+        delays = [1, 0]
+        def fetch():
+            time.sleep(delays.pop(0))
+            return result_exp
+
+        # Method execution
+        start = time.monotonic()
+        result = policy.call(fetch)
+        duration = time.monotonic() - start
+
+        # Test after method execution
+        self.assertEqual(result_exp, result)
+        self.assertEqual(1, policy.hedges)
+        self.assertEqual(1, policy.hedge_wins)
+        self.assertLess(duration, 0.5)
+
+    def test_close(self):
+        """
+        Tests that the worker threads are shut down when the policy is closed
+        """
+        # Expected results
+        result_exp = b'body'
+
+        # Method execution
+        with S3ReadPolicy(timeout=1) as policy:
+            result = policy.call(lambda: result_exp)
+
+        # Test after method execution
+        self.assertEqual(result_exp, result)
+        with self.assertRaises(RuntimeError):
+            policy.call(lambda: result_exp)
+        # A policy without worker threads can be closed as well
+        S3ReadPolicy().close()
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,133 @@
+"""
+Test rolling window state methods
+"""
+import os
+import unittest
+
+import pandas as pd
+import boto3
+from moto import mock_s3
+
+from tradeETL.common.s3 import S3BucketConnector
+from tradeETL.common.window_state import WindowState
+
+
+class TestWindowStateMethods( unittest.TestCase ):
+    """
+    Testing rolling window state class
+    """
+
+    def setUp(self):
+        """
+        Setting up the environment
+        """
+
+        # mocking s3 connection start
+        self.mock_s3 = mock_s3()
+        self.mock_s3.start()
+
+        # defining class arguments
+        self.s3_access_key = 'AWS_ACCESS_KEY_ID'
+        self.s3_secret_key = 'AWS_SECRET_ACCESS_KEY'
+        self.s3_endpoint_url = 'https://s3.eu-central-1.amazonaws.com'
+        self.s3_bucket_name = 'test-bucket'
+        self.state_key = 'state/windows/window_state.parquet'
+
+        # creating s3 access keys as environment variables
+        os.environ[self.s3_access_key] = 'KEY1'
+        os.environ[self.s3_secret_key] = 'KEY2'
+
+        # Creating a bucket on the mocked s3
+        self.s3 = boto3.resource(
+            service_name = 's3',
+            endpoint_url = self.s3_endpoint_url
+        )
+
+        self.s3.create_bucket(Bucket=self.s3_bucket_name,
+            CreateBucketConfiguration={
+                'LocationConstraint': 'eu-central-1'
+            }
+        )
+
+        # Creating a S3BucketConnector instance
+        self.s3_bucket_state = S3BucketConnector( self.s3_access_key,
+                                                  self.s3_secret_key,
+                                                  self.s3_endpoint_url,
+                                                  self.s3_bucket_name
+                                                  )
+
+    def tearDown(self):
+        """
+        Executing after unit test
+        """
+
+        # mocking s3 connection stop
+        self.mock_s3.stop()
+
+    def test_read_state_no_state_file( self ):
+        """
+        Tests the read_state method when there is no state file
+        """
+        # Method execution
+        result = WindowState.read_state( self.state_key, self.s3_bucket_state )
+
+        # Test after method execution
+        self.assertIsNone( result )
+
+    def test_write_state( self ):
+        """
+        Tests that write_state keeps the sums after the run and the
+        sums the run started from
+        """
+        # Expected results
+        dates_exp = [ '2021-04-16', '2021-04-16', '2021-04-18', '2021-04-18' ]
+        days_exp = [ 2.0, 1.0, 3.0, 1.0 ]
+
+        # Test init
+        df_base = pd.DataFrame( { 'last_close': [ 12.0, 20.0 ], 'days': [ 2.0, 1.0 ],
+                                  'close_sum': [ 23.0, 20.0 ] }, index=[ 'A', 'B' ] )
+        df_sums = pd.DataFrame( { 'last_close': [ 14.0, 20.0 ], 'days': [ 3.0, 1.0 ],
+                                  'close_sum': [ 39.0, 20.0 ] }, index=[ 'A', 'B' ] )
+
+        # Method execution
+        result = WindowState.write_state( df_sums, '2021-04-18', df_base, '2021-04-16',
+                                          self.state_key, self.s3_bucket_state )
+
+        # Test after method execution
+        self.assertEqual( [ 'isin', 'date', 'last_close', 'days', 'close_sum' ],
+                          result.columns.tolist() )
+        self.assertEqual( dates_exp, result[ 'date' ].tolist() )
+        self.assertEqual( days_exp, result[ 'days' ].tolist() )
+        df_result = WindowState.read_state( self.state_key, self.s3_bucket_state )
+        pd.testing.assert_frame_equal( result, df_result )
+
+    def test_write_remove_days( self ):
+        """
+        Tests that write_days writes a day file per date, that remove_days
+        removes the day files that are not kept and that read_day reads them
+        """
+        # Expected results
+        dates_exp = [ '2021-04-16', '2021-04-17' ]
+
+        # Test init
+        days = { date: pd.DataFrame( { 'isin': [ 'A' ], 'date': [ date ], 'close': [ close ],
+                                       'volume': [ 100 ], 'turnover': [ close * 100 ],
+                                       'log_return': [ 0.1 ] } )
+                 for date, close in ( ( '2021-04-15', 10.0 ), ( '2021-04-16', 11.0 ),
+                                      ( '2021-04-17', 12.0 ) ) }
+
+        # Method execution
+        WindowState.write_days( days, self.state_key, self.s3_bucket_state )
+        removed = WindowState.remove_days( dates_exp, self.state_key, self.s3_bucket_state )
+
+        # Test after method execution
+        self.assertEqual( [ '2021-04-15' ], removed )
+        self.assertEqual( dates_exp, WindowState.list_days( self.state_key,
+                                                            self.s3_bucket_state ) )
+        self.assertTrue( WindowState.days_prefix( self.state_key ).startswith(
+            'state/windows/window_state/' ) )
+        pd.testing.assert_frame_equal( days[ '2021-04-17' ], WindowState.read_day(
+            self.state_key, '2021-04-17', self.s3_bucket_state ) )
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,243 @@
+"""TestAggregationMethods"""
+import unittest
+
+import numpy as np
+import pandas as pd
+
+from tradeETL.transformers.aggregations import aggregate_ohlcv_pandas, aggregate_ohlcv_numpy,\
+    partial_ohlcv, merge_ohlcv_partials, add_time_key, time_ordered
+from tradeETL.transformers.etl_transformer import etlSourceConfig, etlTargetConfig
+
+
+def aggregate_ohlcv_reference(data_frame, src_args, trg_args):
+    """
+    Aggregation of report 1 with one sort and transform per price column,
+    used as reference for the fused kernels
+    """
+    data_frame = data_frame.copy()
+    for column, func in ((trg_args.trg_col_op_price, 'first'),
+                         (trg_args.trg_col_clos_price, 'last')):
+        data_frame[column] = data_frame.sort_values(by=[src_args.src_col_time])\
+            .groupby([src_args.src_col_isin, src_args.src_col_date],
+                     observed=True)[src_args.src_col_start_price].transform(func)
+    data_frame.rename(columns={
+        src_args.src_col_min_price: trg_args.trg_col_min_price,
+        src_args.src_col_max_price: trg_args.trg_col_max_price,
+        src_args.src_col_traded_vol: trg_args.trg_col_dail_trad_vol}, inplace=True)
+    return data_frame.groupby([src_args.src_col_isin, src_args.src_col_date],
+                              as_index=False, observed=True)\
+        .agg({trg_args.trg_col_op_price: 'min',
+              trg_args.trg_col_clos_price: 'min',
+              trg_args.trg_col_min_price: 'min',
+              trg_args.trg_col_max_price: 'max',
+              trg_args.trg_col_dail_trad_vol: 'sum'})
+
+
+class TestAggregationMethods(unittest.TestCase):
+    """
+    Testing the aggregation kernels of the trade reports
+    """
+
+    def setUp(self):
+        """
+        Setting up the environment
+        """
+        self.src_args = etlSourceConfig(
+            src_first_extract_date='2021-04-01',
+            src_columns=['ISIN', 'Date', 'Time', 'StartPrice', 'MinPrice',
+                         'MaxPrice', 'TradedVolume'],
+            src_col_date='Date',
+            src_col_isin='ISIN',
+            src_col_time='Time',
+            src_col_start_price='StartPrice',
+            src_col_min_price='MinPrice',
+            src_col_max_price='MaxPrice',
+            src_col_traded_vol='TradedVolume')
+        self.trg_args = etlTargetConfig(
+            trg_col_isin='isin',
+            trg_col_date='date',
+            trg_col_op_price='opening_price_eur',
+            trg_col_clos_price='closing_price_eur',
+            trg_col_min_price='minimum_price_eur',
+            trg_col_max_price='maximum_price_eur',
+            trg_col_dail_trad_vol='daily_traded_volume',
+            trg_col_ch_prev_clos='change_prev_closing_%',
+            trg_key='report1/Trade_daily_report1_',
+            trg_key_date_format='%Y%m%d_%H%M%S',
+            trg_format='parquet')
+        # Creating random trades in random order, the times are unique
+        # so that the first and last trade of a day are well defined
+        rng = np.random.default_rng(7)
+        n_rows = 5000
+        seconds = rng.choice(12 * 3600, n_rows, replace=False) + 8 * 3600
+        start_price = np.round(rng.uniform(1, 500, n_rows), 2)
+        self.df_src = pd.DataFrame({
+            'ISIN': rng.choice([f'DE{i:010d}' for i in range(50)], n_rows),
+            'Date': rng.choice(['2021-04-15', '2021-04-16', '2021-04-17'], n_rows),
+            'Time': [f'{sec // 3600:02d}:{sec // 60 % 60:02d}:{sec % 60:02d}'
+                     for sec in seconds],
+            'StartPrice': start_price,
+            'MinPrice': start_price - np.round(rng.uniform(0, 2, n_rows), 2),
+            'MaxPrice': start_price + np.round(rng.uniform(0, 2, n_rows), 2),
+            'TradedVolume': rng.integers(1, 10000, n_rows)})
+
+    def test_aggregate_ohlcv_pandas(self):
+        """
+        Tests that the fused aggregation returns the same data frame
+        as the aggregation with one sort per price column
+        """
+        # Expected results
+        df_exp = aggregate_ohlcv_reference(self.df_src, self.src_args, self.trg_args)
+        # Method execution
+        df_result = aggregate_ohlcv_pandas(self.df_src, self.src_args, self.trg_args)
+        # Test after method execution
+        pd.testing.assert_frame_equal(df_exp, df_result)
+
+    def test_aggregate_ohlcv_pandas_category(self):
+        """
+        Tests the fused aggregation with ISIN as category column
+        """
+        # Test init
+        df_src = self.df_src.astype({'ISIN': 'category'})
+        # Expected results
+        df_exp = aggregate_ohlcv_reference(df_src, self.src_args, self.trg_args)
+        # Method execution
+        df_result = aggregate_ohlcv_pandas(df_src, self.src_args, self.trg_args)
+        # Test after method execution
+        pd.testing.assert_frame_equal(df_exp, df_result)
+
+    def test_aggregate_ohlcv_numpy(self):
+        """
+        Tests that the numpy aggregation returns the same data frame
+        as the pandas aggregation
+        """
+        # Expected results
+        df_exp = aggregate_ohlcv_pandas(self.df_src, self.src_args, self.trg_args)
+        # Method execution
+        df_result = aggregate_ohlcv_numpy(self.df_src, self.src_args, self.trg_args)
+        # Test after method execution
+        pd.testing.assert_frame_equal(df_exp, df_result)
+
+    def test_aggregate_ohlcv_numpy_schema(self):
+        """
+        Tests the numpy aggregation with ISIN as category
+        and Date as datetime column
+        """
+        # Test init
+        df_src = self.df_src.astype({'ISIN': 'category', 'Date': 'datetime64[ns]'})
+        # Expected results
+        df_exp = aggregate_ohlcv_pandas(df_src, self.src_args, self.trg_args)
+        # Method execution
+        df_result = aggregate_ohlcv_numpy(df_src, self.src_args, self.trg_args)
+        # Test after method execution
+        pd.testing.assert_frame_equal(df_exp, df_result)
+
+    def test_aggregate_ohlcv_numpy_ties(self):
+        """
+        Tests that the numpy aggregation keeps the input order
+        of trades with the same time like the pandas aggregation
+        """
+        # Test init
+        df_src = self.df_src.assign(Time='12:00:00')
+        # Expected results
+        df_exp = aggregate_ohlcv_pandas(df_src, self.src_args, self.trg_args)
+        # Method execution
+        df_result = aggregate_ohlcv_numpy(df_src, self.src_args, self.trg_args)
+        # Test after method execution
+        pd.testing.assert_frame_equal(df_exp, df_result)
+
+
+    def test_add_time_key(self):
+        """
+        Tests that the time key holds date and time as seconds since the epoch
+        and that rows without date or time get -1
+        """
+        # Expected results
+        key_exp = [1618488000, 1618574445, -1, -1]
+        # Test init
+        df_src = pd.DataFrame({'Date': ['2021-04-15', '2021-04-16', None, '2021-04-16'],
+                               'Time': ['12:00', '12:00:45', '12:00', None]})
+        src_args = self.src_args._replace(src_col_time_key='TimeKey')
+        # Method execution
+        df_result = add_time_key(df_src, src_args)
+        df_result_datetime = add_time_key(df_src.astype({'Date': 'datetime64[ns]'}), src_args)
+        # Test after method execution
+        self.assertEqual(key_exp, df_result['TimeKey'].tolist())
+        self.assertEqual(key_exp, df_result_datetime['TimeKey'].tolist())
+        self.assertEqual('int64', df_result['TimeKey'].dtype.name)
+        self.assertNotIn('TimeKey', df_src)
+
+    def test_aggregate_time_key(self):
+        """
+        Tests that the aggregations ordering by the time key return
+        the same data frame as the aggregations ordering by time
+        """
+        # Test init
+        src_args = self.src_args._replace(src_col_time_key='TimeKey')
+        df_src = add_time_key(self.df_src, src_args)
+        for aggregate in (aggregate_ohlcv_pandas, aggregate_ohlcv_numpy):
+            # Expected results
+            df_exp = aggregate(self.df_src, self.src_args, self.trg_args)
+            # Method execution
+            df_result = aggregate(df_src, src_args, self.trg_args)
+            # Test after method execution
+            pd.testing.assert_frame_equal(df_exp, df_result)
+
+    def test_time_ordered(self):
+        """
+        Tests the order check of the trades by date and time and by the time key
+        """
+        # Test init
+        df_src = pd.DataFrame({'Date': ['2021-04-15', '2021-04-15', '2021-04-16', '2021-04-16'],
+                               'Time': ['12:00', '12:00', '08:00', '09:30']})
+        src_args = self.src_args._replace(src_col_time_key='TimeKey')
+        df_unordered = df_src.assign(Time=['12:00', '11:59', '08:00', '09:30'])
+        # Method execution and test after method execution
+        self.assertTrue(time_ordered(df_src, self.src_args))
+        self.assertTrue(time_ordered(add_time_key(df_src, src_args), src_args))
+        self.assertTrue(time_ordered(df_src.iloc[:0], self.src_args))
+        self.assertFalse(time_ordered(df_unordered, self.src_args))
+        self.assertFalse(time_ordered(add_time_key(df_unordered, src_args), src_args))
+        self.assertFalse(time_ordered(df_src.iloc[::-1], self.src_args))
+
+    def test_aggregate_presorted(self):
+        """
+        Tests that the aggregations with src_presorted return the same data frame
+        for trades ordered by date and time and for trades that are not ordered
+        """
+        # Test init
+        src_args = self.src_args._replace(src_presorted=True)
+        df_sorted = self.df_src.sort_values(by=['Date', 'Time'], kind='stable')\
+            .reset_index(drop=True)
+        for aggregate in (aggregate_ohlcv_pandas, aggregate_ohlcv_numpy):
+            for df_src in (df_sorted, df_sorted.astype({'ISIN': 'category'}), self.df_src):
+                # Expected results
+                df_exp = aggregate(df_src, self.src_args, self.trg_args)
+                # Method execution
+                df_result = aggregate(df_src, src_args, self.trg_args)
+                # Test after method execution
+                pd.testing.assert_frame_equal(df_exp, df_result)
+
+    def test_merge_ohlcv_partials(self):
+        """
+        Tests that merging the partial aggregates of the source files returns
+        the same data frame as the aggregation of the concatenated files
+        """
+        for df_src in (self.df_src,
+                       self.df_src.astype({'ISIN': 'category'}),
+                       self.df_src.assign(Time='12:00:00')):
+            # Test init
+            files = [df_src.iloc[start:start + 700] for start in range(0, len(df_src), 700)]
+            df_src = pd.concat(files + [df_src.iloc[:0]], ignore_index=True)
+            # Expected results
+            df_exp = aggregate_ohlcv_pandas(df_src, self.src_args, self.trg_args)
+            # Method execution
+            df_partials = pd.concat([partial_ohlcv(file, self.src_args, self.trg_args)
+                                     for file in files + [df_src.iloc[:0]]], ignore_index=True)
+            df_result = merge_ohlcv_partials(df_partials, self.src_args, self.trg_args)
+            # Test after method execution
+            self.assertLess(len(df_partials), len(df_src))
+            pd.testing.assert_frame_equal(df_exp, df_result)
+
+if __name__ == '__main__':
+    unittest.main()
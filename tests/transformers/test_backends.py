@@ -0,0 +1,217 @@
+"""TestComputeBackends"""
+import unittest
+
+import numpy as np
+import pandas as pd
+import pyarrow as pa
+
+from tradeETL.transformers.backends import ComputeBackend, PandasBackend, ArrowBackend
+from tradeETL.transformers.etl_transformer import etlSourceConfig, etlTargetConfig,\
+    aggregate_report1
+
+
+class TestComputeBackends(unittest.TestCase):
+    """
+    Testing that the arrow compute backend returns the same data as the pandas backend
+    """
+
+    def setUp(self):
+        """
+        Setting up the environment
+        """
+        self.src_args = etlSourceConfig(
+            src_first_extract_date='2021-04-01',
+            src_columns=['ISIN', 'Date', 'Time', 'StartPrice', 'MinPrice',
+                         'MaxPrice', 'TradedVolume'],
+            src_col_date='Date',
+            src_col_isin='ISIN',
+            src_col_time='Time',
+            src_col_start_price='StartPrice',
+            src_col_min_price='MinPrice',
+            src_col_max_price='MaxPrice',
+            src_col_traded_vol='TradedVolume')
+        self.trg_args = etlTargetConfig(
+            trg_col_isin='isin',
+            trg_col_date='date',
+            trg_col_op_price='opening_price_eur',
+            trg_col_clos_price='closing_price_eur',
+            trg_col_min_price='minimum_price_eur',
+            trg_col_max_price='maximum_price_eur',
+            trg_col_dail_trad_vol='daily_traded_volume',
+            trg_col_ch_prev_clos='change_prev_closing_%',
+            trg_key='report1/Trade_daily_report1_',
+            trg_key_date_format='%Y%m%d_%H%M%S',
+            trg_format='parquet')
+        self.pandas_backend = PandasBackend()
+        self.arrow_backend = ArrowBackend()
+        # Creating random trades in random order with missing values
+        rng = np.random.default_rng(11)
+        n_rows = 5000
+        seconds = rng.integers(8 * 3600, 20 * 3600, n_rows)
+        start_price = np.round(rng.uniform(1, 500, n_rows), 2)
+        start_price[rng.choice(n_rows, 20, replace=False)] = np.nan
+        self.df_src = pd.DataFrame({
+            'ISIN': rng.choice([f'DE{i:010d}' for i in range(50)], n_rows),
+            'Date': rng.choice(['2021-04-15', '2021-04-16', '2021-04-17'], n_rows),
+            'Time': [f'{sec // 3600:02d}:{sec // 60 % 60:02d}:{sec % 60:02d}'
+                     for sec in seconds],
+            'StartPrice': start_price,
+            'MinPrice': start_price - np.round(rng.uniform(0, 2, n_rows), 2),
+            'MaxPrice': start_price + np.round(rng.uniform(0, 2, n_rows), 2),
+            'TradedVolume': rng.integers(1, 10000, n_rows)})
+        self.df_seed = pd.DataFrame({
+            'ISIN': [f'DE{i:010d}' for i in range(0, 50, 2)],
+            'Date': '2021-04-14',
+            'opening_price_eur': np.round(rng.uniform(1, 500, 25), 2)})
+
+    def run_report1(self, df_src: pd.DataFrame, df_seed: pd.DataFrame = None):
+        """
+        Runs the transformation steps of report 1 with both backends
+
+        Returns:
+          df_exp: Pandas DataFrame of the pandas backend
+          df_result: Pandas DataFrame of the arrow backend
+        """
+        results = []
+        for backend, data in ((self.pandas_backend, df_src),
+                              (self.arrow_backend, pa.Table.from_pandas(
+                                  df_src, preserve_index=False))):
+            data = aggregate_report1(data, self.src_args, self.trg_args, df_seed, backend)
+            data = backend.round(data, 2)
+            data = backend.filter_from_date(data, 'Date', '2021-04-16')
+            results.append(data)
+        df_exp, table_result = results
+        return df_exp, table_result.to_pandas()
+
+    def test_report1(self):
+        """
+        Tests the transformation of report 1 with string columns
+        """
+        # Method execution
+        df_exp, df_result = self.run_report1(self.df_src)
+        # Test after method execution
+        pd.testing.assert_frame_equal(df_exp, df_result)
+
+    def test_report1_category_seed(self):
+        """
+        Tests the transformation of report 1 with ISIN as category column,
+        the same time for all trades and a seed of the previous trading day
+        """
+        # Test init
+        df_src = self.df_src.astype({'ISIN': 'category'}).assign(Time='12:00:00')
+        # Method execution
+        df_exp, df_result = self.run_report1(df_src, self.df_seed)
+        # Test after method execution
+        pd.testing.assert_frame_equal(df_exp, df_result, check_categorical=False)
+
+    def test_report1_time_key(self):
+        """
+        Tests the transformation of report 1 ordering by the time key
+        """
+        # Expected results
+        df_exp, _ = self.run_report1(self.df_src)
+        # Test init
+        self.src_args = self.src_args._replace(src_col_time_key='TimeKey')
+        # Method execution
+        df_result_pandas, df_result_arrow = self.run_report1(self.df_src)
+        # Test after method execution
+        pd.testing.assert_frame_equal(df_exp, df_result_pandas)
+        pd.testing.assert_frame_equal(df_exp, df_result_arrow)
+
+    def test_report1_presorted(self):
+        """
+        Tests the transformation of report 1 with src_presorted for
+        trades ordered by date and time and for trades that are not ordered
+        """
+        # Test init
+        df_sorted = self.df_src.sort_values(by=['Date', 'Time'], kind='stable')\
+            .reset_index(drop=True)
+        for df_src in (df_sorted, self.df_src):
+            # Expected results
+            df_exp, _ = self.run_report1(df_src)
+            self.src_args = self.src_args._replace(src_presorted=True)
+            # Method execution
+            df_result_pandas, df_result_arrow = self.run_report1(df_src)
+            self.src_args = self.src_args._replace(src_presorted=False)
+            # Test after method execution
+            pd.testing.assert_frame_equal(df_exp, df_result_pandas)
+            pd.testing.assert_frame_equal(df_exp, df_result_arrow)
+
+    def test_partial_merge(self):
+        """
+        Tests that merging the partial aggregates of the source files
+        with the arrow backend returns the data of the pandas backend
+        """
+        # Test init
+        files = [self.df_src.iloc[start:start + 700] for start in range(0, len(self.df_src), 700)]
+        src_args = self.src_args._replace(src_partial_agg=True)
+        results = []
+        for backend, frames in ((self.pandas_backend, files),
+                                (self.arrow_backend, [pa.Table.from_pandas(
+                                    file, preserve_index=False) for file in files])):
+            # Method execution
+            data = backend.concat([backend.partial(frame, self.src_args, self.trg_args)
+                                   for frame in frames])
+            results.append(aggregate_report1(data, src_args, self.trg_args, None, backend))
+        # Test after method execution
+        df_exp, table_result = results
+        pd.testing.assert_frame_equal(df_exp, table_result.to_pandas())
+
+    def test_round(self):
+        """
+        Tests that the arrow backend rounds like the pandas backend,
+        also values just below or above a rounded decimal
+        """
+        # Test init
+        df_src = pd.DataFrame({
+            'ISIN': ['A', 'B', 'C', 'D', 'E', 'F'],
+            'price': [1.67 - 1, 4.57 - 1, 2.675, 0.125, -1.005, np.nan],
+            'volume': [1, 2, 3, 4, 5, 6]})
+        results = []
+        for decimals in (2, 0):
+            # Method execution
+            df_exp = self.pandas_backend.round(df_src, decimals)
+            df_result = self.arrow_backend.round(
+                pa.Table.from_pandas(df_src, preserve_index=False), decimals).to_pandas()
+            results.append(df_result)
+            # Test after method execution
+            pd.testing.assert_frame_equal(df_exp, df_result, check_exact=True)
+        self.assertEqual([0.67, 3.57, 2.68, 0.12, -1.0], results[0]['price'][:5].tolist())
+
+    def test_concat_schema(self):
+        """
+        Tests that the arrow backend concatenates with the source schema
+        like the pandas backend
+        """
+        # Test init
+        schema = {'ISIN': 'category', 'TradedVolume': 'float64'}
+        files = [self.df_src.iloc[:700].astype(schema), self.df_src.iloc[700:1500].astype(schema)]
+        tables = [pa.Table.from_pandas(file, preserve_index=False) for file in files]
+        tables[1] = tables[1].set_column(6, 'TradedVolume',
+                                         tables[1]['TradedVolume'].cast(pa.int64()))
+        # Method execution
+        df_exp = self.pandas_backend.concat(files, schema)
+        table_result = self.arrow_backend.concat(tables, schema)
+        # Test after method execution
+        self.assertEqual(pa.float64(), table_result.schema.field('TradedVolume').type)
+        self.assertEqual(1, len({tuple(chunk.dictionary.to_pylist())
+                                 for chunk in table_result['ISIN'].chunks}))
+        pd.testing.assert_frame_equal(df_exp, table_result.to_pandas())
+
+    def test_abstract_backend(self):
+        """
+        Tests that a backend has to implement every step
+        """
+        # Test init
+        class IncompleteBackend(ComputeBackend):
+            """Backend without the transformation steps"""
+            def empty(self):
+                return pd.DataFrame()
+        # Method execution and test after method execution
+        with self.assertRaises(TypeError):
+            IncompleteBackend()
+        with self.assertRaises(TypeError):
+            ComputeBackend()
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,152 @@
+"""TestReportCompactionMethods"""
+import os
+import unittest
+
+import boto3
+import pandas as pd
+from moto import mock_s3
+
+from tradeETL.common.s3 import S3BucketConnector
+from tradeETL.transformers.compaction import ReportCompaction
+from tradeETL.transformers.etl_transformer import etlSourceConfig, etlTargetConfig
+
+class TestReportCompactionMethods(unittest.TestCase):
+    """
+    Testing the ReportCompaction class.
+    """
+
+    def setUp(self):
+        """
+        Setting up the environment
+        """
+        # mocking s3 connection start
+        self.mock_s3 = mock_s3()
+        self.mock_s3.start()
+        # Defining the class arguments
+        self.s3_access_key = 'AWS_ACCESS_KEY_ID'
+        self.s3_secret_key = 'AWS_SECRET_ACCESS_KEY'
+        self.s3_endpoint_url = 'https://s3.eu-central-1.amazonaws.com'
+        self.s3_bucket_name = 'trg-bucket'
+        # Creating s3 access keys as environment variables
+        os.environ[self.s3_access_key] = 'KEY1'
+        os.environ[self.s3_secret_key] = 'KEY2'
+        # Creating the bucket on the mocked s3
+        self.s3 = boto3.resource(service_name='s3', endpoint_url=self.s3_endpoint_url)
+        self.s3.create_bucket(Bucket=self.s3_bucket_name,
+                              CreateBucketConfiguration={
+                                  'LocationConstraint': 'eu-central-1'})
+        self.s3_bucket = S3BucketConnector(self.s3_access_key, self.s3_secret_key,
+                                           self.s3_endpoint_url, self.s3_bucket_name)
+        # Creating source and target configuration
+        self.source_config = etlSourceConfig(
+            src_first_extract_date='2021-04-01',
+            src_columns=['ISIN', 'Date', 'Time', 'StartPrice', 'MinPrice',
+                         'MaxPrice', 'TradedVolume'],
+            src_col_date='Date',
+            src_col_isin='ISIN',
+            src_col_time='Time',
+            src_col_start_price='StartPrice',
+            src_col_min_price='MinPrice',
+            src_col_max_price='MaxPrice',
+            src_col_traded_vol='TradedVolume')
+        self.target_config = etlTargetConfig(
+            trg_col_isin='isin',
+            trg_col_date='date',
+            trg_col_op_price='opening_price_eur',
+            trg_col_clos_price='closing_price_eur',
+            trg_col_min_price='minimum_price_eur',
+            trg_col_max_price='maximum_price_eur',
+            trg_col_dail_trad_vol='daily_traded_volume',
+            trg_col_ch_prev_clos='change_prev_closing_%',
+            trg_key='report1/Trade_daily_report1_',
+            trg_key_date_format='%Y%m%d_%H%M%S',
+            trg_format='parquet',
+            trg_compact_rows=3)
+
+    def tearDown(self):
+        # mocking s3 connection stop
+        self.mock_s3.stop()
+
+    def test_compact_files(self):
+        """
+        Tests that the files with less than trg_compact_rows rows are merged with the
+        files that share their dates into files ordered by date and ISIN, taking
+        every date from the latest run, and that compacted files are left alone
+        """
+        # Expected results
+        df_exp = pd.DataFrame(
+            [['AT0000A0E9W5', '2021-04-17', 20.21], ['DE0005140008', '2021-04-17', 30.10],
+             ['AT0000A0E9W5', '2021-04-18', 20.60], ['DE0005140008', '2021-04-18', 31.20],
+             ['AT0000A0E9W5', '2021-04-19', 23.58], ['DE0005140008', '2021-04-19', 32.00],
+             ['AT0000A0E9W5', '2021-04-21', 23.10], ['DE0005140008', '2021-04-21', 32.40]],
+            columns=['ISIN', 'Date', 'opening_price_eur'])
+        compacted_key = 'report1/Trade_daily_report1_20210412_070000_0000.parquet'
+        rows_exp = [5, 6, 2]
+        # Test init
+        target_config = self.target_config._replace(trg_compact_rows=5,
+                                                    trg_manifest_key='report1/manifest.parquet')
+        # A file of an earlier compaction with enough rows
+        self.s3_bucket.write_df_to_s3(pd.DataFrame(
+            [['AT0000A0E9W5', '2021-04-09', 19.00], ['DE0005140008', '2021-04-09', 29.00],
+             ['AT0000A0E9W5', '2021-04-12', 19.50], ['DE0005140008', '2021-04-12', 29.50],
+             ['DE0005140008', '2021-04-13', 29.80]], columns=df_exp.columns),
+            compacted_key, 'parquet')
+        self.s3_bucket.write_df_to_s3(pd.DataFrame(
+            [['DE0005140008', '2021-04-17', 30.10], ['AT0000A0E9W5', '2021-04-17', 20.21],
+             ['DE0005140008', '2021-04-18', 31.00], ['AT0000A0E9W5', '2021-04-18', 20.58],
+             ['AT0000A0E9W5', '2021-04-18', 20.58]], columns=df_exp.columns),
+            'report1/Trade_daily_report1_20210418_070000.parquet', 'parquet')
+        # A re-run of 2021-04-18 and the run of 2021-04-19
+        self.s3_bucket.write_df_to_s3(pd.DataFrame(
+            [['AT0000A0E9W5', '2021-04-18', 20.60], ['DE0005140008', '2021-04-18', 31.20],
+             ['DE0005140008', '2021-04-19', 32.00], ['AT0000A0E9W5', '2021-04-19', 23.58]],
+            columns=df_exp.columns),
+            'report1/Trade_daily_report1_20210420_070000.parquet', 'parquet')
+        # The run of 2021-04-21 without statistics
+        self.s3_bucket.write_df_to_s3(df_exp.iloc[[7, 6]],
+            'report1/Trade_daily_report1_20210422_070000.parquet', 'parquet',
+            parquet_options={'write_statistics': False})
+        # Method execution
+        deleted = ReportCompaction(self.s3_bucket, self.source_config, target_config).compact()
+        # Test after method execution
+        self.assertEqual(['report1/Trade_daily_report1_20210418_070000.parquet',
+                          'report1/Trade_daily_report1_20210420_070000.parquet',
+                          'report1/Trade_daily_report1_20210422_070000.parquet'], deleted)
+        trg_files = self.s3_bucket.list_files_in_prefix(self.target_config.trg_key)
+        self.assertEqual(compacted_key, trg_files[0])
+        self.assertEqual(['_0000.parquet', '_0001.parquet'], [key[-13:] for key in trg_files[1:]])
+        frames = [self.s3_bucket.read_parquet_to_df(key) for key in trg_files]
+        self.assertEqual(rows_exp, [len(frame) for frame in frames])
+        pd.testing.assert_frame_equal(df_exp, pd.concat(frames[1:], ignore_index=True))
+        # The manifest gets the written files, the file of the earlier compaction was not in it
+        self.assertEqual(trg_files[1:], self.s3_bucket.list_files_in_manifest(
+            'report1/manifest.parquet'))
+        self.assertEqual([trg_files[2]], self.s3_bucket.list_files_in_manifest(
+            'report1/manifest.parquet', start_date='2021-04-20'))
+        # A compaction of the compacted files keeps them
+        self.assertEqual([], ReportCompaction(self.s3_bucket, self.source_config,
+                                              target_config).compact())
+        self.assertEqual(trg_files, self.s3_bucket.list_files_in_prefix(self.target_config.trg_key))
+
+    def test_compact_partitions(self):
+        """
+        Tests that only the latest file of a date partition is kept
+        """
+        # Expected results
+        keys_exp = ['report1/date=2021-04-17/Trade_daily_report1_20210418_070000.parquet',
+                    'report1/date=2021-04-18/Trade_daily_report1_20210418_070000.parquet']
+        # Test init
+        target_config = self.target_config._replace(trg_partitioned=True)
+        df_partition = pd.DataFrame([['AT0000A0E9W5', 20.21]], columns=['ISIN', 'opening_price_eur'])
+        for key in ('report1/date=2021-04-17/Trade_daily_report1_20210417_070000.parquet',
+                    keys_exp[0], keys_exp[1]):
+            self.s3_bucket.write_df_to_s3(df_partition, key, 'parquet')
+        # Method execution
+        deleted = ReportCompaction(self.s3_bucket, self.source_config, target_config).compact()
+        # Test after method execution
+        self.assertEqual(['report1/date=2021-04-17/Trade_daily_report1_20210417_070000.parquet'],
+                         deleted)
+        self.assertEqual(keys_exp, self.s3_bucket.list_files_in_prefix('report1/'))
+
+if __name__ == '__main__':
+    unittest.main()
@@ -1,14 +1,19 @@
 """TestTradeETLMethods"""
 import os
+import asyncio
 import unittest
 from unittest.mock import patch
 from io import BytesIO
 
 import boto3
+import numpy as np
 import pandas as pd
+import pyarrow as pa
+import pyarrow.parquet as pq
 from moto import mock_s3
 
 from tradeETL.common.s3 import S3BucketConnector
+from tradeETL.common.custom_exceptions import WrongEngineException, WrongFormatException
 from tradeETL.common.meta_process import MetaProcess
 from tradeETL.transformers.etl_transformer import etlSourceConfig, etlTargetConfig, TradeETL
 
@@ -123,6 +128,23 @@ class TestETLMethods(unittest.TestCase):
         # mocking s3 connection stop
         self.mock_s3.stop()
 
+    def to_backend(self, data_frame: pd.DataFrame):
+        """
+        Returns a Pandas DataFrame as data of the compute backend of the target configuration
+        """
+        if self.target_config.trg_compute_backend == 'arrow':
+            return pa.Table.from_pandas(data_frame, preserve_index=False)
+        return data_frame
+
+    @staticmethod
+    def to_pandas(data):
+        """
+        Returns the data of a compute backend as Pandas DataFrame
+        """
+        if isinstance(data, pa.Table):
+            return data.to_pandas()
+        return data
+
     def test_extract_no_files(self):
         """
         Tests the extract method when
@@ -136,7 +158,7 @@ class TestETLMethods(unittest.TestCase):
         return_value=[extract_date, extract_date_list]):
             Trade_etl = TradeETL(self.s3_bucket_src, self.s3_bucket_trg,
                          self.meta_key, self.source_config, self.target_config)
-            df_return = Trade_etl.extract()
+            df_return = self.to_pandas(Trade_etl.extract())
         # Test after method execution
         self.assertTrue(df_return.empty)
 
@@ -155,7 +177,200 @@ class TestETLMethods(unittest.TestCase):
         return_value=[extract_date, extract_date_list]):
             Trade_etl = TradeETL(self.s3_bucket_src, self.s3_bucket_trg,
                          self.meta_key, self.source_config, self.target_config)
-            df_result = Trade_etl.extract()
+            df_result = self.to_pandas(Trade_etl.extract())
+        # Test after method execution
+        self.assertTrue(df_exp.equals(df_result))
+
+    def test_extract_files_concurrent(self):
+        """
+        Tests the extract method when the source files
+        are downloaded concurrently
+        """
+        # Expected results
+        df_exp = self.df_src.loc[1:8].reset_index(drop=True)
+        # Test init
+        extract_date = '2021-04-17'
+        extract_date_list = ['2021-04-16', '2021-04-17', '2021-04-18', '2021-04-19', '2021-04-20']
+        source_config = self.source_config._replace(src_max_workers=4)
+        # Method execution
+        with patch.object(MetaProcess, "return_date_list",
+        return_value=[extract_date, extract_date_list]):
+            trade_etl = TradeETL(self.s3_bucket_src, self.s3_bucket_trg,
+                         self.meta_key, source_config, self.target_config)
+            df_result = self.to_pandas(trade_etl.extract())
+        # Test after method execution
+        self.assertTrue(df_exp.equals(df_result))
+
+    def test_extract_files_arrow(self):
+        """
+        Tests the extract method when the source files
+        are parsed with the arrow engine
+        """
+        # Expected results
+        df_exp = self.df_src.loc[1:8].reset_index(drop=True)
+        # Test init
+        extract_date = '2021-04-17'
+        extract_date_list = ['2021-04-16', '2021-04-17', '2021-04-18', '2021-04-19', '2021-04-20']
+        source_config = self.source_config._replace(src_csv_engine='arrow')
+        # Method execution
+        with patch.object(MetaProcess, "return_date_list",
+        return_value=[extract_date, extract_date_list]):
+            trade_etl = TradeETL(self.s3_bucket_src, self.s3_bucket_trg,
+                         self.meta_key, source_config, self.target_config)
+            df_result = self.to_pandas(trade_etl.extract())
+        # Test after method execution
+        self.assertTrue(df_exp.equals(df_result))
+
+    def test_extract_transform_schema(self):
+        """
+        Tests the extract and transform_report1 methods when
+        the source files are parsed with a schema
+        """
+        # Expected results
+        df_exp = self.df_report.copy()
+        df_exp['ISIN'] = df_exp['ISIN'].astype('category')
+        df_exp['Date'] = pd.to_datetime(df_exp['Date'])
+        schema = {
+            'ISIN': 'category', 'Mnemonic': 'category', 'Date': 'date', 'Time': 'str',
+            'StartPrice': 'float64', 'EndPrice': 'float64', 'MinPrice': 'float64',
+            'MaxPrice': 'float64', 'TradedVolume': 'int64'
+        }
+        # Test init
+        extract_date = '2021-04-17'
+        extract_date_list = ['2021-04-16', '2021-04-17', '2021-04-18', '2021-04-19']
+        for engine in ('pandas', 'arrow'):
+            source_config = self.source_config._replace(src_schema=schema, src_csv_engine=engine)
+            # Method execution
+            with patch.object(MetaProcess, "return_date_list",
+            return_value=[extract_date, extract_date_list]):
+                trade_etl = TradeETL(self.s3_bucket_src, self.s3_bucket_trg,
+                             self.meta_key, source_config, self.target_config)
+                df_extract = self.to_pandas(trade_etl.extract())
+                df_result = self.to_pandas(trade_etl.transform_report1(
+                    self.to_backend(df_extract)))
+            # Test after method execution
+            self.assertEqual(list(schema), list(df_extract.columns))
+            self.assertEqual('category', df_extract['ISIN'].dtype.name)
+            self.assertEqual('datetime64[ns]', df_extract['Date'].dtype.name)
+            self.assertEqual('int64', df_extract['TradedVolume'].dtype.name)
+            pd.testing.assert_frame_equal(df_exp, df_result, check_categorical=False)
+
+    def test_extract_transform_partial_agg(self):
+        """
+        Tests the extract and transform_report1 methods when every
+        source file is reduced to a partial aggregate while extracting
+        """
+        # Expected results
+        df_exp = self.df_report
+        # Test init
+        extract_date = '2021-04-17'
+        extract_date_list = ['2021-04-16', '2021-04-17', '2021-04-18', '2021-04-19']
+        schema = {
+            'ISIN': 'category', 'Mnemonic': 'category', 'Date': 'str', 'Time': 'str',
+            'StartPrice': 'float64', 'EndPrice': 'float64', 'MinPrice': 'float64',
+            'MaxPrice': 'float64', 'TradedVolume': 'int64'
+        }
+        for source_config in (
+                self.source_config._replace(src_partial_agg=True, src_max_workers=4),
+                self.source_config._replace(src_partial_agg=True, src_schema=schema,
+                                            src_csv_engine='arrow')):
+            # Method execution
+            with patch.object(MetaProcess, "return_date_list",
+            return_value=[extract_date, extract_date_list]):
+                trade_etl = TradeETL(self.s3_bucket_src, self.s3_bucket_trg,
+                             self.meta_key, source_config, self.target_config)
+                df_extract = self.to_pandas(trade_etl.extract())
+                df_extract_async = self.to_pandas(asyncio.run(trade_etl.extract_async()))
+                df_result = self.to_pandas(trade_etl.transform_report1(
+                    self.to_backend(df_extract)))
+            # Test after method execution
+            self.assertEqual(8, len(df_extract))
+            pd.testing.assert_frame_equal(df_extract, df_extract_async)
+            pd.testing.assert_frame_equal(df_exp, df_result, check_categorical=False,
+                                          check_dtype=False)
+
+    def test_extract_transform_time_key(self):
+        """
+        Tests the extract and transform_report1 methods when the
+        time key is added to the source files while extracting
+        """
+        # Expected results
+        df_exp = self.df_report
+        time_key_exp = [1618585200, 1618664400, 1618668000]
+        # Test init
+        extract_date = '2021-04-17'
+        extract_date_list = ['2021-04-16', '2021-04-17', '2021-04-18', '2021-04-19']
+        source_config = self.source_config._replace(src_col_time_key='TimeKey')
+        for source_config, target_config in (
+                (source_config, self.target_config),
+                (source_config._replace(src_partial_agg=True), self.target_config),
+                (source_config, self.target_config._replace(trg_compute_backend='arrow'))):
+            # Method execution
+            with patch.object(MetaProcess, "return_date_list",
+            return_value=[extract_date, extract_date_list]):
+                trade_etl = TradeETL(self.s3_bucket_src, self.s3_bucket_trg,
+                             self.meta_key, source_config, target_config)
+                data_extract = trade_etl.extract()
+                data_extract_async = asyncio.run(trade_etl.extract_async())
+                df_result = trade_etl.backend.to_pandas(
+                    trade_etl.transform_report1(data_extract), list(df_exp.columns))
+            # Test after method execution
+            self.assertTrue(data_extract.equals(data_extract_async))
+            if not source_config.src_partial_agg:
+                self.assertEqual(time_key_exp, trade_etl.backend.to_pandas(
+                    data_extract, ['TimeKey'])['TimeKey'][:3].tolist())
+            pd.testing.assert_frame_equal(df_exp, df_result)
+
+    def test_extract_transform_presorted(self):
+        """
+        Tests that the extract method concatenates the files of a day by their hour
+        with src_presorted and that transform_report1 returns the report of sorted trades
+        """
+        # Expected results
+        times_exp = ['15:00', '13:00', '14:00', '06:00', '07:00', '08:00']
+        # Test init
+        extract_date = '2021-04-17'
+        extract_date_list = ['2021-04-16', '2021-04-17', '2021-04-18']
+        # The key of hour 6 is listed after the keys of hours 07 and 08
+        self.s3_bucket_src.write_df_to_s3(
+            self.df_src.loc[4:4].assign(Time='06:00', StartPrice=19.95),
+            '2021-04-18/2021-04-18_BINS_XETR6.csv', 'csv')
+        for target_config in (self.target_config,
+                              self.target_config._replace(trg_compute_backend='arrow')):
+            results = []
+            for source_config in (self.source_config,
+                                  self.source_config._replace(src_presorted=True)):
+                # Method execution
+                with patch.object(MetaProcess, "return_date_list",
+                return_value=[extract_date, extract_date_list]):
+                    trade_etl = TradeETL(self.s3_bucket_src, self.s3_bucket_trg,
+                                 self.meta_key, source_config, target_config)
+                    data_extract = trade_etl.extract()
+                    results.append(trade_etl.backend.to_pandas(
+                        trade_etl.transform_report1(data_extract), list(self.df_report.columns)))
+            # Test after method execution
+            self.assertEqual(times_exp, trade_etl.backend.to_pandas(
+                data_extract, ['Time'])['Time'].tolist())
+            self.assertEqual(19.95, results[1]['opening_price_eur'][1])
+            pd.testing.assert_frame_equal(results[0], results[1])
+
+    def test_extract_async(self):
+        """
+        Tests the extract_async method when
+        there are files to be extracted
+        """
+        # Expected results
+        df_exp = self.df_src.loc[1:8].reset_index(drop=True)
+        # Test init
+        extract_date = '2021-04-17'
+        extract_date_list = ['2021-04-16', '2021-04-17', '2021-04-18', '2021-04-19', '2021-04-20']
+        source_config = self.source_config._replace(src_max_workers=4)
+        # Method execution
+        with patch.object(MetaProcess, "return_date_list",
+        return_value=[extract_date, extract_date_list]):
+            trade_etl = TradeETL(self.s3_bucket_src, self.s3_bucket_trg,
+                         self.meta_key, source_config, self.target_config)
+            df_result = self.to_pandas(asyncio.run(trade_etl.extract_async()))
         # Test after method execution
         self.assertTrue(df_exp.equals(df_result))
 
@@ -176,7 +391,8 @@ class TestETLMethods(unittest.TestCase):
             trade_etl = TradeETL(self.s3_bucket_src, self.s3_bucket_trg,
                          self.meta_key, self.source_config, self.target_config)
             with self.assertLogs() as logm:
-                df_result = trade_etl.transform_report1(df_input)
+                df_result = self.to_pandas(trade_etl.transform_report1(
+                    self.to_backend(df_input)))
                 # Log test after method execution
                 self.assertIn(log_exp, logm.output[0])
         # Test after method execution
@@ -201,13 +417,267 @@ class TestETLMethods(unittest.TestCase):
             trade_etl = TradeETL(self.s3_bucket_src, self.s3_bucket_trg,
                          self.meta_key, self.source_config, self.target_config)
             with self.assertLogs() as logm:
-                df_result = trade_etl.transform_report1(df_input)
+                df_result = self.to_pandas(trade_etl.transform_report1(
+                    self.to_backend(df_input)))
                 # Log test after method execution
                 self.assertIn(log1_exp, logm.output[0])
                 self.assertIn(log2_exp, logm.output[1])
         # Test after method execution
         self.assertTrue(df_exp.equals(df_result))
 
+    def test_transform_report1_numpy(self):
+        """
+        Tests the transform_report1 method with
+        the numpy aggregation backend
+        """
+        # Expected results
+        df_exp = self.df_report
+        # Test init
+        extract_date = '2021-04-17'
+        extract_date_list = ['2021-04-16', '2021-04-17', '2021-04-18', '2021-04-19']
+        df_input = self.df_src.loc[1:8].reset_index(drop=True)
+        target_config = self.target_config._replace(trg_agg_backend='numpy')
+        # Method execution
+        with patch.object(MetaProcess, "return_date_list",
+        return_value=[extract_date, extract_date_list]):
+            trade_etl = TradeETL(self.s3_bucket_src, self.s3_bucket_trg,
+                         self.meta_key, self.source_config, target_config)
+            df_result = self.to_pandas(trade_etl.transform_report1(self.to_backend(df_input)))
+        # Test after method execution
+        pd.testing.assert_frame_equal(df_exp, df_result)
+
+    def test_transform_report1_workers(self):
+        """
+        Tests that the transform_report1 method running in worker
+        processes returns the same data frame as in this process
+        """
+        # Test init
+        extract_date = '2021-04-17'
+        extract_date_list = ['2021-04-16', '2021-04-17', '2021-04-18', '2021-04-19']
+        rng = np.random.default_rng(3)
+        n_rows = 3000
+        start_price = np.round(rng.uniform(1, 500, n_rows), 2)
+        df_input = pd.DataFrame({
+            'ISIN': pd.Categorical(rng.choice([f'DE{i:010d}' for i in range(40)], n_rows)),
+            'Mnemonic': 'MNE',
+            'Date': rng.choice(extract_date_list, n_rows),
+            'Time': [f'{minute // 60:02d}:{minute % 60:02d}'
+                     for minute in rng.integers(8 * 60, 20 * 60, n_rows)],
+            'StartPrice': start_price,
+            'EndPrice': start_price,
+            'MinPrice': start_price - 1,
+            'MaxPrice': start_price + 1,
+            'TradedVolume': rng.integers(1, 10000, n_rows)})
+        target_config = self.target_config._replace(trg_transform_workers=3)
+        with patch.object(MetaProcess, "return_date_list",
+        return_value=[extract_date, extract_date_list]):
+            # Expected results
+            df_exp = self.to_pandas(TradeETL(
+                self.s3_bucket_src, self.s3_bucket_trg, self.meta_key, self.source_config,
+                self.target_config).transform_report1(self.to_backend(df_input)))
+            # Method execution
+            trade_etl = TradeETL(self.s3_bucket_src, self.s3_bucket_trg,
+                         self.meta_key, self.source_config, target_config)
+            df_result = self.to_pandas(trade_etl.transform_report1(self.to_backend(df_input)))
+        # Test after method execution
+        pd.testing.assert_frame_equal(df_exp, df_result)
+
+    def test_partial_agg_backend(self):
+        """
+        Tests that an aggregation backend set with src_partial_agg is logged as not used
+        """
+        # Expected results
+        log_exp = 'The aggregation backend numpy is not used with src_partial_agg'
+        # Test init
+        source_config = self.source_config._replace(src_partial_agg=True)
+        target_config = self.target_config._replace(trg_agg_backend='numpy')
+        # Method execution
+        with patch.object(MetaProcess, "return_date_list",
+        return_value=['2021-04-17', ['2021-04-16', '2021-04-17']]):
+            with self.assertLogs() as logm:
+                TradeETL(self.s3_bucket_src, self.s3_bucket_trg,
+                         self.meta_key, source_config, target_config)
+                # Log test after method execution
+                self.assertIn(log_exp, logm.output[-1])
+
+    def test_transform_report1_wrong_backend(self):
+        """
+        Tests the transform_report1 method with
+        an aggregation backend that is not supported
+        """
+        # Expected results
+        log_exp = 'The aggregation backend polars is not supported'
+        # Test init
+        extract_date = '2021-04-17'
+        extract_date_list = ['2021-04-16', '2021-04-17', '2021-04-18', '2021-04-19']
+        df_input = self.df_src.loc[1:8].reset_index(drop=True)
+        target_config = self.target_config._replace(trg_agg_backend='polars')
+        # Method execution
+        with patch.object(MetaProcess, "return_date_list",
+        return_value=[extract_date, extract_date_list]):
+            trade_etl = TradeETL(self.s3_bucket_src, self.s3_bucket_trg,
+                         self.meta_key, self.source_config, target_config)
+            with self.assertLogs() as logm:
+                with self.assertRaises(WrongEngineException):
+                    trade_etl.transform_report1(self.to_backend(df_input))
+                # Log test after method execution
+                self.assertIn(log_exp, logm.output[0])
+
+    def test_wrong_compute_backend(self):
+        """
+        Tests the constructor with a compute backend that is not supported
+        """
+        # Expected results
+        log_exp = 'The compute backend polars is not supported'
+        # Test init
+        extract_date = '2021-04-17'
+        extract_date_list = ['2021-04-16', '2021-04-17', '2021-04-18', '2021-04-19']
+        target_config = self.target_config._replace(trg_compute_backend='polars')
+        # Method execution
+        with patch.object(MetaProcess, "return_date_list",
+        return_value=[extract_date, extract_date_list]):
+            with self.assertLogs() as logm:
+                with self.assertRaises(WrongEngineException):
+                    TradeETL(self.s3_bucket_src, self.s3_bucket_trg,
+                             self.meta_key, self.source_config, target_config)
+                # Log test after method execution
+                self.assertIn(log_exp, logm.output[0])
+
+    def test_etl_report1_arrow(self):
+        """
+        Tests the etl_report1 method with the arrow compute backend,
+        also with partial aggregates and the prior close state
+        """
+        # Expected results
+        df_exp = self.df_report
+        df_state_exp = pd.DataFrame([['AT0000A0E9W5', '2021-04-19', 23.58]],
+                                    columns=['isin', 'date', 'price'])
+        # Test init
+        extract_date = '2021-04-17'
+        extract_date_list = ['2021-04-16', '2021-04-17', '2021-04-18', '2021-04-19']
+        state_key = 'state/report1/prev_close.parquet'
+        target_config = self.target_config._replace(trg_compute_backend='arrow',
+                                                    trg_state_key=state_key)
+        for source_config in (self.source_config,
+                              self.source_config._replace(src_partial_agg=True,
+                                                          src_max_workers=4)):
+            self.s3_bucket_trg.write_df_to_s3(pd.DataFrame(
+                [['AT0000A0E9W5', '2021-04-16', 18.27]], columns=['isin', 'date', 'price']),
+                state_key, 'parquet')
+            # Method execution
+            with patch.object(MetaProcess, "return_date_list",
+            return_value=[extract_date, extract_date_list]):
+                trade_etl = TradeETL(self.s3_bucket_src, self.s3_bucket_trg,
+                             self.meta_key, source_config, target_config)
+                table_extract = trade_etl.extract()
+                table_extract_async = asyncio.run(trade_etl.extract_async())
+                trade_etl.etl_report1()
+            # Test after method execution
+            self.assertTrue(trade_etl.prev_close_seeded)
+            self.assertTrue(table_extract.equals(table_extract_async))
+            trg_file = self.s3_bucket_trg.list_files_in_prefix(self.target_config.trg_key)[0]
+            df_result = self.s3_bucket_trg.read_parquet_to_df(trg_file)
+            pd.testing.assert_frame_equal(df_exp, df_result)
+            df_state_result = self.s3_bucket_trg.read_parquet_to_df(state_key)
+            pd.testing.assert_frame_equal(df_state_exp, df_state_result)
+            # Cleanup after test
+            self.trg_bucket.objects.all().delete()
+
+    def test_etl_report1_prev_close_state(self):
+        """
+        Tests that the prior close state replaces the extraction
+        of the day before and is updated by the load method
+        """
+        # Expected results
+        df_exp = self.df_report
+        extract_date_list_exp = ['2021-04-17', '2021-04-18', '2021-04-19']
+        df_state_exp = pd.DataFrame([['AT0000A0E9W5', '2021-04-19', 23.58]],
+                                    columns=['isin', 'date', 'price'])
+        # Test init
+        extract_date = '2021-04-17'
+        extract_date_list = ['2021-04-16', '2021-04-17', '2021-04-18', '2021-04-19']
+        state_key = 'state/report1/prev_close.parquet'
+        target_config = self.target_config._replace(trg_state_key=state_key,
+                                                    trg_transform_workers=2)
+        self.s3_bucket_trg.write_df_to_s3(pd.DataFrame(
+            [['AT0000A0E9W5', '2021-04-16', 18.27]], columns=['isin', 'date', 'price']),
+            state_key, 'parquet')
+        # Method execution
+        with patch.object(MetaProcess, "return_date_list",
+        return_value=[extract_date, extract_date_list]):
+            trade_etl = TradeETL(self.s3_bucket_src, self.s3_bucket_trg,
+                         self.meta_key, self.source_config, target_config)
+            data_result = trade_etl.transform_report1(trade_etl.extract())
+            trade_etl.load(data_result)
+            df_result = self.to_pandas(data_result)
+        # Test after method execution
+        self.assertEqual(extract_date_list_exp, trade_etl.extract_date_list)
+        pd.testing.assert_frame_equal(df_exp, df_result)
+        df_state_result = self.s3_bucket_trg.read_parquet_to_df(state_key)
+        pd.testing.assert_frame_equal(df_state_exp, df_state_result)
+
+    def test_prev_close_state_non_trading_day(self):
+        """
+        Tests that a prior close state without prices of the day before the
+        extract date gives the same change to the previous day as a run that
+        extracts that day without source files
+        """
+        # Expected results
+        changes_exp = [None, 1.83, 14.58]
+        # Test init
+        extract_date = '2021-04-17'
+        extract_date_list = ['2021-04-16', '2021-04-17', '2021-04-18', '2021-04-19']
+        state_key = 'state/report1/prev_close.parquet'
+        # 2021-04-16 is a non-trading day, the state has the price of the day before
+        for key in self.s3_bucket_src.list_files_in_prefix('2021-04-16'):
+            self.src_bucket.Object(key=key).delete()
+        self.s3_bucket_trg.write_df_to_s3(pd.DataFrame(
+            [['AT0000A0E9W5', '2021-04-15', 18.27]], columns=['isin', 'date', 'price']),
+            state_key, 'parquet')
+        results = []
+        for target_config in (self.target_config,
+                              self.target_config._replace(trg_state_key=state_key)):
+            # Method execution
+            with patch.object(MetaProcess, "return_date_list",
+            return_value=[extract_date, extract_date_list]):
+                trade_etl = TradeETL(self.s3_bucket_src, self.s3_bucket_trg,
+                             self.meta_key, self.source_config, target_config)
+                results.append(self.to_pandas(trade_etl.transform_report1(trade_etl.extract())))
+        # Test after method execution
+        self.assertTrue(trade_etl.prev_close_seeded)
+        pd.testing.assert_frame_equal(results[0], results[1])
+        self.assertEqual(changes_exp, [None if pd.isna(change) else change
+                                       for change in results[1]['change_prev_closing_%']])
+
+    def test_prev_close_state_ahead(self):
+        """
+        Tests that a prior close state with dates from the extract
+        date on is not used to seed the change to the previous day
+        """
+        # Expected results
+        df_exp = self.df_report
+        log_exp = 'The prior close state is ahead of the meta file and is not used.'
+        # Test init
+        extract_date = '2021-04-17'
+        extract_date_list = ['2021-04-16', '2021-04-17', '2021-04-18', '2021-04-19']
+        state_key = 'state/report1/prev_close.parquet'
+        target_config = self.target_config._replace(trg_state_key=state_key)
+        self.s3_bucket_trg.write_df_to_s3(pd.DataFrame(
+            [['AT0000A0E9W5', '2021-04-17', 20.21]], columns=['isin', 'date', 'price']),
+            state_key, 'parquet')
+        # Method execution
+        with patch.object(MetaProcess, "return_date_list",
+        return_value=[extract_date, extract_date_list]):
+            with self.assertLogs() as logm:
+                trade_etl = TradeETL(self.s3_bucket_src, self.s3_bucket_trg,
+                             self.meta_key, self.source_config, target_config)
+                # Log test after method execution
+                self.assertIn(log_exp, logm.output[-1])
+            df_result = self.to_pandas(trade_etl.transform_report1(trade_etl.extract()))
+        # Test after method execution
+        self.assertEqual(extract_date_list, trade_etl.extract_date_list)
+        pd.testing.assert_frame_equal(df_exp, df_result)
+
     def test_load(self):
         """
         Tests the load method
@@ -227,7 +697,7 @@ class TestETLMethods(unittest.TestCase):
             trade_etl = TradeETL(self.s3_bucket_src, self.s3_bucket_trg,
                          self.meta_key, self.source_config, self.target_config)
             with self.assertLogs() as logm:
-                trade_etl.load(df_input)
+                trade_etl.load(self.to_backend(df_input))
                 # Log test after method execution
                 self.assertIn(log1_exp, logm.output[1])
                 self.assertIn(log2_exp, logm.output[4])
@@ -254,6 +724,234 @@ class TestETLMethods(unittest.TestCase):
             }
         )
 
+    def test_load_partitioned(self):
+        """
+        Tests the load method writing one parquet file per date partition, ordered
+        by ISIN with row groups of trg_row_group_size and column statistics
+        """
+        # Expected results
+        dates_exp = ['2021-04-17', '2021-04-18', '2021-04-19']
+        isins_exp = ['AT0000A0E9W5', 'DE0005140008']
+        # Test init
+        extract_date = '2021-04-17'
+        extract_date_list = ['2021-04-16', '2021-04-17', '2021-04-18', '2021-04-19']
+        df_input = pd.concat([self.df_report.assign(ISIN='DE0005140008'), self.df_report],
+                             ignore_index=True)
+        target_config = self.target_config._replace(trg_partitioned=True, trg_row_group_size=1)
+        for target_config in (target_config,
+                              target_config._replace(trg_compute_backend='arrow')):
+            # Method execution
+            with patch.object(MetaProcess, "return_date_list",
+            return_value=[extract_date, extract_date_list]):
+                trade_etl = TradeETL(self.s3_bucket_src, self.s3_bucket_trg,
+                             self.meta_key, self.source_config, target_config)
+                trade_etl.load(pa.Table.from_pandas(df_input, preserve_index=False)
+                               if target_config.trg_compute_backend == 'arrow' else df_input)
+            # Test after method execution
+            trg_files = self.s3_bucket_trg.list_files_in_prefix('report1/')
+            self.assertEqual([f'report1/date={date}/Trade_daily_report1_' for date in dates_exp],
+                             [key.rsplit('/', 1)[0] + '/Trade_daily_report1_'
+                              for key in trg_files])
+            for trg_file, date in zip(trg_files, dates_exp):
+                data = self.trg_bucket.Object(key=trg_file).get().get('Body').read()
+                parquet_file = pq.ParquetFile(BytesIO(data))
+                self.assertEqual(2, parquet_file.metadata.num_row_groups)
+                statistics = parquet_file.metadata.row_group(1).column(0).statistics
+                self.assertEqual(isins_exp[1], statistics.min)
+                df_result = parquet_file.read().to_pandas()
+                self.assertEqual(isins_exp, df_result['ISIN'].tolist())
+                pd.testing.assert_frame_equal(
+                    df_input[df_input['Date'] == date].sort_values(by='ISIN')\
+                        .drop(columns=['Date']).reset_index(drop=True), df_result)
+            # Cleanup after test
+            for trg_file in trg_files:
+                self.trg_bucket.Object(key=trg_file).delete()
+
+    def test_load_upsert(self):
+        """
+        Tests that the load method with trg_upsert replaces the files of
+        the written date partitions and keeps the other partitions
+        """
+        # Expected results
+        log_exp = 'Replaced 2 files of partition 2021-04-17.'
+        old_keys = ['report1/date=2021-04-17/Trade_daily_report1_20210417_070000.parquet',
+                    'report1/date=2021-04-17/Trade_daily_report1_20210418_070000.parquet',
+                    'report1/date=2021-04-16/Trade_daily_report1_20210417_070000.parquet']
+        # Test init
+        extract_date = '2021-04-17'
+        extract_date_list = ['2021-04-16', '2021-04-17', '2021-04-18', '2021-04-19']
+        target_config = self.target_config._replace(trg_partitioned=True, trg_upsert=True)
+        for key in old_keys:
+            self.s3_bucket_trg.write_df_to_s3(self.df_report.drop(columns=['Date']).assign(
+                opening_price_eur=1.0), key, 'parquet')
+        # Method execution
+        with patch.object(MetaProcess, "return_date_list",
+        return_value=[extract_date, extract_date_list]):
+            trade_etl = TradeETL(self.s3_bucket_src, self.s3_bucket_trg,
+                         self.meta_key, self.source_config, target_config)
+            with self.assertLogs() as logm:
+                trade_etl.load(self.to_backend(self.df_report))
+                # Log test after method execution
+                self.assertIn(log_exp, [output.split(':', 2)[-1] for output in logm.output])
+        # Test after method execution
+        trg_files = self.s3_bucket_trg.list_files_in_prefix('report1/')
+        self.assertEqual(4, len(trg_files))
+        self.assertEqual(old_keys[2], trg_files[0])
+        self.assertNotIn(old_keys[0], trg_files)
+        self.assertNotIn(old_keys[1], trg_files)
+        df_result = self.s3_bucket_trg.read_parquet_to_df(trg_files[1])
+        self.assertEqual([20.21], df_result['opening_price_eur'].tolist())
+
+    def test_load_manifest(self):
+        """
+        Tests that the load method lists the flat and the partitioned
+        target files with their date and ISIN range in the manifest
+        """
+        # Expected results
+        manifest_key = 'manifest/report1.parquet'
+        dates_exp = [['2021-04-17', '2021-04-19'], ['2021-04-17', '2021-04-17'],
+                     ['2021-04-18', '2021-04-18'], ['2021-04-19', '2021-04-19']]
+        rows_exp = [3, 1, 1, 1]
+        # Test init
+        extract_date = '2021-04-17'
+        extract_date_list = ['2021-04-16', '2021-04-17', '2021-04-18', '2021-04-19']
+        target_config = self.target_config._replace(trg_manifest_key=manifest_key)
+        for target_config in (target_config,
+                              target_config._replace(trg_partitioned=True, trg_upsert=True,
+                                                     trg_compute_backend='arrow')):
+            # Method execution
+            with patch.object(MetaProcess, "return_date_list",
+            return_value=[extract_date, extract_date_list]):
+                trade_etl = TradeETL(self.s3_bucket_src, self.s3_bucket_trg,
+                             self.meta_key, self.source_config, target_config)
+                trade_etl.load(pa.Table.from_pandas(self.df_report, preserve_index=False)
+                               if target_config.trg_compute_backend == 'arrow'
+                               else self.df_report)
+        # Test after method execution
+        df_manifest = self.s3_bucket_trg.read_parquet_to_df(manifest_key)
+        self.assertEqual(self.s3_bucket_trg.list_files_in_prefix('report1/'),
+                         df_manifest['key'].tolist())
+        self.assertEqual(dates_exp, df_manifest[['min_date', 'max_date']].values.tolist())
+        self.assertEqual(['AT0000A0E9W5'], df_manifest['min_isin'].unique().tolist())
+        self.assertEqual(rows_exp, df_manifest['rows'].tolist())
+        files_result = self.s3_bucket_trg.list_files_in_manifest(manifest_key,
+                                                                 start_date='2021-04-19')
+        self.assertEqual(df_manifest['key'].tolist()[::3], files_result)
+
+    def test_load_parquet_options(self):
+        """
+        Tests that the load method writes the parquet target files
+        with the writer options of the target configuration
+        """
+        # Expected results
+        df_exp = self.df_report
+        # Test init
+        extract_date = '2021-04-17'
+        extract_date_list = ['2021-04-16', '2021-04-17', '2021-04-18', '2021-04-19']
+        target_config = self.target_config._replace(
+            trg_parquet_compression='zstd', trg_parquet_compression_level=9,
+            trg_parquet_dictionary=['ISIN'], trg_parquet_data_page_size=1024,
+            trg_parquet_statistics=False, trg_parquet_version='2.6')
+        for target_config in (target_config,
+                              target_config._replace(trg_compute_backend='arrow'),
+                              target_config._replace(trg_partitioned=True)):
+            # Method execution
+            with patch.object(MetaProcess, "return_date_list",
+            return_value=[extract_date, extract_date_list]):
+                trade_etl = TradeETL(self.s3_bucket_src, self.s3_bucket_trg,
+                             self.meta_key, self.source_config, target_config)
+                trade_etl.load(pa.Table.from_pandas(df_exp, preserve_index=False)
+                               if target_config.trg_compute_backend == 'arrow' else df_exp)
+            # Test after method execution
+            trg_files = self.s3_bucket_trg.list_files_in_prefix('report1/')
+            data = self.trg_bucket.Object(key=trg_files[0]).get().get('Body').read()
+            metadata = pq.ParquetFile(BytesIO(data)).metadata
+            self.assertEqual('2.6', metadata.format_version)
+            isin_column, price_column = [metadata.row_group(0).column(index) for index in (0, 2)]
+            self.assertEqual('ZSTD', isin_column.compression)
+            self.assertFalse(isin_column.is_stats_set)
+            self.assertIn('RLE_DICTIONARY', isin_column.encodings)
+            self.assertNotIn('RLE_DICTIONARY', price_column.encodings)
+            # Cleanup after test
+            for trg_file in trg_files:
+                self.trg_bucket.Object(key=trg_file).delete()
+
+    def test_wrong_target_format(self):
+        """
+        Tests that partitioned target files have to be parquet files, that upserts
+        need partitioned target files and that the parquet, csv and arrow codecs
+        have to be supported
+        """
+        for target_config, log_exp in (
+                (self.target_config._replace(trg_partitioned=True, trg_format='csv'),
+                 'Partitioned target files have to be parquet files, not csv'),
+                (self.target_config._replace(trg_upsert=True),
+                 'Upserts replace date partitions and need trg_partitioned'),
+                (self.target_config._replace(trg_parquet_compression='lzo'),
+                 'The parquet compression lzo is not supported'),
+                (self.target_config._replace(trg_format='csv', trg_compression='bz2'),
+                 'The compression bz2 is not supported'),
+                (self.target_config._replace(trg_format='arrow', trg_compression='gzip'),
+                 'The compression gzip is not supported')):
+            # Method execution
+            with patch.object(MetaProcess, "return_date_list",
+            return_value=['2021-04-17', ['2021-04-16', '2021-04-17']]):
+                with self.assertLogs() as logm:
+                    with self.assertRaises(WrongFormatException):
+                        TradeETL(self.s3_bucket_src, self.s3_bucket_trg,
+                                 self.meta_key, self.source_config, target_config)
+                    # Log test after method execution
+                    self.assertIn(log_exp, logm.output[-1])
+
+    def test_load_compressed_csv(self):
+        """
+        Tests the load method writing a gzip compressed csv target file
+        """
+        # Expected results
+        df_exp = self.df_report
+        # Test init
+        extract_date = '2021-04-17'
+        extract_date_list = ['2021-04-16', '2021-04-17', '2021-04-18', '2021-04-19']
+        target_config = self.target_config._replace(trg_format='csv', trg_compression='gzip')
+        # Method execution
+        with patch.object(MetaProcess, "return_date_list",
+        return_value=[extract_date, extract_date_list]):
+            trade_etl = TradeETL(self.s3_bucket_src, self.s3_bucket_trg,
+                         self.meta_key, self.source_config, target_config)
+            trade_etl.load(self.to_backend(self.df_report))
+        # Test after method execution
+        trg_file = self.s3_bucket_trg.list_files_in_prefix(self.target_config.trg_key)[0]
+        df_result = self.s3_bucket_trg.read_csv_to_df(trg_file)
+        self.assertTrue(trg_file.endswith('.csv.gz'))
+        self.assertTrue(df_exp.equals(df_result))
+
+    def test_load_arrow(self):
+        """
+        Tests the load method writing zstd compressed arrow target files
+        with the pandas and the arrow compute backend
+        """
+        # Expected results
+        df_exp = self.df_report
+        # Test init
+        extract_date = '2021-04-17'
+        extract_date_list = ['2021-04-16', '2021-04-17', '2021-04-18', '2021-04-19']
+        target_config = self.target_config._replace(trg_format='arrow', trg_compression='zstd')
+        for target_config in (target_config,
+                              target_config._replace(trg_compute_backend='arrow')):
+            # Method execution
+            with patch.object(MetaProcess, "return_date_list",
+            return_value=[extract_date, extract_date_list]):
+                trade_etl = TradeETL(self.s3_bucket_src, self.s3_bucket_trg,
+                             self.meta_key, self.source_config, target_config)
+                trade_etl.load(pa.Table.from_pandas(df_exp, preserve_index=False)
+                               if target_config.trg_compute_backend == 'arrow' else df_exp)
+            # Test after method execution
+            trg_file = self.s3_bucket_trg.list_files_in_prefix(self.target_config.trg_key)[0]
+            self.assertTrue(trg_file.endswith('.arrow'))
+            self.assertTrue(df_exp.equals(self.s3_bucket_trg.read_arrow_to_df(trg_file)))
+            # Cleanup after test
+            self.trg_bucket.Object(key=trg_file).delete()
+
     def test_etl_report1(self):
         """
         Tests the etl_report1 method
@@ -293,5 +991,18 @@ class TestETLMethods(unittest.TestCase):
             }
         )
 
+
+class TestETLMethodsArrow(TestETLMethods):
+    """
+    Testing the TradeETL class with the arrow compute backend
+    """
+
+    def setUp(self):
+        """
+        Setting up the environment with the arrow compute backend
+        """
+        super().setUp()
+        self.target_config = self.target_config._replace(trg_compute_backend='arrow')
+
 if __name__ == '__main__':
-    unittest.main()
\ No newline at end of file
+    unittest.main()
@@ -0,0 +1,297 @@
+"""TestReportEngineMethods"""
+import os
+import unittest
+from io import BytesIO
+from unittest.mock import patch
+
+import boto3
+import pandas as pd
+import pyarrow.parquet as pq
+from moto import mock_s3
+
+from tradeETL.common.s3 import S3BucketConnector
+from tradeETL.common.custom_exceptions import WrongReportException
+from tradeETL.common.meta_process import MetaProcess
+from tradeETL.transformers.etl_transformer import etlSourceConfig, etlTargetConfig, TradeETL
+from tradeETL.transformers.report_engine import etlReportConfig, ReportEngine
+from tradeETL.transformers.window_engine import etlWindowConfig, WindowEngine
+
+class TestReportEngineMethods(unittest.TestCase):
+    """
+    Testing the ReportEngine class.
+    """
+
+    def setUp(self):
+        """
+        Setting up the environment
+        """
+        # mocking s3 connection start
+        self.mock_s3 = mock_s3()
+        self.mock_s3.start()
+        # Defining the class arguments
+        self.s3_access_key = 'AWS_ACCESS_KEY_ID'
+        self.s3_secret_key = 'AWS_SECRET_ACCESS_KEY'
+        self.s3_endpoint_url = 'https://s3.eu-central-1.amazonaws.com'
+        self.s3_bucket_name_src = 'src-bucket'
+        self.s3_bucket_name_trg = 'trg-bucket'
+        self.meta_key = 'meta_key'
+        # Creating s3 access keys as environment variables
+        os.environ[self.s3_access_key] = 'KEY1'
+        os.environ[self.s3_secret_key] = 'KEY2'
+        # Creating the source and target bucket on the mocked s3
+        self.s3 = boto3.resource(service_name='s3', endpoint_url=self.s3_endpoint_url)
+        for bucket in (self.s3_bucket_name_src, self.s3_bucket_name_trg):
+            self.s3.create_bucket(Bucket=bucket,
+                                  CreateBucketConfiguration={
+                                      'LocationConstraint': 'eu-central-1'})
+        # Creating S3BucketConnector testing instances
+        self.s3_bucket_src = S3BucketConnector(self.s3_access_key,
+                                               self.s3_secret_key,
+                                               self.s3_endpoint_url,
+                                               self.s3_bucket_name_src)
+        self.s3_bucket_trg = S3BucketConnector(self.s3_access_key,
+                                               self.s3_secret_key,
+                                               self.s3_endpoint_url,
+                                               self.s3_bucket_name_trg)
+        # Creating source and target configuration
+        self.source_config = etlSourceConfig(
+            src_first_extract_date='2021-04-01',
+            src_columns=['ISIN', 'Mnemonic', 'Date', 'Time', 'StartPrice',
+                         'EndPrice', 'MinPrice', 'MaxPrice', 'TradedVolume'],
+            src_col_date='Date',
+            src_col_isin='ISIN',
+            src_col_time='Time',
+            src_col_start_price='StartPrice',
+            src_col_min_price='MinPrice',
+            src_col_max_price='MaxPrice',
+            src_col_traded_vol='TradedVolume')
+        self.target_config = etlTargetConfig(
+            trg_col_isin='isin',
+            trg_col_date='date',
+            trg_col_op_price='opening_price_eur',
+            trg_col_clos_price='closing_price_eur',
+            trg_col_min_price='minimum_price_eur',
+            trg_col_max_price='maximum_price_eur',
+            trg_col_dail_trad_vol='daily_traded_volume',
+            trg_col_ch_prev_clos='change_prev_closing_%',
+            trg_key='report1/Trade_daily_report1_',
+            trg_key_date_format='%Y%m%d_%H%M%S',
+            trg_format='parquet')
+        # Report 1 as declarative report
+        self.report1_config = etlReportConfig(
+            trg_name='report1',
+            trg_group_keys=['ISIN', 'Date'],
+            trg_aggregations={
+                'opening_price_eur': ['StartPrice', 'first'],
+                'closing_price_eur': ['StartPrice', 'last'],
+                'minimum_price_eur': ['MinPrice', 'min'],
+                'maximum_price_eur': ['MaxPrice', 'max'],
+                'daily_traded_volume': ['TradedVolume', 'sum']},
+            trg_lags={'prev_opening_price_eur': ['opening_price_eur', 'ISIN']},
+            trg_derived={'change_prev_closing_%': '(opening_price_eur - prev_opening_price_eur)'
+                                                  ' / prev_opening_price_eur * 100'},
+            trg_columns=['ISIN', 'Date', 'opening_price_eur', 'closing_price_eur',
+                         'minimum_price_eur', 'maximum_price_eur', 'daily_traded_volume',
+                         'change_prev_closing_%'],
+            trg_key='report1_spec/Trade_daily_report1_',
+            trg_key_date_format='%Y%m%d_%H%M%S',
+            trg_format='parquet')
+        # Report over all days of the extraction
+        self.isin_config = etlReportConfig(
+            trg_name='isin_summary',
+            trg_group_keys=['ISIN'],
+            trg_aggregations={
+                'first_price_eur': ['StartPrice', 'first'],
+                'last_price_eur': ['StartPrice', 'last'],
+                'mean_price_eur': ['StartPrice', 'mean'],
+                'number_of_trades': ['StartPrice', 'count'],
+                'traded_volume': ['TradedVolume', 'sum']},
+            trg_derived={'price_change_eur': 'last_price_eur - first_price_eur'},
+            trg_key='isin_summary/Trade_isin_summary_',
+            trg_key_date_format='%Y%m%d_%H%M%S',
+            trg_format='csv')
+        # Creating source files on mocked s3
+        columns_src = ['ISIN', 'Mnemonic', 'Date', 'Time', 'StartPrice',
+        'EndPrice', 'MinPrice', 'MaxPrice', 'TradedVolume']
+        data = [['AT0000A0E9W5', 'SANT', '2021-04-16', '15:00', 18.27, 21.19, 18.27, 21.34, 987],
+                ['AT0000A0E9W5', 'SANT', '2021-04-17', '13:00', 20.21, 18.27, 18.21, 20.42, 633],
+                ['AT0000A0E9W5', 'SANT', '2021-04-17', '14:00', 18.27, 21.19, 18.27, 21.34, 455],
+                ['AT0000A0E9W5', 'SANT', '2021-04-18', '07:00', 20.58, 19.27, 18.89, 20.58, 9066],
+                ['AT0000A0E9W5', 'SANT', '2021-04-18', '08:00', 19.27, 21.14, 19.27, 21.14, 1220],
+                ['AT0000A0E9W5', 'SANT', '2021-04-19', '07:00', 23.58, 23.58, 23.58, 23.58, 1035],
+                ['AT0000A0E9W5', 'SANT', '2021-04-19', '08:00', 23.58, 24.22, 23.31, 24.34, 1028],
+                ['AT0000A0E9W5', 'SANT', '2021-04-19', '09:00', 24.22, 22.21, 22.21, 25.01, 1523]]
+        df_src = pd.DataFrame(data, columns=columns_src)
+        for index, row in df_src.iterrows():
+            self.s3_bucket_src.write_df_to_s3(
+                df_src.loc[index:index],
+                f'{row.Date}/{row.Date}_BINS_XETR{row.Time[:2]}.csv', 'csv')
+        columns_report = ['ISIN', 'Date', 'opening_price_eur', 'closing_price_eur',
+        'minimum_price_eur', 'maximum_price_eur', 'daily_traded_volume', 'change_prev_closing_%']
+        data_report = [['AT0000A0E9W5', '2021-04-17', 20.21, 18.27, 18.21, 21.34, 1088, 10.62],
+                       ['AT0000A0E9W5', '2021-04-18', 20.58, 19.27, 18.89, 21.14, 10286, 1.83],
+                       ['AT0000A0E9W5', '2021-04-19', 23.58, 24.22, 22.21, 25.01, 3586, 14.58]]
+        self.df_report = pd.DataFrame(data_report, columns=columns_report)
+        self.df_isin_report = pd.DataFrame(
+            [['AT0000A0E9W5', 20.21, 24.22, 21.39, 7, 14960, 4.01]],
+            columns=['ISIN', 'first_price_eur', 'last_price_eur', 'mean_price_eur',
+                     'number_of_trades', 'traded_volume', 'price_change_eur'])
+        self.extract_date = '2021-04-17'
+        self.extract_date_list = ['2021-04-16', '2021-04-17', '2021-04-18', '2021-04-19']
+
+    def tearDown(self):
+        # mocking s3 connection stop
+        self.mock_s3.stop()
+
+    def test_transform(self):
+        """
+        Tests that the transform method creates report 1 from its declarative
+        configuration and a report over all days of the extraction
+        """
+        for source_config, target_config in (
+                (self.source_config, self.target_config),
+                (self.source_config._replace(src_col_time_key='TimeKey'),
+                 self.target_config._replace(trg_compute_backend='arrow')),
+                (self.source_config._replace(src_presorted=True), self.target_config)):
+            # Method execution
+            with patch.object(MetaProcess, "return_date_list",
+            return_value=[self.extract_date, self.extract_date_list]):
+                trade_etl = TradeETL(self.s3_bucket_src, self.s3_bucket_trg,
+                             self.meta_key, source_config, target_config)
+                engine = ReportEngine(trade_etl, [self.report1_config, self.isin_config])
+                reports = engine.transform(trade_etl.extract())
+            # Test after method execution
+            self.assertEqual(['report1', 'isin_summary'], list(reports))
+            pd.testing.assert_frame_equal(self.df_report, reports['report1'])
+            pd.testing.assert_frame_equal(self.df_isin_report, reports['isin_summary'])
+
+    def test_transform_emptydf(self):
+        """
+        Tests the transform method with an empty DataFrame
+        """
+        # Expected results
+        log_exp = 'The dataframe is empty. No reports will be created.'
+        # Method execution
+        with patch.object(MetaProcess, "return_date_list",
+        return_value=[self.extract_date, self.extract_date_list]):
+            trade_etl = TradeETL(self.s3_bucket_src, self.s3_bucket_trg,
+                         self.meta_key, self.source_config, self.target_config)
+            engine = ReportEngine(trade_etl, [self.isin_config])
+            with self.assertLogs() as logm:
+                reports = engine.transform(pd.DataFrame())
+                # Log test after method execution
+                self.assertIn(log_exp, logm.output[0])
+        # Test after method execution
+        self.assertEqual({}, reports)
+
+    def test_wrong_report(self):
+        """
+        Tests the constructor with report configurations that are not supported
+        """
+        for source_config, report_config, log_exp in (
+                (self.source_config,
+                 self.isin_config._replace(trg_aggregations={'median': ['StartPrice', 'median']}),
+                 'The aggregation median of report isin_summary is not supported'),
+                (self.source_config,
+                 self.isin_config._replace(trg_lags={'prev': ['traded_volume', 'ISIN']}),
+                 'The lags of report isin_summary need a group key to order by'),
+                (self.source_config._replace(src_partial_agg=True), self.isin_config,
+                 'The declarative reports need the trades, src_partial_agg is not supported')):
+            # Method execution
+            with patch.object(MetaProcess, "return_date_list",
+            return_value=[self.extract_date, self.extract_date_list]):
+                trade_etl = TradeETL(self.s3_bucket_src, self.s3_bucket_trg,
+                             self.meta_key, source_config, self.target_config)
+                with self.assertLogs() as logm:
+                    with self.assertRaises(WrongReportException):
+                        ReportEngine(trade_etl, [report_config])
+                    # Log test after method execution
+                    self.assertIn(log_exp, logm.output[0])
+
+    def test_etl_reports(self):
+        """
+        Tests that the etl_reports method extracts the source files once and writes
+        report 1, the declarative reports, the window indicators and the meta file
+        """
+        # Expected results
+        meta_exp = ['2021-04-17', '2021-04-18', '2021-04-19']
+        df_windows_exp = pd.DataFrame(
+            [['AT0000A0E9W5', '2021-04-17', None, None, None],
+             ['AT0000A0E9W5', '2021-04-18', 18.77, None, 19.72],
+             ['AT0000A0E9W5', '2021-04-19', 21.74, 12.4, 20.81]],
+            columns=['ISIN', 'Date', 'moving_avg_closing_price_eur', 'volatility_%',
+                     'vwap_eur']).astype({'moving_avg_closing_price_eur': float,
+                                          'volatility_%': float, 'vwap_eur': float})
+        window_config = etlWindowConfig(
+            trg_window_days=2,
+            trg_state_key='state/windows/window_state.parquet',
+            trg_key='windows/Trade_daily_windows_',
+            trg_key_date_format='%Y%m%d_%H%M%S',
+            trg_format='parquet')
+        # Method execution
+        with patch.object(MetaProcess, "return_date_list",
+        return_value=[self.extract_date, self.extract_date_list]):
+            trade_etl = TradeETL(self.s3_bucket_src, self.s3_bucket_trg,
+                         self.meta_key, self.source_config, self.target_config)
+            window_engine = WindowEngine(trade_etl, window_config)
+            engine = ReportEngine(trade_etl, [self.isin_config], window_engine)
+            with patch.object(trade_etl, 'extract', wraps=trade_etl.extract) as extract, \
+                patch.object(window_engine, 'transform',
+                             wraps=window_engine.transform) as window_transform:
+                engine.etl_reports()
+        # Test after method execution
+        extract.assert_called_once()
+        # The window indicators get the unrounded report 1
+        df_window_input = window_transform.call_args[0][0]
+        self.assertFalse(df_window_input.equals(df_window_input.round(decimals=2)))
+        pd.testing.assert_frame_equal(self.df_report, df_window_input.round(decimals=2))
+        report1_file = self.s3_bucket_trg.list_files_in_prefix(self.target_config.trg_key)[0]
+        pd.testing.assert_frame_equal(self.df_report,
+                                      self.s3_bucket_trg.read_parquet_to_df(report1_file))
+        isin_file = self.s3_bucket_trg.list_files_in_prefix(self.isin_config.trg_key)[0]
+        self.assertTrue(isin_file.endswith('.csv'))
+        pd.testing.assert_frame_equal(self.df_isin_report,
+                                      self.s3_bucket_trg.read_csv_to_df(isin_file))
+        windows_file = self.s3_bucket_trg.list_files_in_prefix(window_config.trg_key)[0]
+        pd.testing.assert_frame_equal(df_windows_exp,
+                                      self.s3_bucket_trg.read_parquet_to_df(windows_file))
+        meta_file = self.s3_bucket_trg.list_files_in_prefix(self.meta_key)[0]
+        df_meta_result = self.s3_bucket_trg.read_csv_to_df(meta_file)
+        self.assertEqual(list(df_meta_result['source_date']), meta_exp)
+
+    def test_load_parquet_options(self):
+        """
+        Tests that the load method writes the parquet reports and window indicators
+        with the parquet writer options of the target configuration
+        """
+        # Test init
+        target_config = self.target_config._replace(
+            trg_parquet_compression='zstd', trg_parquet_compression_level=9,
+            trg_parquet_statistics=False, trg_parquet_version='2.6')
+        window_config = etlWindowConfig(
+            trg_window_days=2,
+            trg_state_key='state/windows/window_state.parquet',
+            trg_key='windows/Trade_daily_windows_',
+            trg_key_date_format='%Y%m%d_%H%M%S',
+            trg_format='parquet')
+        # Method execution
+        with patch.object(MetaProcess, "return_date_list",
+        return_value=[self.extract_date, self.extract_date_list]):
+            trade_etl = TradeETL(self.s3_bucket_src, self.s3_bucket_trg,
+                         self.meta_key, self.source_config, target_config)
+            window_engine = WindowEngine(trade_etl, window_config)
+            engine = ReportEngine(trade_etl, [self.report1_config], window_engine)
+            engine.load({'report1': self.df_report})
+            window_engine.load(self.df_report)
+        # Test after method execution
+        for trg_key in (self.report1_config.trg_key, window_config.trg_key):
+            trg_file = self.s3_bucket_trg.list_files_in_prefix(trg_key)[0]
+            data = self.s3.Object(self.s3_bucket_name_trg, trg_file).get().get('Body').read()
+            metadata = pq.ParquetFile(BytesIO(data)).metadata
+            self.assertEqual('2.6', metadata.format_version)
+            isin_column = metadata.row_group(0).column(0)
+            self.assertEqual('ZSTD', isin_column.compression)
+            self.assertFalse(isin_column.is_stats_set)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,196 @@
+"""TestWindowEngineMethods"""
+import os
+import unittest
+from datetime import date, timedelta
+from unittest.mock import patch
+
+import boto3
+import numpy as np
+import pandas as pd
+from moto import mock_s3
+
+from tradeETL.common.s3 import S3BucketConnector
+from tradeETL.common.meta_process import MetaProcess
+from tradeETL.common.window_state import WindowState
+from tradeETL.transformers.etl_transformer import etlSourceConfig, etlTargetConfig, TradeETL
+from tradeETL.transformers.window_engine import etlWindowConfig, WindowEngine
+
+class TestWindowEngineMethods(unittest.TestCase):
+    """
+    Testing the WindowEngine class.
+    """
+
+    def setUp(self):
+        """
+        Setting up the environment
+        """
+        # mocking s3 connection start
+        self.mock_s3 = mock_s3()
+        self.mock_s3.start()
+        # Defining the class arguments
+        self.s3_access_key = 'AWS_ACCESS_KEY_ID'
+        self.s3_secret_key = 'AWS_SECRET_ACCESS_KEY'
+        self.s3_endpoint_url = 'https://s3.eu-central-1.amazonaws.com'
+        self.s3_bucket_name = 'trg-bucket'
+        # Creating s3 access keys as environment variables
+        os.environ[self.s3_access_key] = 'KEY1'
+        os.environ[self.s3_secret_key] = 'KEY2'
+        # Creating the bucket on the mocked s3
+        self.s3 = boto3.resource(service_name='s3', endpoint_url=self.s3_endpoint_url)
+        self.s3.create_bucket(Bucket=self.s3_bucket_name,
+                              CreateBucketConfiguration={
+                                  'LocationConstraint': 'eu-central-1'})
+        self.s3_bucket = S3BucketConnector(self.s3_access_key, self.s3_secret_key,
+                                           self.s3_endpoint_url, self.s3_bucket_name)
+        # Creating source, target and window configuration
+        self.source_config = etlSourceConfig(
+            src_first_extract_date='2021-04-01',
+            src_columns=['ISIN', 'Date', 'Time', 'StartPrice', 'MinPrice',
+                         'MaxPrice', 'TradedVolume'],
+            src_col_date='Date',
+            src_col_isin='ISIN',
+            src_col_time='Time',
+            src_col_start_price='StartPrice',
+            src_col_min_price='MinPrice',
+            src_col_max_price='MaxPrice',
+            src_col_traded_vol='TradedVolume')
+        self.target_config = etlTargetConfig(
+            trg_col_isin='isin',
+            trg_col_date='date',
+            trg_col_op_price='opening_price_eur',
+            trg_col_clos_price='closing_price_eur',
+            trg_col_min_price='minimum_price_eur',
+            trg_col_max_price='maximum_price_eur',
+            trg_col_dail_trad_vol='daily_traded_volume',
+            trg_col_ch_prev_clos='change_prev_closing_%',
+            trg_key='report1/Trade_daily_report1_',
+            trg_key_date_format='%Y%m%d_%H%M%S',
+            trg_format='parquet')
+        self.window_config = etlWindowConfig(
+            trg_window_days=5,
+            trg_state_key='state/windows/window_state.parquet',
+            trg_key='windows/Trade_daily_windows_',
+            trg_key_date_format='%Y%m%d_%H%M%S',
+            trg_format='parquet',
+            trg_min_days=2)
+        # Creating report 1 of 30 trading days, not every ISIN trades every day
+        rng = np.random.default_rng(5)
+        days = [(date(2021, 4, 1) + timedelta(days=day)).isoformat() for day in range(30)]
+        df_report = pd.DataFrame([(isin, day) for day in days
+                                  for isin in ('AT0000A0E9W5', 'DE0005140008', 'DE000A0D9PT0')
+                                  if rng.random() < 0.8], columns=['ISIN', 'Date'])
+        closing = np.round(rng.uniform(10, 30, len(df_report)), 2)
+        self.df_report = df_report.assign(**{
+            'opening_price_eur': closing,
+            'closing_price_eur': closing,
+            'minimum_price_eur': closing - 1,
+            'maximum_price_eur': closing + 1,
+            'daily_traded_volume': rng.integers(100, 10000, len(df_report)),
+            'change_prev_closing_%': 0.0})
+        self.days = days
+
+    def tearDown(self):
+        # mocking s3 connection stop
+        self.mock_s3.stop()
+
+    def run_windows(self, df_report: pd.DataFrame):
+        """
+        Computes and loads the window indicators of a run with report 1
+        """
+        run_days = sorted(df_report['Date'].unique())
+        with patch.object(MetaProcess, "return_date_list",
+        return_value=[run_days[0], run_days]):
+            trade_etl = TradeETL(self.s3_bucket, self.s3_bucket, 'meta_key',
+                                 self.source_config, self.target_config)
+            window_engine = WindowEngine(trade_etl, self.window_config)
+            df_windows = window_engine.transform(df_report)
+            window_engine.load(df_windows)
+        return df_windows
+
+    def rolling(self, column: str, func: str, window_days: int = 5):
+        """
+        Applies a rolling aggregation per ISIN over the trading days of the exchange,
+        an ISIN without trades on a day has an empty value of the day
+
+        Returns:
+          values: numpy array in the row order of report 1
+        """
+        dates = sorted(self.df_report['Date'].unique())
+        df_days = self.df_report.pivot(index='Date', columns='ISIN', values=column)\
+            .reindex(dates)
+        values = getattr(df_days.rolling(window_days, min_periods=2), func)().stack()
+        return values.reindex(pd.MultiIndex.from_frame(self.df_report[['Date', 'ISIN']]))\
+            .to_numpy()
+
+    def test_transform(self):
+        """
+        Tests the indicators of one run against rolling windows over the whole history
+        """
+        # Expected results
+        close = self.df_report['closing_price_eur']
+        self.df_report['log_return'] = np.log(
+            close / close.groupby(self.df_report['ISIN']).shift(1))
+        self.df_report['turnover'] = close * self.df_report['daily_traded_volume']
+        df_exp = self.df_report[['ISIN', 'Date']].copy()
+        df_exp['moving_avg_closing_price_eur'] = self.rolling('closing_price_eur', 'mean')
+        df_exp['volatility_%'] = self.rolling('log_return', 'std') * 100
+        df_exp['vwap_eur'] = self.rolling('turnover', 'sum') \
+            / self.rolling('daily_traded_volume', 'sum')
+        df_exp = df_exp.round(decimals=2)
+        df_report = self.df_report.drop(columns=['log_return', 'turnover'])
+        # Method execution
+        df_result = self.run_windows(df_report)
+        # Test after method execution
+        pd.testing.assert_frame_equal(df_exp, df_result)
+
+    def test_transform_incremental(self):
+        """
+        Tests that runs carrying the window state return the same indicators
+        as one run over all days, also when a run is repeated
+        """
+        # Expected results
+        df_exp = self.run_windows(self.df_report)
+        # The window of 2021-04-29 and the days of the last run
+        days_exp = self.days[23:]
+        # Test init
+        self.s3.Bucket(self.s3_bucket_name).objects.all().delete()
+        # Method execution
+        results = []
+        for start in range(0, 30, 4):
+            df_run = self.df_report[self.df_report['Date'].isin(self.days[start:start + 4])]
+            if start == 8:
+                # A run whose meta file update failed is repeated
+                self.run_windows(df_run)
+            results.append(self.run_windows(df_run.reset_index(drop=True)))
+        df_result = pd.concat(results, ignore_index=True)
+        # Test after method execution
+        pd.testing.assert_frame_equal(df_exp, df_result)
+        df_state = self.s3_bucket.read_parquet_to_df(self.window_config.trg_state_key)
+        # The sums as of the last run and as of the run before
+        self.assertEqual(['2021-04-28', '2021-04-30'], df_state['date'].unique().tolist())
+        self.assertEqual(6, len(df_state))
+        self.assertEqual(days_exp, WindowState.list_days(self.window_config.trg_state_key,
+                                                         self.s3_bucket))
+
+    def test_state_size(self):
+        """
+        Tests that the window state does not grow with the window length
+        """
+        # Test init
+        sizes = []
+        for window_days in (5, 20):
+            self.window_config = self.window_config._replace(trg_window_days=window_days)
+            # Method execution
+            df_result = self.run_windows(self.df_report)
+            # Test after method execution
+            df_state = self.s3_bucket.read_parquet_to_df(self.window_config.trg_state_key)
+            sizes.append(df_state.shape)
+            self.assertEqual(
+                np.round(self.rolling('closing_price_eur', 'mean', window_days), 2).tolist()[-3:],
+                df_result['moving_avg_closing_price_eur'].tolist()[-3:])
+            # Cleanup after test
+            self.s3.Bucket(self.s3_bucket_name).objects.all().delete()
+        self.assertEqual(sizes[0], sizes[1])
+
+if __name__ == '__main__':
+    unittest.main()
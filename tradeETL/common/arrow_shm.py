@@ -0,0 +1,83 @@
+"""
+Handing data frames between processes as Arrow IPC streams in shared memory
+"""
+from multiprocessing import shared_memory
+
+import pandas as pd
+import pyarrow as pa
+
+def write_frame_to_shm( data_frame: pd.DataFrame ):
+    """
+    Writing a data frame as Arrow IPC stream into a new shared memory block
+
+    The block is only closed and not unlinked, the reading
+    process is responsible for unlinking it.
+
+    Parameters:
+    data_frame: Pandas DataFrame that should be handed to another process
+
+    returns:
+    name: name of the shared memory block
+    size: number of bytes of the IPC stream
+    """
+    table = pa.Table.from_pandas( data_frame, preserve_index=False )
+    # Measuring the stream first, so it can be written into the block without a copy
+    mock_sink = pa.MockOutputStream()
+    with pa.ipc.new_stream( mock_sink, table.schema ) as writer:
+        writer.write_table( table )
+    size = mock_sink.size()
+    shm = shared_memory.SharedMemory( create=True, size=max( size, 1 ) )
+    try:
+        buffer = pa.py_buffer( shm.buf )
+        sink = pa.FixedSizeBufferWriter( buffer )
+        with pa.ipc.new_stream( sink, table.schema ) as writer:
+            writer.write_table( table )
+        sink.close()
+        # The memoryview of the block can only be released without references to it
+        del writer, sink, buffer
+    except BaseException:
+        shm.close()
+        shm.unlink()
+        raise
+    shm.close()
+    return shm.name, size
+
+def read_frame_from_shm( name: str, size: int, unlink: bool = True ):
+    """
+    Reading a data frame from an Arrow IPC stream in a shared memory block
+
+    The stream is copied out of the block once, so the block can be released
+    while the Arrow buffers are still referenced by the data frame.
+
+    Parameters:
+    name: name of the shared memory block
+    size: number of bytes of the IPC stream
+    unlink: unlinks the block after reading it
+
+    returns:
+    data_frame: Pandas DataFrame of the IPC stream
+    """
+    shm = shared_memory.SharedMemory( name=name )
+    try:
+        with shm.buf[:size] as view:
+            body = view.tobytes()
+    finally:
+        shm.close()
+        if unlink:
+            shm.unlink()
+    with pa.ipc.open_stream( pa.py_buffer( body ) ) as reader:
+        return reader.read_all().to_pandas()
+
+def unlink_shm( name: str ):
+    """
+    Unlinking a shared memory block that was not read, e.g. after a failed worker
+
+    Parameters:
+    name: name of the shared memory block
+    """
+    try:
+        shm = shared_memory.SharedMemory( name=name )
+    except FileNotFoundError:
+        return
+    shm.close()
+    shm.unlink()
@@ -0,0 +1,145 @@
+"""
+Local disk cache for objects read from S3
+"""
+import os
+import hashlib
+import logging
+import threading
+from collections import OrderedDict
+
+class S3DiskCache():
+    """
+    Size capped on-disk cache for S3 object bodies
+
+    Entries are keyed by bucket, key and ETag, so a changed object is never
+    served from the cache. When the byte budget is exceeded the least
+    recently used entries are evicted.
+    """
+    def __init__( self, cache_dir: str, max_bytes: int ):
+        """
+        Constructor for the disk cache
+
+        Parameters:
+        cache_dir: local directory the cached objects are stored in
+        max_bytes: maximum number of bytes kept in the cache directory
+        """
+        self._logger = logging.getLogger( __name__ )
+        self.cache_dir = cache_dir
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+        os.makedirs( cache_dir, exist_ok=True )
+        # Restoring the LRU order of an existing cache directory from the modification times
+        entries = [ entry for entry in os.scandir( cache_dir )
+                    if entry.is_file() and not entry.name.endswith( '.tmp' ) ]
+        entries.sort( key=lambda entry: entry.stat().st_mtime )
+        self._entries = OrderedDict( ( entry.name, entry.stat().st_size ) for entry in entries )
+        self.size = sum( self._entries.values() )
+        self.__evict()
+
+    @staticmethod
+    def _entry_name( bucket: str, key: str, etag: str ):
+        """
+        Returning the file name of a cache entry
+
+        Parameters:
+        bucket: name of the S3 bucket
+        key: key of the object
+        etag: ETag of the object
+        """
+        return hashlib.sha256( f'{bucket}/{key}/{etag}'.encode( 'utf-8' ) ).hexdigest()
+
+    def get_path( self, bucket: str, key: str, etag: str ):
+        """
+        Returning the local path of a cached object and marking it as recently used
+
+        Parameters:
+        bucket: name of the S3 bucket
+        key: key of the object
+        etag: ETag of the object
+
+        returns:
+        path: path of the cached file or None if the object is not cached
+        """
+        name = self._entry_name( bucket, key, etag )
+        path = os.path.join( self.cache_dir, name )
+        with self._lock:
+            if name not in self._entries:
+                self.misses += 1
+                return None
+            try:
+                os.utime( path )
+            except FileNotFoundError:
+                # Removed outside of the cache, the entry is dropped and counted as a miss
+                self.size -= self._entries.pop( name )
+                self.misses += 1
+                return None
+            self.hits += 1
+            self._entries.move_to_end( name )
+        return path
+
+    def get( self, bucket: str, key: str, etag: str ):
+        """
+        Reading a cached object
+
+        Parameters:
+        bucket: name of the S3 bucket
+        key: key of the object
+        etag: ETag of the object
+
+        returns:
+        body: bytes of the cached object or None if the object is not cached
+        """
+        path = self.get_path( bucket, key, etag )
+        if path is None:
+            return None
+        try:
+            with open( path, 'rb' ) as cache_file:
+                return cache_file.read()
+        except FileNotFoundError:
+            # Evicted by another thread between lookup and read
+            return None
+
+    def put( self, bucket: str, key: str, etag: str, body: bytes ):
+        """
+        Storing an object in the cache
+
+        Parameters:
+        bucket: name of the S3 bucket
+        key: key of the object
+        etag: ETag of the object
+        body: bytes of the object
+        """
+        if len( body ) > self.max_bytes:
+            self._logger.info( 'Object %s/%s is larger than the cache, it will not be cached', bucket, key )
+            return None
+        name = self._entry_name( bucket, key, etag )
+        path = os.path.join( self.cache_dir, name )
+        tmp_path = f'{path}.{threading.get_ident()}.tmp'
+        try:
+            with open( tmp_path, 'wb' ) as cache_file:
+                cache_file.write( body )
+            os.replace( tmp_path, path )
+        except Exception:
+            # A partly written file, e.g. of a full disk, is not left behind
+            if os.path.exists( tmp_path ):
+                os.remove( tmp_path )
+            raise
+        with self._lock:
+            self.size += len( body ) - self._entries.pop( name, 0 )
+            self._entries[name] = len( body )
+            self.__evict()
+        return path
+
+    def __evict( self ):
+        """
+        Removing the least recently used entries until the cache fits the byte budget
+        """
+        while self.size > self.max_bytes and self._entries:
+            name, size = self._entries.popitem( last=False )
+            self.size -= size
+            try:
+                os.remove( os.path.join( self.cache_dir, name ) )
+            except FileNotFoundError:
+                pass
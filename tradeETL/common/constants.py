@@ -11,6 +11,80 @@ class S3FileTypes( Enum ):
 
     CSV = 'csv'
     PARQUET = 'parquet'
+    ARROW = 'arrow'
+
+class S3Compressions( Enum ):
+    """
+    Supported compression codecs for csv files on S3
+    """
+
+    GZIP = 'gzip'
+    ZSTD = 'zstd'
+
+class S3CompressionSuffixes( Enum ):
+    """
+    Key suffixes of the compression codecs, named like S3Compressions
+    """
+
+    GZIP = '.gz'
+    ZSTD = '.zst'
+
+class ParquetCompressions( Enum ):
+    """
+    Supported compression codecs of parquet files
+    """
+
+    NONE = 'none'
+    SNAPPY = 'snappy'
+    GZIP = 'gzip'
+    BROTLI = 'brotli'
+    LZ4 = 'lz4'
+    ZSTD = 'zstd'
+
+class IpcCompressions( Enum ):
+    """
+    Supported buffer compression codecs of Arrow IPC (Feather v2) files
+    """
+
+    LZ4 = 'lz4'
+    ZSTD = 'zstd'
+
+class CsvEngines( Enum ):
+    """
+    Supported engines for parsing csv files
+    """
+
+    PANDAS = 'pandas'
+    ARROW = 'arrow'
+
+class AggBackends( Enum ):
+    """
+    Supported backends for aggregating the trades of a report
+    """
+
+    PANDAS = 'pandas'
+    NUMPY = 'numpy'
+
+class ComputeBackends( Enum ):
+    """
+    Supported backends for running the transformation of a report
+    """
+
+    PANDAS = 'pandas'
+    ARROW = 'arrow'
+
+class ReportFunctions( Enum ):
+    """
+    Supported aggregations of the declarative reports
+    """
+
+    FIRST = 'first'
+    LAST = 'last'
+    MIN = 'min'
+    MAX = 'max'
+    SUM = 'sum'
+    MEAN = 'mean'
+    COUNT = 'count'
 
 class MetaProcessFormat( Enum ):
     """
@@ -22,4 +96,46 @@ class MetaProcessFormat( Enum ):
     META_PROCESS_COL = 'datetime_of_processing'
     META_FILE_FORMAT = 'csv'
 
-    
\ No newline at end of file
+class PrevCloseStateFormat( Enum ):
+    """
+    Formation for the prior close state of a report
+    """
+    STATE_ISIN_COL = 'isin'
+    STATE_DATE_COL = 'date'
+    STATE_PRICE_COL = 'price'
+    STATE_FILE_FORMAT = 'parquet'
+
+class WindowStateFormat( Enum ):
+    """
+    Formation for the rolling window state of the indicators and its day files
+    """
+    STATE_ISIN_COL = 'isin'
+    STATE_DATE_COL = 'date'
+    STATE_CLOSE_COL = 'close'
+    STATE_VOLUME_COL = 'volume'
+    STATE_TURNOVER_COL = 'turnover'
+    STATE_RETURN_COL = 'log_return'
+    STATE_LAST_CLOSE_COL = 'last_close'
+    STATE_DAYS_COL = 'days'
+    STATE_CLOSE_SUM_COL = 'close_sum'
+    STATE_VOLUME_SUM_COL = 'volume_sum'
+    STATE_TURNOVER_SUM_COL = 'turnover_sum'
+    STATE_RETURNS_COL = 'returns'
+    STATE_RETURN_SUM_COL = 'return_sum'
+    STATE_RETURN_SQ_SUM_COL = 'return_sq_sum'
+    STATE_DAYS_PREFIX = 'days/'
+    STATE_FILE_FORMAT = 'parquet'
+
+class ManifestFormat( Enum ):
+    """
+    Formation for the manifest of the target files
+    """
+    MANIFEST_KEY_COL = 'key'
+    MANIFEST_ROWS_COL = 'rows'
+    MANIFEST_BYTES_COL = 'bytes'
+    MANIFEST_MIN_DATE_COL = 'min_date'
+    MANIFEST_MAX_DATE_COL = 'max_date'
+    MANIFEST_MIN_ISIN_COL = 'min_isin'
+    MANIFEST_MAX_ISIN_COL = 'max_isin'
+    MANIFEST_ETAG_COL = 'etag'
+    MANIFEST_FILE_FORMAT = 'parquet'
@@ -0,0 +1,152 @@
+"""
+Engines for parsing csv files read from S3
+"""
+from io import StringIO
+
+import numpy as np
+import pandas as pd
+import pyarrow as pa
+from pyarrow import csv as pa_csv
+
+# dtype name of columns that are parsed into datetime64 values
+DATE_DTYPE = 'date'
+
+def split_dates( dtype: dict ):
+    """
+    Splitting a dtype mapping into the pandas dtypes and the date columns
+
+    Parameters:
+    dtype: mapping of column names to dtype names, DATE_DTYPE marks date columns
+
+    returns:
+    dtype: mapping of the remaining columns to pandas dtypes
+    date_columns: list of the columns that should be parsed as dates
+    """
+    dtype = dtype or {}
+    date_columns = [ column for column, col_type in dtype.items() if col_type == DATE_DTYPE ]
+    return { column: col_type for column, col_type in dtype.items()
+             if col_type != DATE_DTYPE }, date_columns
+
+def nullable_ints( dtype: dict ):
+    """
+    Replacing the numpy integer dtypes of a dtype mapping by the nullable pandas
+    integer dtypes, the pandas parser fails on a missing value in a numpy integer column
+
+    Parameters:
+    dtype: mapping of column names to pandas dtypes
+
+    returns:
+    dtype: mapping with the nullable integer dtypes
+    int_columns: mapping of the integer columns to their numpy dtypes
+    """
+    int_columns = {}
+    nullable = dict( dtype )
+    for column, col_type in dtype.items():
+        col_dtype = pd.api.types.pandas_dtype( col_type )
+        if isinstance( col_dtype, np.dtype ) and col_dtype.kind in 'iu':
+            int_columns[column] = col_dtype
+            prefix = 'UInt' if col_dtype.kind == 'u' else 'Int'
+            nullable[column] = f'{prefix}{col_dtype.itemsize * 8}'
+    return nullable, int_columns
+
+def arrow_type( dtype ):
+    """
+    Translating a pandas dtype name into the Arrow type the csv reader should parse into
+
+    Parameters:
+    dtype: pandas dtype name, e.g. 'str', 'category', 'float64'
+
+    returns:
+    arrow_type: pyarrow DataType
+    """
+    if dtype in ( 'str', 'string', 'object', str ):
+        return pa.string()
+    if dtype == 'category':
+        return pa.dictionary( pa.int32(), pa.string() )
+    if dtype == DATE_DTYPE:
+        return pa.timestamp( 'ns' )
+    return pa.from_numpy_dtype( np.dtype( dtype ) )
+
+def read_csv_pandas( body, encoding: str = 'utf-8', sep: str = ',', dtype: dict = None,
+                     usecols: list = None ):
+    """
+    Parsing a csv body with the pandas parser
+
+    Integer columns with missing values become float64 columns with NaN like
+    with the Arrow csv reader, the other integer columns keep their dtype.
+
+    Parameters:
+    body: raw bytes of the csv file or a binary input stream, e.g. a decompressing stream
+    encoding: encoding of the data inside the csv file
+    sep: seperator in the csv file
+    dtype: optional mapping of column names to pandas dtypes or DATE_DTYPE
+    usecols: optional list of the columns that should be parsed
+
+    returns:
+    data_frame: Pandas dataframe containing the data of the csv file
+    """
+    dtype, date_columns = split_dates( dtype )
+    dtype, int_columns = nullable_ints( dtype )
+    if isinstance( body, bytes ):
+        data = StringIO( body.decode( encoding ) )
+    else:
+        data = body
+    data_frame = pd.read_csv( data, sep=sep, dtype=dtype, usecols=usecols,
+                              parse_dates=date_columns or False, encoding=encoding )
+    for column, col_dtype in int_columns.items():
+        if column in data_frame:
+            values = data_frame[column]
+            data_frame[column] = values.astype( 'float64' if values.hasnans else col_dtype )
+    if usecols is not None and list( data_frame.columns ) != list( usecols ):
+        # pandas keeps the file order of the columns, returning them in the order of usecols
+        data_frame = data_frame[list( usecols )]
+    return data_frame
+
+def read_csv_arrow_table( body, encoding: str = 'utf-8', sep: str = ',', dtype: dict = None,
+                          usecols: list = None ):
+    """
+    Parsing a csv body with the multithreaded Arrow csv reader
+
+    The bytes are wrapped without copying and parsed directly into Arrow
+    buffers, no intermediate Python str is created.
+
+    Parameters:
+    body: raw bytes of the csv file or a pyarrow input stream, e.g. a decompressing stream
+    encoding: encoding of the data inside the csv file
+    sep: seperator in the csv file
+    dtype: optional mapping of column names to pandas dtypes or DATE_DTYPE,
+           columns that are not mapped are type inferred by Arrow
+    usecols: optional list of the columns that should be parsed
+
+    returns:
+    table: pyarrow Table containing the data of the csv file
+    """
+    column_types = { column: arrow_type( col_type ) for column, col_type in ( dtype or {} ).items() }
+    if isinstance( body, bytes ):
+        body = pa.BufferReader( body )
+    return pa_csv.read_csv(
+        body,
+        read_options=pa_csv.ReadOptions( use_threads=True, encoding=encoding ),
+        parse_options=pa_csv.ParseOptions( delimiter=sep ),
+        # empty strings are missing values like in the pandas parser
+        convert_options=pa_csv.ConvertOptions( column_types=column_types,
+                                               include_columns=usecols,
+                                               strings_can_be_null=True )
+    )
+
+def read_csv_arrow( body, encoding: str = 'utf-8', sep: str = ',', dtype: dict = None,
+                    usecols: list = None ):
+    """
+    Parsing a csv body with the Arrow csv reader into a pandas data frame
+
+    Parameters:
+    body: raw bytes of the csv file or a pyarrow input stream
+    encoding: encoding of the data inside the csv file
+    sep: seperator in the csv file
+    dtype: optional mapping of column names to pandas dtypes or DATE_DTYPE
+    usecols: optional list of the columns that should be parsed
+
+    returns:
+    data_frame: Pandas dataframe containing the data of the csv file
+    """
+    return read_csv_arrow_table( body, encoding, sep, dtype, usecols ).to_pandas()
@@ -15,4 +15,20 @@ class WrongMetaFileException( Exception ):
     WrongMetaFileException class
 
     Exception that can be raised when the meta file format is not correct
-    """
\ No newline at end of file
+    """
+
+class WrongEngineException( Exception ):
+    """
+    WrongEngineException class
+
+    Exception that can be raised when the engine given
+    as parameter is not supported
+    """
+
+class WrongReportException( Exception ):
+    """
+    WrongReportException class
+
+    Exception that can be raised when a report
+    configuration is not supported
+    """
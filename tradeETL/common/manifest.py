@@ -0,0 +1,108 @@
+"""
+Methods for processing the manifest of the target files
+"""
+import pandas as pd
+import pyarrow as pa
+import pyarrow.compute as pc
+
+from tradeETL.common.s3 import S3BucketConnector
+from tradeETL.common.constants import ManifestFormat
+from tradeETL.common.partitions import date_strings
+
+class ReportManifest():
+    """
+    class for working with the manifest of the target files
+
+    The manifest has one row per target file with its number of rows, size,
+    ETag and the minimum and maximum date and ISIN, so readers choose the
+    files of a date or ISIN range with S3BucketConnector.list_files_in_manifest
+    instead of listing the prefix and reading the file footers. It is updated
+    after the files are written and before the meta file, a file of a failed
+    run is missing from the manifest and replaced by the file of the re-run.
+    """
+    @staticmethod
+    def file_entry( key: str, table: pa.Table, date_column: str, isin_column: str,
+                    s3_bucket_trg: S3BucketConnector, date: str = None ):
+        """
+        Returning the manifest row of a written file
+
+        Parameters:
+        key: key of the file on the S3 bucket
+        table: pyarrow Table with the data of the file
+        date_column: date column of the table
+        isin_column: ISIN column of the table
+        s3_bucket_trg: S3BucketConnector for the bucket with the file
+        date: date ('YYYY-MM-DD') of a partition file without a date column
+
+        returns:
+        entry: dictionary of the ManifestFormat columns and the values of the file
+        """
+        size, etag = s3_bucket_trg.head_file( key )
+        if date is None:
+            dates = pc.min_max( date_strings( table[date_column] ) )
+            min_date, max_date = dates['min'].as_py(), dates['max'].as_py()
+        else:
+            min_date, max_date = date, date
+        isins = table[isin_column]
+        if pa.types.is_dictionary( isins.type ):
+            isins = pc.cast( isins, isins.type.value_type )
+        isins = pc.min_max( isins )
+        return {
+            ManifestFormat.MANIFEST_KEY_COL.value: key,
+            ManifestFormat.MANIFEST_ROWS_COL.value: table.num_rows,
+            ManifestFormat.MANIFEST_BYTES_COL.value: size,
+            ManifestFormat.MANIFEST_MIN_DATE_COL.value: min_date,
+            ManifestFormat.MANIFEST_MAX_DATE_COL.value: max_date,
+            ManifestFormat.MANIFEST_MIN_ISIN_COL.value: isins['min'].as_py(),
+            ManifestFormat.MANIFEST_MAX_ISIN_COL.value: isins['max'].as_py(),
+            ManifestFormat.MANIFEST_ETAG_COL.value: etag }
+
+    @staticmethod
+    def read_manifest( manifest_key: str, s3_bucket_trg: S3BucketConnector ):
+        """
+        Reading the manifest
+
+        Parameters:
+        manifest_key: key of the manifest on the S3 bucket
+        s3_bucket_trg: S3BucketConnector for the bucket with the manifest
+
+        returns:
+        df_manifest: Pandas DataFrame with the ManifestFormat columns,
+                     None if no manifest exists
+        """
+        return s3_bucket_trg.read_parquet_to_df( manifest_key, missing_ok=True )
+
+    @staticmethod
+    def update_manifest( entries: list, removed_keys: list, manifest_key: str,
+                         s3_bucket_trg: S3BucketConnector ):
+        """
+        Adding the written files to the manifest, removing the deleted files
+        from it and writing it to the S3 bucket
+
+        Parameters:
+        entries: list of the file_entry rows of the written files
+        removed_keys: list of the keys of the deleted files
+        manifest_key: key of the manifest on the S3 bucket
+        s3_bucket_trg: S3BucketConnector for the bucket with the manifest
+
+        returns:
+        df_manifest: the new manifest ordered by key
+        """
+        key_col = ManifestFormat.MANIFEST_KEY_COL.value
+        columns = [ column.value for column in ManifestFormat
+                    if column is not ManifestFormat.MANIFEST_FILE_FORMAT ]
+        df_manifest = pd.DataFrame( entries, columns=columns )
+        df_old = ReportManifest.read_manifest( manifest_key, s3_bucket_trg )
+        if df_old is not None:
+            # A rewritten key replaces its old row
+            replaced = list( removed_keys ) + df_manifest[key_col].tolist()
+            df_old = df_old[ ~df_old[key_col].isin( replaced ) ]
+            df_manifest = pd.concat( [ df_old, df_manifest ], ignore_index=True )
+        df_manifest = df_manifest.sort_values( by=[ key_col ] ).reset_index( drop=True )
+        if df_manifest.empty:
+            # An empty data frame is not written, the manifest of no files is removed
+            s3_bucket_trg.delete_files( [ manifest_key ] )
+        else:
+            s3_bucket_trg.write_df_to_s3( df_manifest, manifest_key,
+                                          ManifestFormat.MANIFEST_FILE_FORMAT.value )
+        return df_manifest
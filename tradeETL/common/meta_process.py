@@ -44,7 +44,7 @@ class MetaProcess():
                 raise WrongMetaFileException
             df_all = pd.concat([df_old, df_new])
 
-        except s3_bucket_meta.session.client('s3').exceptions.NoSuchKey:
+        except s3_bucket_meta.exceptions.NoSuchKey:
             # No meta File exists --> only new data is used
             df_all = df_new
         # Writing to s3
@@ -98,7 +98,7 @@ class MetaProcess():
                 return_min_date = datetime(2200, 1, 1).date()\
                     .strftime(MetaProcessFormat.META_DATE_FORMAT.value)
                 return_dates = []
-        except s3_bucket_meta.session.client( 's3' ).exceptions.NoSuchKey:
+        except s3_bucket_meta.exceptions.NoSuchKey:
             return_min_date = first_date
             return_dates = [ ( start + timedelta(days=x) ).strftime(MetaProcessFormat.META_DATE_FORMAT.value) for x in range(
                 0, (today-start).days + 1) ]
@@ -0,0 +1,90 @@
+"""
+Hive-style date partitions of the target files
+"""
+from datetime import datetime
+
+import pyarrow as pa
+import pyarrow.compute as pc
+
+from tradeETL.common.constants import MetaProcessFormat
+
+def partition_prefix( trg_key: str, partition_name: str, value: str = None ):
+    """
+    Returns the key prefix of a partition, the directory of trg_key
+    followed by the partition directory, e.g. 'report1/date=2021-04-17/'
+
+    Parameters:
+    trg_key: key prefix of the target files, e.g. 'report1/Trade_daily_report1_'
+    partition_name: name of the partition column
+    value: value of the partition column, None returns the prefix of
+           all partitions, e.g. 'report1/date='
+    """
+    directory = trg_key.rsplit( '/', 1 )[0] + '/' if '/' in trg_key else ''
+    if value is None:
+        return f'{directory}{partition_name}='
+    return f'{directory}{partition_name}={value}/'
+
+def partition_key( trg_key: str, trg_key_date_format: str, trg_format: str,
+                   partition_name: str, value: str ):
+    """
+    Returns the key of a target file in a partition, the file name of trg_key
+    with today's date, e.g. 'report1/date=2021-04-17/Trade_daily_report1_20210418.parquet'
+
+    Parameters:
+    trg_key: key prefix of the target files
+    trg_key_date_format: format of today's date in the key
+    trg_format: file format, also the key suffix
+    partition_name: name of the partition column
+    value: value of the partition column
+    """
+    file_name = trg_key.rsplit( '/', 1 )[-1]
+    return f'{partition_prefix( trg_key, partition_name, value )}{file_name}'\
+        f'{datetime.today().strftime( trg_key_date_format )}.{trg_format}'
+
+def date_strings( column ):
+    """
+    Returns the values of a date column as 'YYYY-MM-DD' strings
+
+    Parameters:
+    column: pyarrow Array or ChunkedArray with strings, dictionary
+            encoded strings, dates or timestamps
+    """
+    if pa.types.is_dictionary( column.type ):
+        column = pc.cast( column, column.type.value_type )
+    if pa.types.is_date( column.type ):
+        column = pc.cast( column, pa.timestamp( 's' ) )
+    if pa.types.is_timestamp( column.type ):
+        column = pc.strftime( column, format=MetaProcessFormat.META_DATE_FORMAT.value )
+    return column
+
+def date_partitions( table: pa.Table, date_column: str, sort_column: str ):
+    """
+    Splits a table into one table per date, ordered by sort_column
+
+    The table is sorted by date and sort_column once and every partition is
+    a slice of the sorted table, the date column is dropped as it is part of
+    the partition key.
+
+    Parameters:
+    table: pyarrow Table with the date and sort column
+    date_column: column the table is partitioned by
+    sort_column: column the rows of a partition are ordered by, e.g. the ISIN
+
+    returns:
+    partitions: list of tuples of the date as 'YYYY-MM-DD' string and its pyarrow Table
+    """
+    dates = date_strings( table[date_column] )
+    sort_values = table[sort_column]
+    if pa.types.is_dictionary( sort_values.type ):
+        # Ordering dictionary columns by value and not by their dictionary index
+        sort_values = pc.cast( sort_values, sort_values.type.value_type )
+    order = pc.sort_indices( pa.table( {'date': dates, 'sort': sort_values} ),
+                             sort_keys=[( 'date', 'ascending' ), ( 'sort', 'ascending' )] )
+    table = table.take( order ).drop( [date_column] )
+    partitions = []
+    offset = 0
+    # value_counts returns the dates in the order of their first appearance
+    for count in pc.value_counts( dates.take( order ) ).to_pylist():
+        partitions.append( ( count['values'], table.slice( offset, count['counts'] ) ) )
+        offset += count['counts']
+    return partitions
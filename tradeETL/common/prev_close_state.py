@@ -0,0 +1,64 @@
+"""
+Methods for processing the prior close state of a report
+"""
+import pandas as pd
+
+from tradeETL.common.s3 import S3BucketConnector
+from tradeETL.common.constants import PrevCloseStateFormat, MetaProcessFormat
+
+class PrevCloseState():
+    """
+    class for working with the prior close state
+
+    The state keeps the last price and its trading date per ISIN, so incremental
+    runs can compute the change to the previous trading day without extracting
+    the raw trades of that day again.
+    """
+    @staticmethod
+    def read_state( state_key: str, s3_bucket_state: S3BucketConnector ):
+        """
+        Reading the prior close state
+
+        Parameters:
+        state_key: key of the state file on the S3 bucket
+        s3_bucket_state: S3BucketConnector for the bucket with the state file
+
+        returns:
+        df_state: Pandas DataFrame with the isin, date ('YYYY-MM-DD') and price columns,
+                  None if no state file exists
+        """
+        return s3_bucket_state.read_parquet_to_df( state_key, missing_ok=True )
+
+    @staticmethod
+    def update_state( df_prices: pd.DataFrame, df_state: pd.DataFrame, state_key: str,
+                      s3_bucket_state: S3BucketConnector ):
+        """
+        Merging the prices of a run into the state and writing it to the S3 bucket
+
+        Parameters:
+        df_prices: Pandas DataFrame with the isin, date and price columns of the run,
+                   the date can be a string or datetime column
+        df_state: previous state as returned by read_state, None if there is none
+        state_key: key of the state file on the S3 bucket
+        s3_bucket_state: S3BucketConnector for the bucket with the state file
+
+        returns:
+        df_state: the new state with one row per ISIN
+        """
+        isin_col = PrevCloseStateFormat.STATE_ISIN_COL.value
+        date_col = PrevCloseStateFormat.STATE_DATE_COL.value
+        df_prices = df_prices.astype( { isin_col: str } )
+        if pd.api.types.is_datetime64_any_dtype( df_prices[date_col] ):
+            df_prices[date_col] = df_prices[date_col]\
+                .dt.strftime( MetaProcessFormat.META_DATE_FORMAT.value )
+        else:
+            df_prices[date_col] = df_prices[date_col].astype( str )
+        if df_state is not None:
+            df_prices = pd.concat( [ df_state, df_prices ], ignore_index=True )
+        # Keeping the latest trading day per ISIN, the run wins over the old state
+        df_state = df_prices.sort_values( by=[ date_col ], kind='stable' )\
+            .drop_duplicates( subset=[ isin_col ], keep='last' )\
+                .sort_values( by=[ isin_col ] ).reset_index( drop=True )
+        s3_bucket_state.write_df_to_s3( df_state, state_key,
+                                        PrevCloseStateFormat.STATE_FILE_FORMAT.value )
+        return df_state
@@ -5,16 +5,37 @@ import logging
 
 import pandas as pd
 from io import StringIO, BytesIO
-import boto3
+import pyarrow as pa
+import pyarrow.parquet as pq
+from pyarrow import feather
+from pyarrow import csv as pa_csv
 
-from tradeETL.common.constants import S3FileTypes
-from tradeETL.common.custom_exceptions import WrongFormatException
+from tradeETL.common.cache import S3DiskCache
+from tradeETL.common.constants import S3FileTypes, CsvEngines, S3Compressions, S3CompressionSuffixes,\
+    IpcCompressions, ManifestFormat
+from tradeETL.common.csv_engines import read_csv_pandas, read_csv_arrow, read_csv_arrow_table
+from tradeETL.common.custom_exceptions import WrongFormatException, WrongEngineException
+from tradeETL.common.s3_clients import S3ClientRegistry
+from tradeETL.common.s3_multipart import S3MultipartWriter
+from tradeETL.common.s3_read_policy import S3ReadPolicy
+
+# Number of rows serialized at a time when a csv file is streamed to S3
+CSV_CHUNK_ROWS = 100000
+# Number of rows of a data frame converted to Arrow and written as one parquet row group
+# by a multipart write
+PARQUET_CHUNK_ROWS = 1000000
+# Maximum number of keys of a DeleteObjects request
+DELETE_BATCH_KEYS = 1000
+# Number of bytes read from the end of a parquet file to get its footer in one request
+PARQUET_FOOTER_BYTES = 64 * 1024
 
 class S3BucketConnector():
     """
      Class for interacting with s3 buckets
     """ 
-    def __init__( self, access_key: str, secret_key: str, endpoint_url: str, bucket: str ):
+    def __init__( self, access_key: str, secret_key: str, endpoint_url: str, bucket: str,
+                  cache: S3DiskCache = None, multipart_part_size: int = None,
+                  multipart_max_workers: int = 4, read_policy: S3ReadPolicy = None ):
         """
         Constructor for S3 bucket connector
 
@@ -23,17 +44,33 @@ class S3BucketConnector():
         secret_key: secret key for accessing S3
         endpoint_url: endpoint url to S3
         bucket: S3 bucket name
+        cache: optional local disk cache for the objects read from the bucket
+        multipart_part_size: part size in bytes for streaming writes as multipart upload,
+                             None writes every file with a single put_object
+        multipart_max_workers: maximum number of parts uploaded at the same time
+        read_policy: optional timeout, retry and hedging policy for reading objects,
+                     the connector gets a client with the botocore settings of the policy
         """
         self._logger = logging.getLogger( __name__ )
         self.endpoint_url = endpoint_url
-        self.session = boto3.Session( aws_access_key_id=os.environ[access_key],
-                                        aws_secret_access_key=os.environ[secret_key])
+        self.cache = cache
+        self.multipart_part_size = multipart_part_size
+        self.multipart_max_workers = multipart_max_workers
+        self.read_policy = read_policy
+        # ETags seen while listing, used as cache keys without an extra HEAD request
+        self._etags = {}
+        self.session, self._client = S3ClientRegistry.get_client(
+            os.environ[access_key], os.environ[secret_key], endpoint_url,
+            None if read_policy is None else read_policy.client_config() )
         print(endpoint_url)
-        if endpoint_url == 'https://s3.amazonaws.com':
-            self._s3 = self.session.resource( service_name="s3" )
-        else:
-            self._s3 = self.session.resource( service_name="s3", endpoint_url=endpoint_url )
-        self._bucket = self._s3.Bucket( bucket )
+        self.bucket_name = bucket
+
+    @property
+    def exceptions( self ):
+        """
+        Exception classes of the S3 client, e.g. exceptions.NoSuchKey
+        """
+        return self._client.exceptions
 
     def list_files_in_prefix( self, prefix: str ):
         """
@@ -44,68 +81,601 @@ class S3BucketConnector():
         returns:
             files: list of all the file names containing the prefix in the key
         """
-        files = [ obj.key for obj in self._bucket.objects.filter(Prefix=prefix) ]
+        files = []
+        for obj in self.__list_objects( Prefix=prefix ):
+            files.append( obj['Key'] )
         return files
 
-    def read_csv_to_df( self, key: str, encoding: str = 'utf-8', sep: str = ',' ):
+    def list_files_in_date_range( self, start_date: str, end_date: str ):
+        """
+        Listing all files with a date prefix between start_date and end_date
+        in one paginated pass over the S3 bucket
+
+        The listing starts after start_date and stops at the first key whose
+        date prefix is greater than end_date, so the number of LIST requests
+        depends on the number of objects and not on the number of days.
+
+        Parameters:
+            start_date: first date prefix that should be listed, e.g. '2021-04-16'
+            end_date: last date prefix that should be listed
+
+        returns:
+            files: dictionary of date prefix and the list of file names with that prefix
+        """
+        files = {}
+        date_length = len( start_date )
+        for obj in self.__list_objects( StartAfter=start_date ):
+            date = obj['Key'][:date_length]
+            if date > end_date:
+                break
+            files.setdefault( date, [] ).append( obj['Key'] )
+        return files
+
+    def list_files_in_manifest( self, manifest_key: str, start_date: str = None,
+                                end_date: str = None, isin_min: str = None,
+                                isin_max: str = None ):
+        """
+        Listing the files of a manifest whose date and ISIN ranges overlap the
+        requested ranges, without listing the prefix or reading file footers
+
+        The ETags of the manifest spare the HEAD requests of cached reads.
+
+        Parameters:
+            manifest_key: key of the manifest on the S3 bucket
+            start_date: optional first date ('YYYY-MM-DD') a file has to reach
+            end_date: optional last date a file has to start before or on
+            isin_min: optional smallest ISIN a file has to reach
+            isin_max: optional largest ISIN a file has to start before or on
+
+        returns:
+            files: list of the file names ordered by key, None if no manifest exists
+        """
+        df_manifest = self.read_parquet_to_df( manifest_key, missing_ok=True )
+        if df_manifest is None:
+            return None
+        selected = pd.Series( True, index=df_manifest.index )
+        for value, column, overlaps in (
+                ( start_date, ManifestFormat.MANIFEST_MAX_DATE_COL, pd.Series.ge ),
+                ( end_date, ManifestFormat.MANIFEST_MIN_DATE_COL, pd.Series.le ),
+                ( isin_min, ManifestFormat.MANIFEST_MAX_ISIN_COL, pd.Series.ge ),
+                ( isin_max, ManifestFormat.MANIFEST_MIN_ISIN_COL, pd.Series.le ) ):
+            if value is not None:
+                selected &= overlaps( df_manifest[column.value], value )
+        df_manifest = df_manifest[selected]
+        files = df_manifest[ManifestFormat.MANIFEST_KEY_COL.value].tolist()
+        if self.cache is not None:
+            self._etags.update( zip( files, df_manifest[ManifestFormat.MANIFEST_ETAG_COL.value] ) )
+        return files
+
+    def head_file( self, key: str ):
+        """
+        Reading the size and ETag of a file without downloading it
+
+        Parameters:
+            key: key of the file
+
+        returns:
+            size: number of bytes of the file
+            etag: ETag of the file
+        """
+        response = self._client.head_object( Bucket=self.bucket_name, Key=key )
+        if self.cache is not None:
+            self._etags[key] = response.get('ETag')
+        return response.get('ContentLength'), response.get('ETag')
+
+    def __list_objects( self, **kwargs ):
+        """
+        Helper function iterating lazily over the pages of a ListObjectsV2 request
+
+        Parameters:
+        kwargs: arguments of ListObjectsV2, e.g. Prefix or StartAfter
+        """
+        paginator = self._client.get_paginator( 'list_objects_v2' )
+        for page in paginator.paginate( Bucket=self.bucket_name, **kwargs ):
+            for obj in page.get( 'Contents', [] ):
+                if self.cache is not None:
+                    self._etags[obj['Key']] = obj['ETag']
+                yield obj
+
+    def read_csv_to_df( self, key: str, encoding: str = 'utf-8', sep: str = ',',
+                        engine: str = CsvEngines.PANDAS.value, dtype: dict = None,
+                        usecols: list = None, compression: str = None ):
         """
         Reading a csv file from the s3 bucket and returning a data frame
 
+        supported engines:
+        pandas: decodes the body and uses the pandas parser
+        arrow: parses the raw bytes with the multithreaded Arrow csv reader
+
+        Compressed files are decompressed as a stream while they are parsed.
+
         Parameters:
         key: key of the file that should be read
         encoding: encoding of the data inside the csv file
         sep: seperator in the csv file
+        engine: engine used for parsing the csv file
+        dtype: optional mapping of column names to pandas dtypes,
+               'date' parses a column into datetime64 values
+        usecols: optional list of the columns that should be parsed
+        compression: compression codec of the file, 'gzip' or 'zstd',
+                     detected from the key suffix (.gz, .zst) if not given
 
         return:
         data_frame: Pandas dataframe containing the data of the csv file
         """
-        self._logger.info( 'Reading file %s/%s/%s', self.endpoint_url, self._bucket.name, key)
-        csv_obj = self._bucket.Object(key=key).get().get('Body').read().decode(encoding)
-        data = StringIO( csv_obj )
-        data_frame = pd.read_csv( data, sep=sep )
-        return data_frame
+        if engine == CsvEngines.PANDAS.value:
+            read_csv = read_csv_pandas
+        elif engine == CsvEngines.ARROW.value:
+            read_csv = read_csv_arrow
+        else:
+            self._logger.info('The csv engine %s is not supported', engine)
+            raise WrongEngineException
+        return self.__parse_csv( key, read_csv, encoding, sep, dtype, usecols, compression )
+
+    def read_csv_to_table( self, key: str, encoding: str = 'utf-8', sep: str = ',',
+                           dtype: dict = None, usecols: list = None, compression: str = None ):
+        """
+        Reading a csv file from the s3 bucket into a pyarrow Table
+        with the Arrow csv reader, without a pandas conversion
+
+        Parameters:
+        key: key of the file that should be read
+        encoding: encoding of the data inside the csv file
+        sep: seperator in the csv file
+        dtype: optional mapping of column names to pandas dtypes,
+               'date' parses a column into timestamp values
+        usecols: optional list of the columns that should be parsed
+        compression: compression codec of the file, 'gzip' or 'zstd',
+                     detected from the key suffix (.gz, .zst) if not given
+
+        return:
+        table: pyarrow Table containing the data of the csv file
+        """
+        return self.__parse_csv( key, read_csv_arrow_table, encoding, sep, dtype, usecols,
+                                 compression )
+
+    def __parse_csv( self, key: str, read_csv, encoding: str, sep: str, dtype: dict,
+                     usecols: list, compression: str ):
+        """
+        Helper function reading a csv file and parsing it with read_csv
+
+        Compressed files are decompressed as a stream while they are parsed.
+        """
+        compression = self._compression( key, compression )
+        self._logger.info( 'Reading file %s/%s/%s', self.endpoint_url, self.bucket_name, key)
+        body = self._read_object( key )
+        if compression is None:
+            return read_csv( body, encoding, sep, dtype, usecols )
+        with pa.CompressedInputStream( pa.BufferReader( body ), compression ) as in_stream:
+            data = read_csv( in_stream, encoding, sep, dtype, usecols )
+        return data
+
+    def read_parquet_to_df( self, key: str, columns: list = None, missing_ok: bool = False ):
+        """
+        Reading a parquet file from the s3 bucket and returning a data frame
+
+        Parameters:
+        key: key of the file that should be read
+        columns: optional list of the columns that should be read
+        missing_ok: returns None instead of raising NoSuchKey if the file does not exist,
+                    e.g. for state files that the first run creates
+
+        return:
+        data_frame: Pandas dataframe containing the data of the parquet file
+        """
+        self._logger.info( 'Reading file %s/%s/%s', self.endpoint_url, self.bucket_name, key)
+        try:
+            body = self._read_object( key )
+        except self.exceptions.ClientError as error:
+            # A cached read fails with 404 on its HEAD request instead of NoSuchKey
+            if missing_ok and error.response['Error']['Code'] in ( 'NoSuchKey', '404' ):
+                return None
+            raise
+        return pq.read_table( pa.BufferReader( body ), columns=columns ).to_pandas()
+
+    def read_parquet_to_table( self, key: str, columns: list = None ):
+        """
+        Reading a parquet file from the s3 bucket and returning a pyarrow Table
+
+        Parameters:
+        key: key of the file that should be read
+        columns: optional list of the columns that should be read
+
+        return:
+        table: pyarrow Table containing the data of the parquet file
+        """
+        self._logger.info( 'Reading file %s/%s/%s', self.endpoint_url, self.bucket_name, key)
+        body = self._read_object( key )
+        return pq.read_table( pa.BufferReader( body ), columns=columns )
+
+    def read_parquet_metadata( self, key: str ):
+        """
+        Reading the footer of a parquet file with ranged requests, without downloading the file
+
+        Parameters:
+        key: key of the file that should be read
+
+        return:
+        metadata: pyarrow FileMetaData with the row count and column statistics of the file
+        """
+        tail = self.__get_range( key, PARQUET_FOOTER_BYTES )
+        # The file ends with the footer, its length as 4 byte integer and the magic bytes
+        footer_bytes = int.from_bytes( tail[-8:-4], 'little' ) + 8
+        if footer_bytes > len( tail ):
+            tail = self.__get_range( key, footer_bytes )
+        return pq.read_metadata( pa.BufferReader( b'PAR1' + tail[-footer_bytes:] ) )
+
+    def read_arrow_to_table( self, key: str, columns: list = None ):
+        """
+        Reading an Arrow IPC (Feather v2) file from the s3 bucket and returning a pyarrow Table
+
+        With a local cache the cached copy of the file is memory-mapped, the
+        columns of an uncompressed file reference the mapped pages instead of
+        a copy in memory and only the pages of the read columns are loaded.
+
+        Parameters:
+        key: key of the file that should be read
+        columns: optional list of the columns that should be read
+
+        return:
+        table: pyarrow Table containing the data of the arrow file
+        """
+        self._logger.info( 'Reading file %s/%s/%s', self.endpoint_url, self.bucket_name, key)
+        with pa.ipc.open_file( self._open_object( key ) ) as reader:
+            table = reader.read_all()
+        # Selecting the columns after reading, projecting while reading copies the columns
+        return table if columns is None else table.select( columns )
+
+    def read_arrow_to_df( self, key: str, columns: list = None ):
+        """
+        Reading an Arrow IPC (Feather v2) file from the s3 bucket and returning a data frame
+
+        Parameters:
+        key: key of the file that should be read
+        columns: optional list of the columns that should be read
+
+        return:
+        data_frame: Pandas dataframe containing the data of the arrow file
+        """
+        return self.read_arrow_to_table( key, columns=columns ).to_pandas()
+
+    def delete_files( self, keys: list ):
+        """
+        Deleting files from the s3 bucket with one request per 1000 keys
+
+        Parameters:
+        keys: list of the keys that should be deleted
+        """
+        for start in range( 0, len( keys ), DELETE_BATCH_KEYS ):
+            batch = keys[start:start + DELETE_BATCH_KEYS]
+            self._logger.info( 'Deleting %s files from %s/%s', len( batch ),
+                               self.endpoint_url, self.bucket_name )
+            self._client.delete_objects( Bucket=self.bucket_name, Delete={
+                'Objects': [ { 'Key': key } for key in batch ], 'Quiet': True } )
+        return True
 
-    def write_df_to_s3( self, data_frame: pd.DataFrame, key: str, file_format: str ):
+    def _compression( self, key: str, compression: str = None ):
+        """
+        Returning the compression codec of a file
+
+        Parameters:
+        key: key of the file
+        compression: explicitly configured codec, takes precedence over the key suffix
+
+        returns:
+        compression: 'gzip', 'zstd' or None for uncompressed files
+        """
+        if compression is not None:
+            if compression not in [ codec.value for codec in S3Compressions ]:
+                self._logger.info('The compression %s is not supported', compression)
+                raise WrongFormatException
+            return compression
+        for suffix in S3CompressionSuffixes:
+            if key.endswith( suffix.value ):
+                return S3Compressions[suffix.name].value
+        return None
+
+    def _ipc_compression( self, compression: str = None ):
+        """
+        Returning the buffer compression codec of an Arrow IPC file
+
+        Parameters:
+        compression: configured codec, 'lz4', 'zstd' or None for uncompressed buffers
+        """
+        if compression is not None and \
+            compression not in [ codec.value for codec in IpcCompressions ]:
+            self._logger.info('The arrow compression %s is not supported', compression)
+            raise WrongFormatException
+        return compression
+
+    def _etag( self, key: str ):
+        """
+        Returning the ETag of an object, from the last listing if it contained the key
+
+        Parameters:
+        key: key of the object
+        """
+        etag = self._etags.get( key )
+        if etag is None:
+            etag = self._client.head_object( Bucket=self.bucket_name, Key=key ).get('ETag')
+        return etag
+
+    def _open_object( self, key: str ):
+        """
+        Opening an object as a pyarrow file, the cached copy is memory-mapped
+        if a local cache is configured and the object fits into it
+
+        Parameters:
+        key: key of the object that should be opened
+
+        returns:
+        source: pyarrow MemoryMappedFile of the cached copy or BufferReader of the body
+        """
+        if self.cache is None:
+            return pa.BufferReader( self.__get_object( key )[0] )
+        etag = self._etag( key )
+        path = self.cache.get_path( self.bucket_name, key, etag )
+        body = None
+        if path is None:
+            body, etag = self.__get_object( key )
+            path = self.cache.put( self.bucket_name, key, etag, body )
+        try:
+            if path is not None:
+                return pa.memory_map( path )
+        except FileNotFoundError:
+            # Evicted by another thread between lookup and mapping
+            pass
+        return pa.BufferReader( body if body is not None else self.__get_object( key )[0] )
+
+    def _read_object( self, key: str ):
+        """
+        Reading the body of an object, from the local cache if one is configured
+
+        Parameters:
+        key: key of the object that should be read
+
+        returns:
+        body: bytes of the object
+        """
+        if self.cache is None:
+            return self.__get_object( key )[0]
+        etag = self._etag( key )
+        body = self.cache.get( self.bucket_name, key, etag )
+        if body is None:
+            body, etag = self.__get_object( key )
+            self.cache.put( self.bucket_name, key, etag, body )
+        return body
+
+    def __get_object( self, key: str ):
+        """
+        Helper function downloading an object with the read policy if one is configured
+
+        Parameters:
+        key: key of the object that should be read
+
+        returns:
+        body: bytes of the object
+        etag: ETag of the object
+        """
+        def fetch():
+            response = self._client.get_object( Bucket=self.bucket_name, Key=key )
+            return response.get('Body').read(), response.get('ETag')
+        if self.read_policy is None:
+            return fetch()
+        return self.read_policy.call( fetch )
+
+    def __get_range( self, key: str, suffix_bytes: int ):
+        """
+        Helper function downloading the last bytes of an object with the read policy
+        if one is configured
+
+        Parameters:
+        key: key of the object that should be read
+        suffix_bytes: number of bytes read from the end of the object
+        """
+        def fetch():
+            response = self._client.get_object( Bucket=self.bucket_name, Key=key,
+                                                Range=f'bytes=-{suffix_bytes}' )
+            return response.get('Body').read()
+        if self.read_policy is None:
+            return fetch()
+        return self.read_policy.call( fetch )
+
+    def write_df_to_s3( self, data_frame: pd.DataFrame, key: str, file_format: str,
+                        compression: str = None, parquet_options: dict = None ):
         """
         Writing a pandas dataframe to the s3 bucket
 
         supported file formats:
         .csv
         .parquet
+        .arrow (Arrow IPC / Feather v2)
 
         Parameters:
         data_frame: pandas data frame that needs to written into the s3 bucket
         key: target of the saved file
         file_format: format of the saved file
+        compression: compression codec of csv files, 'gzip' or 'zstd',
+                     detected from the key suffix (.gz, .zst) if not given,
+                     buffer compression of arrow files, 'lz4' or 'zstd'
+        parquet_options: optional keyword arguments of the parquet writer, e.g.
+                         compression, compression_level or use_dictionary
         """
         if data_frame.empty:
             self._logger.info('The dataframe is empty! No file will be written!')
             return None
 
+        if file_format == S3FileTypes.ARROW.value:
+            return self.write_table_to_s3(pa.Table.from_pandas(data_frame, preserve_index=False),
+                                          key, file_format, compression=compression)
+        if file_format == S3FileTypes.CSV.value:
+            compression = self._compression(key, compression)
+        if self.multipart_part_size is not None and \
+            file_format in (S3FileTypes.CSV.value, S3FileTypes.PARQUET.value):
+            return self.__write_multipart(data_frame, key, file_format, compression,
+                                          parquet_options)
+        if file_format == S3FileTypes.CSV.value and compression is not None:
+            out_buffer = pa.BufferOutputStream()
+            self.__write_csv(data_frame, out_buffer, compression)
+            return self.__put_object(pa.BufferReader(out_buffer.getvalue()), key)
         if file_format == S3FileTypes.CSV.value:
             out_buffer = StringIO()
             data_frame.to_csv(out_buffer, index=False)
             return self.__put_object(out_buffer, key)
         if file_format == S3FileTypes.PARQUET.value:
             out_buffer = BytesIO()
-            data_frame.to_parquet(out_buffer, index=False)
+            data_frame.to_parquet(out_buffer, index=False, **(parquet_options or {}))
             return self.__put_object(out_buffer, key)
 
         self._logger.info('The file fomat %s is not supported to be written to S3 bucket', file_format)
         raise WrongFormatException
 
+    def write_table_to_s3( self, table: pa.Table, key: str, file_format: str,
+                           compression: str = None, row_group_size: int = None,
+                           parquet_options: dict = None ):
+        """
+        Writing a pyarrow Table to the s3 bucket without a pandas conversion
+
+        supported file formats:
+        .csv
+        .parquet
+        .arrow (Arrow IPC / Feather v2)
+
+        Parameters:
+        table: pyarrow Table that needs to written into the s3 bucket
+        key: target of the saved file
+        file_format: format of the saved file
+        compression: compression codec of csv files, 'gzip' or 'zstd',
+                     detected from the key suffix (.gz, .zst) if not given,
+                     buffer compression of arrow files, 'lz4' or 'zstd'
+        row_group_size: maximum number of rows of a parquet row group,
+                        None keeps the default of pyarrow
+        parquet_options: optional keyword arguments of the parquet writer, e.g.
+                         compression, compression_level or use_dictionary
+        """
+        if table.num_rows == 0:
+            self._logger.info('The table is empty! No file will be written!')
+            return None
+        if file_format not in [file_type.value for file_type in S3FileTypes]:
+            self._logger.info('The file fomat %s is not supported to be written to S3 bucket', file_format)
+            raise WrongFormatException
+        if file_format == S3FileTypes.CSV.value:
+            compression = self._compression(key, compression)
+        elif file_format == S3FileTypes.ARROW.value:
+            compression = self._ipc_compression(compression)
+        if self.multipart_part_size is not None:
+            self._logger.info('Writing file to %s/%s/%s', self.endpoint_url, self.bucket_name, key)
+            with S3MultipartWriter(self._client, self.bucket_name, key, self.multipart_part_size,
+                                   self.multipart_max_workers) as out_stream:
+                self.__write_table(table, out_stream, file_format, compression, row_group_size,
+                                   parquet_options)
+            return True
+        out_buffer = pa.BufferOutputStream()
+        self.__write_table(table, out_buffer, file_format, compression, row_group_size,
+                           parquet_options)
+        return self.__put_object(pa.BufferReader(out_buffer.getvalue()), key)
+
+    @staticmethod
+    def __write_table( table: pa.Table, out_stream, file_format: str, compression: str = None,
+                       row_group_size: int = None, parquet_options: dict = None ):
+        """
+        Helper function writing a pyarrow Table as csv, parquet or arrow to a binary stream
+
+        parameters:
+        table: pyarrow Table that should be written
+        out_stream: writable binary stream
+        file_format: format of the saved file
+        compression: optional codec csv files are compressed with while writing,
+                     optional buffer compression of arrow files
+        row_group_size: optional maximum number of rows of a parquet row group
+        parquet_options: optional keyword arguments of the parquet writer
+        """
+        if file_format == S3FileTypes.PARQUET.value:
+            # Minimum and maximum of every column chunk let readers skip row groups
+            parquet_options = {'write_statistics': True, **(parquet_options or {})}
+            with pq.ParquetWriter(out_stream, table.schema, **parquet_options) as writer:
+                writer.write_table(table, row_group_size=row_group_size)
+            return
+        if file_format == S3FileTypes.ARROW.value:
+            feather.write_feather(table, out_stream, compression=compression or 'uncompressed',
+                                  chunksize=row_group_size)
+            return
+        if compression is not None:
+            out_stream = pa.CompressedOutputStream(out_stream, compression)
+        pa_csv.write_csv(table, out_stream)
+        if compression is not None:
+            out_stream.close()
+
+    @staticmethod
+    def __write_csv( data_frame: pd.DataFrame, out_stream, compression: str = None ):
+        """
+        Helper function writing a data frame in csv chunks to a binary stream
+
+        parameters:
+        data_frame: pandas data frame that should be written
+        out_stream: writable binary stream
+        compression: optional codec the chunks are compressed with while writing
+        """
+        if compression is not None:
+            out_stream = pa.CompressedOutputStream(out_stream, compression)
+        for start in range(0, len(data_frame), CSV_CHUNK_ROWS):
+            out_stream.write(data_frame.iloc[start:start + CSV_CHUNK_ROWS]\
+                .to_csv(index=False, header=start == 0).encode('utf-8'))
+        if compression is not None:
+            out_stream.close()
+
+    def __write_multipart( self, data_frame: pd.DataFrame, key: str, file_format: str,
+                           compression: str = None, parquet_options: dict = None ):
+        """
+        Helper function for self.write_df_to_s3() streaming the file as multipart upload
+
+        Parquet row groups and csv chunks are uploaded as parts while the
+        rest of the data frame is still being serialized. Every row group is
+        converted to Arrow on its own, so only one row group is held as Arrow
+        Table next to the data frame.
+
+        parameters:
+        data_frame: pandas data frame that needs to written into the s3 bucket
+        key: target key of the saved file
+        file_format: format of the saved file
+        compression: compression codec of csv files
+        parquet_options: optional keyword arguments of the parquet writer
+        """
+        self._logger.info('Writing file to %s/%s/%s', self.endpoint_url, self.bucket_name, key)
+        with S3MultipartWriter(self._client, self.bucket_name, key, self.multipart_part_size,
+                               self.multipart_max_workers) as out_stream:
+            if file_format == S3FileTypes.CSV.value:
+                self.__write_csv(data_frame, out_stream, compression)
+            else:
+                schema = pa.Schema.from_pandas(data_frame, preserve_index=False)
+                with pq.ParquetWriter(out_stream, schema,
+                                      **(parquet_options or {})) as writer:
+                    for start in range(0, len(data_frame), PARQUET_CHUNK_ROWS):
+                        writer.write_table(pa.Table.from_pandas(
+                            data_frame.iloc[start:start + PARQUET_CHUNK_ROWS], schema=schema,
+                            preserve_index=False))
+        return True
+
     def __put_object( self, out_buffer: StringIO or BytesIO, key: str ):
         """
         Helper function for self.write_df_to_s3()
 
         parameters:
-        out_buffer: StringIO or BytesIO that should be written to the s3 bucket
+        out_buffer: StringIO or a seekable binary buffer, e.g. BytesIO,
+                    that should be written to the s3 bucket
         key: target key of the saved file
         """
 
-        self._logger.info('Writing file to %s/%s/%s', self.endpoint_url, self._bucket.name, key)
-        self._bucket.put_object(
-            Body=out_buffer.getvalue(),
+        self._logger.info('Writing file to %s/%s/%s', self.endpoint_url, self.bucket_name, key)
+        if isinstance(out_buffer, StringIO):
+            body = out_buffer.getvalue()
+        else:
+            # Uploading the buffer itself instead of a copy of its content
+            out_buffer.seek(0)
+            body = out_buffer
+        self._client.put_object(
+            Bucket=self.bucket_name,
+            Body=body,
             Key=key
         )
         return True
\ No newline at end of file
@@ -0,0 +1,126 @@
+""" Awaitable connector to AWS S3 running the boto3 calls on worker threads"""
+
+import asyncio
+import functools
+import logging
+from concurrent.futures import ThreadPoolExecutor
+
+import pandas as pd
+
+from tradeETL.common.s3 import S3BucketConnector
+
+class AsyncS3BucketConnector():
+    """
+     Class for awaiting s3 bucket operations from an asyncio event loop
+
+     The blocking boto3 calls of the wrapped S3BucketConnector are run on a
+     bounded pool of worker threads sharing the thread safe S3 client. This
+     is the threading model of the concurrent downloads of TradeETL.extract
+     behind coroutines, not an asyncio native client like aiobotocore: every
+     request in flight holds a worker thread, so the concurrency is bounded
+     by max_in_flight and the max_pool_connections of the client.
+    """
+    def __init__( self, s3_bucket: S3BucketConnector, max_in_flight: int = 32 ):
+        """
+        Constructor for the async S3 bucket connector
+
+        Parameters:
+        s3_bucket: S3BucketConnector of the bucket that should be accessed
+        max_in_flight: maximum number of S3 requests running at the same time
+        """
+        self._logger = logging.getLogger( __name__ )
+        self.s3_bucket = s3_bucket
+        self.max_in_flight = max_in_flight
+        self._executor = ThreadPoolExecutor( max_workers=max_in_flight,
+                                             thread_name_prefix='s3-async' )
+
+    async def __aenter__( self ):
+        return self
+
+    async def __aexit__( self, exc_type, exc_value, traceback ):
+        # Waiting for the worker threads without blocking the event loop
+        await asyncio.to_thread( self.close )
+
+    def close( self ):
+        """
+        Shutting down the worker threads of the connector
+        """
+        self._executor.shutdown( wait=True )
+
+    async def __run( self, func, *args, **kwargs ):
+        """
+        Helper function running a blocking connector method on the worker threads
+
+        Parameters:
+        func: blocking method that should be awaited
+        args, kwargs: arguments passed to func
+        """
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor( self._executor,
+                                           functools.partial( func, *args, **kwargs ) )
+
+    async def list_files_in_prefix( self, prefix: str ):
+        """
+        Listing all files with a prefix on the S3 bucket
+
+        Parameters:
+            prefix: prefix on the S3 bucket that should be filtered with
+
+        returns:
+            files: list of all the file names containing the prefix in the key
+        """
+        return await self.__run( self.s3_bucket.list_files_in_prefix, prefix )
+
+    async def list_files_in_date_range( self, start_date: str, end_date: str ):
+        """
+        Listing all files with a date prefix between start_date and end_date
+
+        Parameters:
+            start_date: first date prefix that should be listed
+            end_date: last date prefix that should be listed
+
+        returns:
+            files: dictionary of date prefix and the list of file names with that prefix
+        """
+        return await self.__run( self.s3_bucket.list_files_in_date_range, start_date, end_date )
+
+    async def read_csv_to_df( self, key: str, **kwargs ):
+        """
+        Reading a csv file from the s3 bucket and returning a data frame
+
+        Parameters:
+        key: key of the file that should be read
+        kwargs: keyword arguments of S3BucketConnector.read_csv_to_df
+
+        return:
+        data_frame: Pandas dataframe containing the data of the csv file
+        """
+        return await self.__run( self.s3_bucket.read_csv_to_df, key, **kwargs )
+
+    async def read_csv_to_table( self, key: str, **kwargs ):
+        """
+        Reading a csv file from the s3 bucket into a pyarrow Table
+
+        Parameters:
+        key: key of the file that should be read
+        kwargs: keyword arguments of S3BucketConnector.read_csv_to_table
+
+        return:
+        table: pyarrow Table containing the data of the csv file
+        """
+        return await self.__run( self.s3_bucket.read_csv_to_table, key, **kwargs )
+
+    async def write_df_to_s3( self, data_frame: pd.DataFrame, key: str, file_format: str,
+                              **kwargs ):
+        """
+        Writing a pandas dataframe to the s3 bucket
+
+        Parameters:
+        data_frame: pandas data frame that needs to written into the s3 bucket
+        key: target of the saved file
+        file_format: format of the saved file
+        kwargs: keyword arguments of S3BucketConnector.write_df_to_s3, e.g.
+                compression or parquet_options
+        """
+        return await self.__run( self.s3_bucket.write_df_to_s3, data_frame, key, file_format,
+                                 **kwargs )
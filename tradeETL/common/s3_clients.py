@@ -0,0 +1,95 @@
+""" Process wide registry of the boto3 sessions and clients used to access AWS S3"""
+
+import logging
+import threading
+
+import boto3
+from botocore.config import Config
+
+# Endpoint that is used when no endpoint_url is passed to boto3
+DEFAULT_ENDPOINT_URL = 'https://s3.amazonaws.com'
+
+class S3ClientRegistry():
+    """
+     Class caching one boto3 session and S3 client per endpoint and credentials
+
+     boto3 clients are thread safe, so every connector, meta file operation and
+     worker thread talking to the same endpoint with the same credentials shares
+     one client and its connection pool instead of creating its own session,
+     client and TLS connections.
+    """
+    _lock = threading.Lock()
+    _clients = {}
+    _client_config = {}
+
+    @classmethod
+    def configure( cls, max_pool_connections: int = 10, tcp_keepalive: bool = False,
+                   max_attempts: int = None, retry_mode: str = 'standard',
+                   connect_timeout: float = 60, read_timeout: float = 60 ):
+        """
+        Setting the botocore configuration of the clients created afterwards
+
+        Parameters:
+        max_pool_connections: maximum number of connections kept in the pool of a client,
+                              should be at least the number of threads sharing the client
+        tcp_keepalive: whether TCP keep-alive is enabled on the connections
+        max_attempts: maximum number of attempts of a request including retries,
+                      None keeps the botocore default
+        retry_mode: botocore retry mode, 'legacy', 'standard' or 'adaptive'
+        connect_timeout: timeout in seconds for establishing a connection
+        read_timeout: timeout in seconds for reading from a connection
+        """
+        retries = { 'mode': retry_mode }
+        if max_attempts is not None:
+            retries['total_max_attempts'] = max_attempts
+        with cls._lock:
+            cls._client_config = {
+                'max_pool_connections': max_pool_connections,
+                'tcp_keepalive': tcp_keepalive,
+                'retries': retries,
+                'connect_timeout': connect_timeout,
+                'read_timeout': read_timeout
+            }
+
+    @classmethod
+    def get_client( cls, access_key_id: str, secret_access_key: str, endpoint_url: str,
+                    overrides: dict = None ):
+        """
+        Returning the shared S3 client of an endpoint and credentials
+
+        Parameters:
+        access_key_id: AWS access key id
+        secret_access_key: AWS secret access key
+        endpoint_url: endpoint url to S3
+        overrides: optional botocore Config arguments replacing the configured ones,
+                   the retries are merged into the configured retries
+
+        returns:
+        session: boto3 Session the client was created from
+        client: thread safe boto3 S3 client
+        """
+        with cls._lock:
+            client_config = dict( cls._client_config )
+            for name, value in ( overrides or {} ).items():
+                if name == 'retries':
+                    value = { **client_config.get( 'retries', {} ), **value }
+                client_config[name] = value
+            key = ( endpoint_url, access_key_id, secret_access_key,
+                    repr( sorted( client_config.items() ) ) )
+            if key not in cls._clients:
+                logging.getLogger( __name__ ).info( 'Creating S3 client for %s', endpoint_url )
+                session = boto3.Session( aws_access_key_id=access_key_id,
+                                         aws_secret_access_key=secret_access_key )
+                client_args = { 'config': Config( **client_config ) }
+                if endpoint_url != DEFAULT_ENDPOINT_URL:
+                    client_args['endpoint_url'] = endpoint_url
+                cls._clients[key] = ( session, session.client( service_name='s3', **client_args ) )
+            return cls._clients[key]
+
+    @classmethod
+    def clear( cls ):
+        """
+        Removing all cached clients
+        """
+        with cls._lock:
+            cls._clients = {}
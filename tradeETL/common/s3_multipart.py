@@ -0,0 +1,152 @@
+""" Streaming multipart upload to AWS S3"""
+
+import logging
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+# Minimum size of every part but the last one accepted by S3
+MIN_PART_SIZE = 5 * 1024 * 1024
+
+class S3MultipartWriter():
+    """
+     Writable file object that streams its content to S3 as a multipart upload
+
+     Written bytes are buffered until part_size is reached and then uploaded
+     as one part on a pool of worker threads. At most max_workers parts are
+     buffered or uploading at the same time, so the peak memory stays at about
+     max_workers * part_size independent of the object size. Objects smaller
+     than one part are written with a single put_object.
+
+     Used as a context manager the upload is completed on a clean exit and
+     aborted if an exception is raised.
+    """
+    def __init__( self, client, bucket_name: str, key: str, part_size: int = MIN_PART_SIZE,
+                  max_workers: int = 4 ):
+        """
+        Constructor for the multipart writer
+
+        Parameters:
+        client: thread safe boto3 S3 client
+        bucket_name: name of the bucket the object is written to
+        key: target key of the object
+        part_size: minimum size of the uploaded parts in bytes
+        max_workers: maximum number of parts uploaded at the same time
+        """
+        self._logger = logging.getLogger( __name__ )
+        self._client = client
+        self.bucket_name = bucket_name
+        self.key = key
+        self.part_size = max( part_size, MIN_PART_SIZE )
+        self._buffer = bytearray()
+        self._position = 0
+        self._upload_id = None
+        self._futures = []
+        self._executor = None
+        self._slots = threading.BoundedSemaphore( max_workers )
+        self._max_workers = max_workers
+        self.closed = False
+
+    def __enter__( self ):
+        return self
+
+    def __exit__( self, exc_type, exc_value, traceback ):
+        if exc_type is None:
+            self.complete()
+        else:
+            self.abort()
+
+    def writable( self ):
+        return True
+
+    def tell( self ):
+        return self._position
+
+    def flush( self ):
+        pass
+
+    def close( self ):
+        """
+        Marking the file as closed, the upload is finished by complete()
+        """
+        self.closed = True
+
+    def write( self, data ):
+        """
+        Writing bytes to the object
+
+        Parameters:
+        data: bytes like object that is appended to the object
+        """
+        self._buffer += data
+        self._position += len( data )
+        if len( self._buffer ) >= self.part_size:
+            self.__submit_part()
+        return len( data )
+
+    def __submit_part( self ):
+        """
+        Uploading the buffered bytes as the next part
+        """
+        if self._upload_id is None:
+            self._upload_id = self._client.create_multipart_upload(
+                Bucket=self.bucket_name, Key=self.key )['UploadId']
+            self._executor = ThreadPoolExecutor( max_workers=self._max_workers )
+        part, self._buffer = self._buffer, bytearray()
+        part_number = len( self._futures ) + 1
+        # Blocking the writer while max_workers parts are in flight
+        self._slots.acquire()
+        future = self._executor.submit( self.__upload_part, part_number, part )
+        future.add_done_callback( lambda _: self._slots.release() )
+        self._futures.append( future )
+
+    def __upload_part( self, part_number: int, part: bytearray ):
+        """
+        Helper function uploading a single part
+
+        returns:
+        part: part number and ETag of the uploaded part
+        """
+        response = self._client.upload_part( Bucket=self.bucket_name, Key=self.key,
+                                             UploadId=self._upload_id, PartNumber=part_number,
+                                             Body=part )
+        return { 'PartNumber': part_number, 'ETag': response['ETag'] }
+
+    def complete( self ):
+        """
+        Uploading the remaining bytes and completing the multipart upload
+        """
+        self.closed = True
+        if self._upload_id is None:
+            self._client.put_object( Bucket=self.bucket_name, Key=self.key, Body=self._buffer )
+            self._buffer = bytearray()
+            return True
+        try:
+            if self._buffer:
+                self.__submit_part()
+            parts = [ future.result() for future in self._futures ]
+            self._client.complete_multipart_upload( Bucket=self.bucket_name, Key=self.key,
+                                                    UploadId=self._upload_id,
+                                                    MultipartUpload={ 'Parts': parts } )
+        except Exception:
+            self.abort()
+            raise
+        finally:
+            self._executor.shutdown( wait=True )
+        self._logger.info( 'Uploaded %s parts to %s/%s', len( parts ), self.bucket_name, self.key )
+        return True
+
+    def abort( self ):
+        """
+        Aborting the multipart upload, the already uploaded parts are discarded
+        """
+        self.closed = True
+        self._buffer = bytearray()
+        if self._upload_id is None:
+            return None
+        for future in self._futures:
+            future.cancel()
+        self._executor.shutdown( wait=True )
+        self._client.abort_multipart_upload( Bucket=self.bucket_name, Key=self.key,
+                                             UploadId=self._upload_id )
+        self._upload_id = None
+        return None
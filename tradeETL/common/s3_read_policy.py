@@ -0,0 +1,206 @@
+""" Retry and hedging policy for reads from AWS S3"""
+
+import logging
+import random
+import threading
+import time
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor, wait, FIRST_COMPLETED
+
+from botocore.exceptions import ClientError, BotoCoreError
+
+# Error codes of S3 responses that are worth retrying
+RETRYABLE_ERROR_CODES = { 'SlowDown', 'InternalError', 'ServiceUnavailable', 'RequestTimeout',
+                          'RequestTimeTooSkewed', 'Throttling', 'ThrottlingException',
+                          '500', '502', '503', '504' }
+
+class S3ReadPolicy():
+    """
+     Class running S3 reads with timeouts, retries and hedged requests
+
+     A read that did not finish within timeout or failed with a retryable
+     error is retried after an exponential backoff with full jitter. If
+     hedge_percentile is set, a duplicate request is fired when a read takes
+     longer than that percentile of the recent read latencies, and the first
+     response wins. Counters for retries, hedges and timeouts are kept to tune
+     the policy against the p99 GET latency.
+
+     The policy replaces the retries of botocore: the client of a connector
+     with a policy gets the client_config overrides, so a read makes at most
+     max_attempts requests plus one hedged request per attempt.
+    """
+    def __init__( self, timeout: float = None, max_attempts: int = 3, backoff_base: float = 0.1,
+                  backoff_max: float = 5.0, hedge_percentile: float = None,
+                  hedge_min_samples: int = 20, latency_window: int = 1000,
+                  max_in_flight: int = 64 ):
+        """
+        Constructor for the read policy
+
+        Parameters:
+        timeout: seconds after which a read attempt is given up and retried, None waits forever
+        max_attempts: maximum number of attempts of a read
+        backoff_base: backoff in seconds before the first retry, doubled for every further retry
+        backoff_max: maximum backoff in seconds
+        hedge_percentile: latency percentile (0-100) after which a hedged request is fired,
+                          None disables hedging
+        hedge_min_samples: number of measured reads before hedging starts
+        latency_window: number of recent read latencies the percentile is computed from
+        max_in_flight: maximum number of requests running at the same time
+        """
+        self._logger = logging.getLogger( __name__ )
+        self.timeout = timeout
+        self.max_attempts = max_attempts
+        self.backoff_base = backoff_base
+        self.backoff_max = backoff_max
+        self.hedge_percentile = hedge_percentile
+        self.hedge_min_samples = hedge_min_samples
+        self.retries = 0
+        self.hedges = 0
+        self.hedge_wins = 0
+        self.timeouts = 0
+        self._latencies = deque( maxlen=latency_window )
+        self._lock = threading.Lock()
+        self._executor = None
+        if timeout is not None or hedge_percentile is not None:
+            self._executor = ThreadPoolExecutor( max_workers=max_in_flight,
+                                                 thread_name_prefix='s3-read' )
+
+    def __enter__( self ):
+        return self
+
+    def __exit__( self, exc_type, exc_value, traceback ):
+        self.close()
+
+    def close( self ):
+        """
+        Shutting down the worker threads of the policy
+
+        Queued requests are cancelled, requests still running, e.g. hedged
+        duplicates that lost, are waited for, the client timeouts of
+        client_config bound how long that takes.
+        """
+        if self._executor is not None:
+            self._executor.shutdown( wait=True, cancel_futures=True )
+
+    @staticmethod
+    def is_retryable( error: Exception ):
+        """
+        Returning whether a failed read should be retried
+
+        Parameters:
+        error: exception raised by the read
+        """
+        if isinstance( error, ClientError ):
+            return str( error.response.get( 'Error', {} ).get( 'Code' ) ) in RETRYABLE_ERROR_CODES
+        return isinstance( error, ( BotoCoreError, TimeoutError, ConnectionError ) )
+
+    def client_config( self ):
+        """
+        Returning the botocore configuration the reads of the policy need
+
+        botocore makes a single attempt per request, the policy does the retries.
+        With a timeout, the connect and read timeouts of botocore are set to it,
+        so a request the policy gave up on fails on its worker thread instead of
+        keeping the thread until the timeouts of the client.
+
+        returns:
+        config: dictionary of botocore Config arguments overriding S3ClientRegistry.configure
+        """
+        config = { 'retries': { 'total_max_attempts': 1 } }
+        if self.timeout is not None:
+            config['connect_timeout'] = self.timeout
+            config['read_timeout'] = self.timeout
+        return config
+
+    def call( self, fetch ):
+        """
+        Running a read with the retry and hedging policy
+
+        Parameters:
+        fetch: function without arguments performing the read
+
+        returns:
+        result: return value of fetch
+        """
+        for attempt in range( self.max_attempts ):
+            try:
+                return self.__attempt( fetch )
+            except Exception as error:
+                if not self.is_retryable( error ) or attempt == self.max_attempts - 1:
+                    raise
+                backoff = random.uniform( 0, min( self.backoff_max, self.backoff_base * 2 ** attempt ) )
+                self._logger.info( 'Retrying S3 read in %.2fs after %r', backoff, error )
+                with self._lock:
+                    self.retries += 1
+                time.sleep( backoff )
+        return None
+
+    def hedge_delay( self ):
+        """
+        Returning the latency in seconds after which a hedged request is fired
+
+        returns:
+        delay: the hedge_percentile of the recent read latencies, None if hedging
+               is disabled or not enough reads were measured yet
+        """
+        if self.hedge_percentile is None:
+            return None
+        with self._lock:
+            if len( self._latencies ) < self.hedge_min_samples:
+                return None
+            latencies = sorted( self._latencies )
+        index = min( len( latencies ) - 1, int( len( latencies ) * self.hedge_percentile / 100 ) )
+        return latencies[index]
+
+    def __attempt( self, fetch ):
+        """
+        Helper function running one attempt of a read, including its hedged duplicate
+
+        Parameters:
+        fetch: function without arguments performing the read
+        """
+        start = time.monotonic()
+        if self._executor is None:
+            result = fetch()
+            self.__record( time.monotonic() - start )
+            return result
+        hedge_at = self.hedge_delay()
+        deadline = None if self.timeout is None else start + self.timeout
+        pending = { self._executor.submit( fetch ) }
+        primary = next( iter( pending ) )
+        error = None
+        while pending:
+            now = time.monotonic()
+            wake_ups = [ moment for moment in ( deadline,
+                         None if hedge_at is None else start + hedge_at ) if moment is not None ]
+            wait_time = max( 0, min( wake_ups ) - now ) if wake_ups else None
+            done, pending = wait( pending, timeout=wait_time, return_when=FIRST_COMPLETED )
+            for future in done:
+                if future.exception() is None:
+                    for other in pending:
+                        other.cancel()
+                    self.__record( time.monotonic() - start )
+                    if future is not primary:
+                        with self._lock:
+                            self.hedge_wins += 1
+                    return future.result()
+                error = future.exception()
+            now = time.monotonic()
+            if deadline is not None and now >= deadline and pending:
+                with self._lock:
+                    self.timeouts += 1
+                raise TimeoutError( f'S3 read did not finish within {self.timeout}s' )
+            if hedge_at is not None and now >= start + hedge_at and pending:
+                # Firing the hedged duplicate only once per attempt
+                hedge_at = None
+                with self._lock:
+                    self.hedges += 1
+                pending.add( self._executor.submit( fetch ) )
+        raise error
+
+    def __record( self, latency: float ):
+        """
+        Helper function recording the latency of a successful read
+        """
+        with self._lock:
+            self._latencies.append( latency )
@@ -0,0 +1,148 @@
+"""
+Methods for processing the rolling window state of the indicators
+"""
+import pandas as pd
+
+from tradeETL.common.s3 import S3BucketConnector
+from tradeETL.common.constants import WindowStateFormat
+
+class WindowState():
+    """
+    class for working with the rolling window state
+
+    The state has one row per ISIN with the running sums of the window, the
+    number of days and log returns they add up and the last closing price, so
+    its size does not grow with the window length. It is kept as of the last
+    run and as of the run before, so a repeated run whose meta file update did
+    not succeed starts from the sums before it. The closing price, traded
+    volume, turnover and log return of a day are written to a day file next to
+    the state, the file is read again when the day leaves the window.
+    """
+    @staticmethod
+    def read_state( state_key: str, s3_bucket_state: S3BucketConnector ):
+        """
+        Reading the rolling window state
+
+        Parameters:
+        state_key: key of the state file on the S3 bucket
+        s3_bucket_state: S3BucketConnector for the bucket with the state file
+
+        returns:
+        df_state: Pandas DataFrame with the ISIN, the date the sums are as of and
+                  the sum columns of WindowStateFormat, None if no state file exists
+        """
+        return s3_bucket_state.read_parquet_to_df( state_key, missing_ok=True )
+
+    @staticmethod
+    def write_state( df_sums: pd.DataFrame, as_of: str, df_base: pd.DataFrame, base_as_of: str,
+                     state_key: str, s3_bucket_state: S3BucketConnector ):
+        """
+        Writing the sums as of the last day of the run and the sums the run
+        started from to the S3 bucket
+
+        Parameters:
+        df_sums: Pandas DataFrame with the sum columns indexed by ISIN after the run
+        as_of: last date of the run ('YYYY-MM-DD')
+        df_base: Pandas DataFrame with the sum columns indexed by ISIN before the run
+        base_as_of: date the sums before the run are as of, None if the run started
+                    without sums
+        state_key: key of the state file on the S3 bucket
+        s3_bucket_state: S3BucketConnector for the bucket with the state file
+
+        returns:
+        df_state: the new state ordered by date and ISIN
+        """
+        isin_col = WindowStateFormat.STATE_ISIN_COL.value
+        date_col = WindowStateFormat.STATE_DATE_COL.value
+        versions = [ ( df_sums, as_of ) ]
+        if base_as_of is not None:
+            versions.insert( 0, ( df_base, base_as_of ) )
+        df_state = pd.concat( [ df_version.rename_axis( isin_col ).reset_index()
+                                .assign( **{ date_col: version_as_of } )
+                                for df_version, version_as_of in versions ],
+                              ignore_index=True )
+        df_state = df_state[ [ isin_col, date_col ]
+                             + [ column for column in df_state.columns
+                                 if column not in ( isin_col, date_col ) ] ]
+        df_state = df_state.sort_values( by=[ date_col, isin_col ] ).reset_index( drop=True )
+        s3_bucket_state.write_df_to_s3( df_state, state_key,
+                                        WindowStateFormat.STATE_FILE_FORMAT.value )
+        return df_state
+
+    @staticmethod
+    def days_prefix( state_key: str ):
+        """
+        Returning the key prefix of the day files of a state file
+        """
+        return f"{state_key.rsplit( '.', 1 )[0]}/{WindowStateFormat.STATE_DAYS_PREFIX.value}"
+
+    @staticmethod
+    def list_days( state_key: str, s3_bucket_state: S3BucketConnector ):
+        """
+        Listing the dates of the day files of a state file
+
+        Parameters:
+        state_key: key of the state file on the S3 bucket
+        s3_bucket_state: S3BucketConnector for the bucket with the state file
+
+        returns:
+        dates: sorted list of the dates ('YYYY-MM-DD') with a day file
+        """
+        prefix = WindowState.days_prefix( state_key )
+        return sorted( key[ len( prefix ): ].split( '.', 1 )[0]
+                       for key in s3_bucket_state.list_files_in_prefix( prefix ) )
+
+    @staticmethod
+    def read_day( state_key: str, date: str, s3_bucket_state: S3BucketConnector ):
+        """
+        Reading the day file of a date
+
+        Parameters:
+        state_key: key of the state file on the S3 bucket
+        date: date of the day file ('YYYY-MM-DD')
+        s3_bucket_state: S3BucketConnector for the bucket with the state file
+
+        returns:
+        df_day: Pandas DataFrame with the ISIN, date, closing price, volume,
+                turnover and log return columns of WindowStateFormat
+        """
+        return s3_bucket_state.read_parquet_to_df(
+            f'{WindowState.days_prefix( state_key )}{date}.parquet' )
+
+    @staticmethod
+    def write_days( days: dict, state_key: str, s3_bucket_state: S3BucketConnector ):
+        """
+        Writing the day files of a run
+
+        Parameters:
+        days: dictionary of the dates of the run and their Pandas DataFrames
+              with the columns of read_day
+        state_key: key of the state file on the S3 bucket
+        s3_bucket_state: S3BucketConnector for the bucket with the state file
+        """
+        prefix = WindowState.days_prefix( state_key )
+        for date, df_day in days.items():
+            s3_bucket_state.write_df_to_s3( df_day, f'{prefix}{date}.parquet',
+                                            WindowStateFormat.STATE_FILE_FORMAT.value )
+        return True
+
+    @staticmethod
+    def remove_days( keep_dates: list, state_key: str, s3_bucket_state: S3BucketConnector ):
+        """
+        Removing the day files that are not kept
+
+        Parameters:
+        keep_dates: dates of the day files that are kept, the dates of the
+                    window before the last run and of the last run
+        state_key: key of the state file on the S3 bucket
+        s3_bucket_state: S3BucketConnector for the bucket with the state file
+
+        returns:
+        removed: list of the removed dates
+        """
+        prefix = WindowState.days_prefix( state_key )
+        keep_dates = set( keep_dates )
+        removed = [ date for date in WindowState.list_days( state_key, s3_bucket_state )
+                    if date not in keep_dates ]
+        s3_bucket_state.delete_files( [ f'{prefix}{date}.parquet' for date in removed ] )
+        return removed
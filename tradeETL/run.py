@@ -1,12 +1,19 @@
 """Running the trade ETL application"""
 import argparse
+import asyncio
 import logging
 import logging.config
 
 import yaml
 
+from tradeETL.common.cache import S3DiskCache
 from tradeETL.common.s3 import S3BucketConnector
+from tradeETL.common.s3_clients import S3ClientRegistry
+from tradeETL.common.s3_read_policy import S3ReadPolicy
+from tradeETL.transformers.compaction import ReportCompaction
 from tradeETL.transformers.etl_transformer import TradeETL, etlSourceConfig, etlTargetConfig
+from tradeETL.transformers.report_engine import ReportEngine, etlReportConfig
+from tradeETL.transformers.window_engine import WindowEngine, etlWindowConfig
 
 def main():
     """
@@ -15,6 +22,8 @@ def main():
     # Parsing YML file
     parser = argparse.ArgumentParser(description='Run the trade ETL Job.')
     parser.add_argument('config', help='A configuration file in YAML format.')
+    parser.add_argument('--compact', action='store_true',
+                        help='Compact the target files of report 1 instead of running the job.')
     args = parser.parse_args()
 
 #    config = 'C:/Daten/xetra_project_old/xetra_1234/configs/xetra_report1_config.yaml'
@@ -26,28 +35,74 @@ def main():
     logging.config.dictConfig(log_config)
     # reading s3 configuration
     s3_config = config['s3']
+    # configuring the S3 clients shared by all connectors
+    S3ClientRegistry.configure(**s3_config.get('client', {}))
+    # creating the optional local cache for the source files
+    src_cache = None
+    if s3_config.get('src_cache_dir'):
+        src_cache = S3DiskCache(cache_dir=s3_config['src_cache_dir'],
+                                max_bytes=s3_config['src_cache_max_bytes'])
+    # creating the optional retry and hedging policy for reading the source files
+    src_read_policy = None
+    if s3_config.get('src_read_policy'):
+        src_read_policy = S3ReadPolicy(**s3_config['src_read_policy'])
     # creating the S3BucketConnector classes for source and target
     s3_bucket_src = S3BucketConnector(access_key=s3_config['access_key'],
                                       secret_key=s3_config['secret_key'],
                                       endpoint_url=s3_config['src_endpoint_url'],
-                                      bucket=s3_config['src_bucket'])
+                                      bucket=s3_config['src_bucket'],
+                                      cache=src_cache,
+                                      read_policy=src_read_policy)
     s3_bucket_trg = S3BucketConnector(access_key=s3_config['access_key'],
                                       secret_key=s3_config['secret_key'],
                                       endpoint_url=s3_config['trg_endpoint_url'],
-                                      bucket=s3_config['trg_bucket'])
+                                      bucket=s3_config['trg_bucket'],
+                                      multipart_part_size=s3_config.get('trg_multipart_part_size'),
+                                      multipart_max_workers=s3_config.get('trg_multipart_max_workers', 4))
     # reading source configuration
     source_config = etlSourceConfig(**config['source'])
     # reading target configuration
     target_config = etlTargetConfig(**config['target'])
-    # reading meta file configuration
-    meta_config = config['meta']
-    # creating TradeETL class
     logger = logging.getLogger(__name__)
-    logger.info('trade ETL job started.')
-    xetra_etl = TradeETL(s3_bucket_src, s3_bucket_trg,
-                         meta_config['meta_key'], source_config, target_config)
-    # running etl job for xetra report 1
-    xetra_etl.etl_report1()
+    try:
+        if args.compact:
+            # merging the target files that runs and re-runs accumulated
+            ReportCompaction(s3_bucket_trg, source_config, target_config).compact()
+            return
+        # reading meta file configuration
+        meta_config = config['meta']
+        # creating TradeETL class
+        logger.info('trade ETL job started.')
+        xetra_etl = TradeETL(s3_bucket_src, s3_bucket_trg,
+                             meta_config['meta_key'], source_config, target_config)
+        # reading the optional declarative reports
+        report_configs = [etlReportConfig(**report) for report in config.get('reports') or []]
+        # creating the optional rolling window indicators
+        window_engine = None
+        if config.get('windows'):
+            window_engine = WindowEngine(xetra_etl, etlWindowConfig(**config['windows']))
+        if report_configs or window_engine is not None:
+            if source_config.src_async:
+                logger.info('src_async is not used with reports or windows.')
+            # running etl job for xetra report 1, the declarative reports
+            # and the window indicators on one extraction
+            ReportEngine(xetra_etl, report_configs, window_engine).etl_reports()
+        elif source_config.src_async:
+            # running etl job for xetra report 1 with the extraction on an asyncio event loop
+            asyncio.run(xetra_etl.etl_report1_async())
+        else:
+            # running etl job for xetra report 1
+            xetra_etl.etl_report1()
+        if src_cache is not None:
+            logger.info('Source cache hits: %s, misses: %s', src_cache.hits, src_cache.misses)
+        if src_read_policy is not None:
+            logger.info('Source read retries: %s, hedges: %s, hedge wins: %s, timeouts: %s',
+                        src_read_policy.retries, src_read_policy.hedges,
+                        src_read_policy.hedge_wins, src_read_policy.timeouts)
+    finally:
+        # shutting down the worker threads of the read policy
+        if src_read_policy is not None:
+            src_read_policy.close()
     logger.info('trade ETL job finished.')
 
 
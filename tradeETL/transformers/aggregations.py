@@ -0,0 +1,355 @@
+"""
+Aggregation kernels for the trade reports
+"""
+import numpy as np
+import pandas as pd
+
+# Columns of the partial aggregates with the time of the first and last trade
+FIRST_TIME = 'first_time'
+LAST_TIME = 'last_time'
+
+def time_column(src_args):
+    """
+    Returns the column the trades are ordered by, the integer
+    time key if src_col_time_key is set, otherwise the time column
+    """
+    return src_args.src_col_time_key or src_args.src_col_time
+
+def source_columns(src_args):
+    """
+    Returns the source columns of the aggregation including the time key
+    """
+    if src_args.src_col_time_key:
+        return list(src_args.src_columns) + [src_args.src_col_time_key]
+    return list(src_args.src_columns)
+
+def time_ordered(data_frame: pd.DataFrame, src_args):
+    """
+    Checks in one pass over the rows that the trades are ordered by date and time
+
+    Parameters:
+      data_frame: Pandas DataFrame with the source columns
+      src_args: etlSourceConfig with the date, time and time key column names
+
+    Returns:
+      ordered: True if no trade is earlier than the trade before it
+    """
+    if src_args.src_col_time_key:
+        return data_frame[src_args.src_col_time_key].is_monotonic_increasing
+    dates = np.asarray(data_frame[src_args.src_col_date].to_numpy())
+    times = np.asarray(data_frame[src_args.src_col_time].to_numpy())
+    later_date = dates[1:] > dates[:-1]
+    later_time = (dates[1:] == dates[:-1]) & (times[1:] >= times[:-1])
+    return bool(np.all(later_date | later_time))
+
+def date_seconds(dates):
+    """
+    Converts dates to seconds since the epoch
+
+    Parameters:
+      dates: array-like of 'YYYY-MM-DD' strings or datetime64 values
+
+    Returns:
+      seconds: numpy int64 array
+    """
+    return pd.to_datetime(np.asarray(dates)).to_numpy('datetime64[s]').astype(np.int64)
+
+def time_seconds(times):
+    """
+    Converts times of the day to seconds since midnight
+
+    Parameters:
+      times: array-like of 'HH:MM' or 'HH:MM:SS' strings
+
+    Returns:
+      seconds: numpy int64 array
+    """
+    parts = pd.Series(np.asarray(times, dtype=object), dtype=object)\
+        .str.split(':', expand=True).fillna(0).astype(np.int64).to_numpy()
+    return parts @ np.array([3600, 60, 1][:parts.shape[1]], dtype=np.int64) \
+        if len(parts) else np.zeros(0, dtype=np.int64)
+
+def add_time_key(data_frame: pd.DataFrame, src_args):
+    """
+    Adds the date and time of every trade as int64 seconds since the epoch
+
+    A source file has only one date and at most one time per minute, so only
+    the distinct values are parsed and the rows take the parsed values by
+    their factorized codes. Rows without date or time get -1, they are removed
+    with the missing values before aggregating.
+
+    Parameters:
+      data_frame: Pandas DataFrame with the source columns
+      src_args: etlSourceConfig with the date, time and time key column names
+
+    Returns:
+      data_frame: the Pandas DataFrame with the src_col_time_key column
+    """
+    key = np.zeros(len(data_frame), dtype=np.int64)
+    missing = np.zeros(len(data_frame), dtype=bool)
+    for column, parse in ((src_args.src_col_date, date_seconds),
+                          (src_args.src_col_time, time_seconds)):
+        codes, uniques = pd.factorize(data_frame[column])
+        key += parse(uniques)[codes] if len(uniques) else 0
+        missing |= codes < 0
+    key[missing] = -1
+    # Adding the column to a shallow copy, the source columns are not copied
+    data_frame = data_frame.copy(deep=False)
+    data_frame[src_args.src_col_time_key] = key
+    return data_frame
+
+def aggregate_ohlcv_pandas(data_frame: pd.DataFrame, src_args, trg_args):
+    """
+    Aggregates the trades to opening, closing, minimum and maximum price
+    and traded volume per ISIN and day with pandas
+
+    The rows are ordered by time once and all five aggregates are computed
+    in a single groupby pass, no per-row opening or closing price columns
+    are created. With src_presorted the rows are not sorted if they are
+    already ordered by date and time.
+
+    Parameters:
+      data_frame: Pandas DataFrame with the source columns, without missing values
+      src_args: etlSourceConfig with the source column names
+      trg_args: etlTargetConfig with the target column names
+
+    Returns:
+      data_frame: Pandas DataFrame with one row per ISIN and day, in the group
+                  order of a groupby on the unsorted input
+    """
+    return aggregate_in_time_order(data_frame, [src_args.src_col_isin, src_args.src_col_date],
+                                   time_column(src_args), {
+        trg_args.trg_col_op_price: (src_args.src_col_start_price, 'first'),
+        trg_args.trg_col_clos_price: (src_args.src_col_start_price, 'last'),
+        trg_args.trg_col_min_price: (src_args.src_col_min_price, 'min'),
+        trg_args.trg_col_max_price: (src_args.src_col_max_price, 'max'),
+        trg_args.trg_col_dail_trad_vol: (src_args.src_col_traded_vol, 'sum')},
+        ordered=src_args.src_presorted and time_ordered(data_frame, src_args))
+
+def partial_ohlcv(data_frame: pd.DataFrame, src_args, trg_args):
+    """
+    Reduces the trades of one source file to a partial aggregate per ISIN and day
+
+    Besides minimum and maximum price and traded volume the partial keeps the
+    time of the first and last trade with their start price, so the partials
+    of all files can be merged with merge_ohlcv_partials in any grouping.
+    Rows with missing values in the source columns are removed like in
+    TradeETL.transform_report1.
+
+    Parameters:
+      data_frame: Pandas DataFrame with the data of one source file
+      src_args: etlSourceConfig with the source column names
+      trg_args: etlTargetConfig with the target column names
+
+    Returns:
+      data_frame: Pandas DataFrame with the ISIN, date, FIRST_TIME, opening price,
+                  LAST_TIME, closing price, minimum and maximum price and volume columns
+    """
+    if list(data_frame.columns) != source_columns(src_args):
+        data_frame = data_frame.loc[:, source_columns(src_args)]
+    data_frame = data_frame.dropna()
+    return aggregate_in_time_order(data_frame, [src_args.src_col_isin, src_args.src_col_date],
+                                   time_column(src_args), {
+        FIRST_TIME: (time_column(src_args), 'first'),
+        trg_args.trg_col_op_price: (src_args.src_col_start_price, 'first'),
+        LAST_TIME: (time_column(src_args), 'last'),
+        trg_args.trg_col_clos_price: (src_args.src_col_start_price, 'last'),
+        trg_args.trg_col_min_price: (src_args.src_col_min_price, 'min'),
+        trg_args.trg_col_max_price: (src_args.src_col_max_price, 'max'),
+        trg_args.trg_col_dail_trad_vol: (src_args.src_col_traded_vol, 'sum')},
+        ordered=src_args.src_presorted and time_ordered(data_frame, src_args))
+
+def merge_ohlcv_partials(data_frame: pd.DataFrame, src_args, trg_args):
+    """
+    Merges the concatenated partial aggregates of the source files
+
+    The opening price is the one with the earliest first trade and the closing
+    price the one with the latest last trade, ties are resolved by the order of
+    the partials. The result equals aggregate_ohlcv_pandas on the concatenated
+    source files.
+
+    Parameters:
+      data_frame: Pandas DataFrame with the partials of partial_ohlcv in source file order
+      src_args: etlSourceConfig with the source column names
+      trg_args: etlTargetConfig with the target column names
+
+    Returns:
+      data_frame: Pandas DataFrame with one row per ISIN and day
+    """
+    keys = [src_args.src_col_isin, src_args.src_col_date]
+    merged = aggregate_in_time_order(data_frame, keys, FIRST_TIME, {
+        trg_args.trg_col_op_price: (trg_args.trg_col_op_price, 'first'),
+        trg_args.trg_col_min_price: (trg_args.trg_col_min_price, 'min'),
+        trg_args.trg_col_max_price: (trg_args.trg_col_max_price, 'max'),
+        trg_args.trg_col_dail_trad_vol: (trg_args.trg_col_dail_trad_vol, 'sum')})
+    # Both aggregations return the groups in the same order
+    closing = aggregate_in_time_order(data_frame, keys, LAST_TIME, {
+        trg_args.trg_col_clos_price: (trg_args.trg_col_clos_price, 'last')})
+    merged.insert(3, trg_args.trg_col_clos_price, closing[trg_args.trg_col_clos_price].to_numpy())
+    return merged
+
+def aggregate_in_time_order(data_frame: pd.DataFrame, keys: list, time_column: str,
+                            aggregations: dict, ordered: bool = False):
+    """
+    Groups the rows ordered by time and applies named aggregations
+
+    The rows are ordered by time once with a stable sort, so 'first' and
+    'last' return the earliest and latest row and ties keep the input order.
+
+    Parameters:
+      data_frame: Pandas DataFrame that should be aggregated
+      keys: list of the group key columns
+      time_column: column the rows are ordered by
+      aggregations: named aggregations of DataFrameGroupBy.agg
+      ordered: the rows are already ordered by time and are not sorted
+
+    Returns:
+      data_frame: Pandas DataFrame with one row per group, in the group
+                  order of a groupby on the unsorted input
+    """
+    # pandas orders category keys by their first appearance in the input and not
+    # by value, keeping that order of the unsorted input for the output rows
+    appearance = {key: first_appearance_rank(data_frame[key]) for key in keys
+                  if isinstance(data_frame[key].dtype, pd.CategoricalDtype)}
+    if not ordered:
+        data_frame = data_frame.sort_values(by=[time_column], kind='stable')
+    return aggregate_sorted(data_frame, keys, aggregations, appearance)
+
+def aggregate_sorted(data_frame: pd.DataFrame, keys: list, aggregations: dict,
+                     appearance: dict):
+    """
+    Groups rows that are already ordered by time and applies named aggregations
+
+    Parameters:
+      data_frame: Pandas DataFrame ordered by time with a stable sort
+      keys: list of the group key columns
+      aggregations: named aggregations of DataFrameGroupBy.agg
+      appearance: mapping of the category keys to their first_appearance_rank
+                  in the unsorted input
+
+    Returns:
+      data_frame: Pandas DataFrame with one row per group, in the group
+                  order of a groupby on the unsorted input
+    """
+    data_frame = data_frame.groupby(keys, as_index=False, observed=True).agg(**aggregations)
+    appearance = {key: rank for key, rank in appearance.items() if key in keys}
+    if appearance:
+        data_frame = order_groups(data_frame, keys, appearance)
+    return data_frame
+
+def order_groups(data_frame: pd.DataFrame, keys: list, appearance: dict):
+    """
+    Orders aggregated rows like a groupby on the unsorted input returns them
+
+    Parameters:
+      data_frame: Pandas DataFrame with one row per group
+      keys: list of the group key columns
+      appearance: mapping of the category keys to their first_appearance_rank
+                  in the unsorted input, the other keys are ordered by value
+
+    Returns:
+      data_frame: the ordered Pandas DataFrame with a new index
+    """
+    order = pd.DataFrame({
+        key: appearance[key][data_frame[key].cat.codes] if key in appearance
+        else data_frame[key].to_numpy() for key in keys}).sort_values(by=keys, kind='stable').index
+    return data_frame.iloc[order].reset_index(drop=True)
+
+def first_appearance_rank(category: pd.Series):
+    """
+    Ranks the categories of a category column by their first appearance
+
+    Parameters:
+      category: Pandas Series with category dtype
+
+    Returns:
+      rank: numpy array with the rank of every category code
+    """
+    codes = category.cat.codes.to_numpy()
+    rank = np.zeros(len(category.cat.categories), dtype=np.int64)
+    appeared = pd.unique(codes[codes >= 0])
+    rank[appeared] = np.arange(len(appeared))
+    return rank
+
+def aggregate_ohlcv_numpy(data_frame: pd.DataFrame, src_args, trg_args):
+    """
+    Aggregates the trades to opening, closing, minimum and maximum price
+    and traded volume per ISIN and day with NumPy segmented reductions
+
+    ISIN, date and time are factorized into integer codes, the integer time key
+    of src_col_time_key is used as it is, and the rows are ordered
+    with one np.lexsort on (ISIN code, date code, time). With src_presorted and
+    rows already ordered by date and time, a stable argsort of the combined ISIN
+    and date code keeps the time order without sorting by time, a radix sort
+    with less than 65536 groups. Every ISIN and day is
+    then a contiguous segment whose aggregates are computed with
+    np.ufunc.reduceat on the segment boundaries, without the pandas groupby
+    machinery. The result equals aggregate_ohlcv_pandas.
+
+    Parameters:
+      data_frame: Pandas DataFrame with the source columns, without missing values
+      src_args: etlSourceConfig with the source column names
+      trg_args: etlTargetConfig with the target column names
+
+    Returns:
+      data_frame: Pandas DataFrame with one row per ISIN and day, in the group
+                  order of a groupby on the unsorted input
+    """
+    isin_codes, isins = factorize_key(data_frame[src_args.src_col_isin])
+    date_codes, dates = factorize_key(data_frame[src_args.src_col_date])
+    if src_args.src_presorted and time_ordered(data_frame, src_args):
+        group_codes = isin_codes.astype(np.int64) * max(len(dates), 1) + date_codes
+        if len(group_codes) and group_codes.max() < 2 ** 16:
+            # The stable sort of NumPy is a radix sort for 16 bit integers
+            group_codes = group_codes.astype(np.uint16)
+        order = np.argsort(group_codes, kind='stable')
+    else:
+        time_codes = data_frame[time_column(src_args)]
+        if pd.api.types.is_integer_dtype(time_codes.dtype):
+            # The time key is already ordered like the time
+            time_codes = time_codes.to_numpy()
+        else:
+            time_codes, _ = pd.factorize(time_codes, sort=True)
+        # np.lexsort is stable and sorts by the last key first
+        order = np.lexsort((time_codes, date_codes, isin_codes))
+    isin_codes = isin_codes[order]
+    date_codes = date_codes[order]
+    if len(order) == 0:
+        starts = np.zeros(0, dtype=np.intp)
+    else:
+        boundary = np.empty(len(order), dtype=bool)
+        boundary[0] = True
+        np.not_equal(isin_codes[1:], isin_codes[:-1], out=boundary[1:])
+        boundary[1:] |= date_codes[1:] != date_codes[:-1]
+        starts = np.flatnonzero(boundary)
+    ends = np.append(starts[1:], len(order)) - 1
+    start_price = data_frame[src_args.src_col_start_price].to_numpy()[order]
+    columns = {
+        src_args.src_col_isin: isins.take(isin_codes[starts]),
+        src_args.src_col_date: dates.take(date_codes[starts]),
+        trg_args.trg_col_op_price: start_price[starts],
+        trg_args.trg_col_clos_price: start_price[ends]}
+    for column, src_column, ufunc in (
+            (trg_args.trg_col_min_price, src_args.src_col_min_price, np.minimum),
+            (trg_args.trg_col_max_price, src_args.src_col_max_price, np.maximum),
+            (trg_args.trg_col_dail_trad_vol, src_args.src_col_traded_vol, np.add)):
+        values = data_frame[src_column].to_numpy()[order]
+        columns[column] = ufunc.reduceat(values, starts) if len(starts) else values[:0]
+    return pd.DataFrame(columns)
+
+def factorize_key(key: pd.Series):
+    """
+    Factorizes a group key into integer codes in the group order of pandas
+
+    Category keys are numbered by their first appearance, other keys by value.
+
+    Parameters:
+      key: Pandas Series with the group key
+
+    Returns:
+      codes: numpy array with the code of every row
+      uniques: values of the codes, supporting take
+    """
+    if isinstance(key.dtype, pd.CategoricalDtype):
+        return pd.factorize(key, sort=False)
+    return pd.factorize(key, sort=True)
@@ -0,0 +1,514 @@
+"""
+Compute backends running the transformation steps of the trade reports
+"""
+from abc import ABC, abstractmethod
+
+import pandas as pd
+import pyarrow as pa
+import pyarrow.compute as pc
+from pandas.api.types import union_categoricals
+
+from tradeETL.common.constants import AggBackends
+from tradeETL.common.csv_engines import arrow_type
+from tradeETL.transformers.aggregations import aggregate_ohlcv_pandas, aggregate_ohlcv_numpy,\
+    partial_ohlcv, merge_ohlcv_partials, add_time_key, date_seconds, time_seconds,\
+    time_column, source_columns, FIRST_TIME, LAST_TIME
+
+# Aggregation kernels of the pandas backend by their AggBackends value
+AGG_BACKENDS = {
+    AggBackends.PANDAS.value: aggregate_ohlcv_pandas,
+    AggBackends.NUMPY.value: aggregate_ohlcv_numpy
+}
+
+# Prefix of the helper columns holding the sort rank of a dictionary column
+RANK_PREFIX = '__rank_'
+# Helper column numbering the groups of an aggregation
+SEGMENT = '__segment'
+
+class ComputeBackend(ABC):
+    """
+    Interface of the backends running the transformation steps of report 1
+
+    A backend works on its own data type from reading the source files to
+    writing the target file, e.g. a Pandas DataFrame or a pyarrow Table.
+    """
+
+    @abstractmethod
+    def read_csv(self, s3_bucket, key: str, read_args: dict):
+        """
+        Reads a source file, an AsyncS3BucketConnector returns a coroutine
+
+        Parameters:
+          s3_bucket: S3BucketConnector or AsyncS3BucketConnector of the source bucket
+          key: key of the source file
+          read_args: keyword arguments of S3BucketConnector.read_csv_to_df
+        """
+
+    @abstractmethod
+    def empty(self):
+        """
+        Returns the data of an extraction without source files
+        """
+
+    @abstractmethod
+    def is_empty(self, data):
+        """
+        Returns whether the data has no rows
+        """
+
+    @abstractmethod
+    def concat(self, frames: list, schema: dict = None):
+        """
+        Concatenates the data of the source files in source file order
+
+        Parameters:
+          frames: list with the data of the source files
+          schema: optional source schema of etlSourceConfig
+        """
+
+    @abstractmethod
+    def project(self, data, columns: list):
+        """
+        Returns the columns of the data in the given order
+        """
+
+    @abstractmethod
+    def add_time_key(self, data, src_args):
+        """
+        Adds the src_col_time_key column with the date and time
+        of every trade as int64 seconds since the epoch
+
+        Parameters:
+          data: data with the date and time columns of the source files
+          src_args: etlSourceConfig with the date, time and time key column names
+        """
+
+    @abstractmethod
+    def has_column(self, data, column: str):
+        """
+        Returns whether the data has the column
+        """
+
+    @abstractmethod
+    def dropna(self, data):
+        """
+        Removes the rows with missing values
+        """
+
+    @abstractmethod
+    def aggregate(self, data, src_args, trg_args):
+        """
+        Aggregates the trades to opening, closing, minimum and maximum
+        price and traded volume per ISIN and day
+
+        Parameters:
+          data: data with the source columns, without missing values
+          src_args: etlSourceConfig with the source column names
+          trg_args: etlTargetConfig with the target column names
+        """
+
+    @abstractmethod
+    def partial(self, data, src_args, trg_args):
+        """
+        Reduces the data of one source file to a partial aggregate per ISIN and day
+        """
+
+    @abstractmethod
+    def merge_partials(self, data, src_args, trg_args):
+        """
+        Merges the concatenated partial aggregates like aggregate on the source files
+        """
+
+    @abstractmethod
+    def change_prev_close(self, data, src_args, trg_args, df_seed: pd.DataFrame = None):
+        """
+        Adds the change of the opening price to the previous trading day of the ISIN in %
+
+        Parameters:
+          data: data with one row per ISIN and day
+          src_args: etlSourceConfig with the source column names
+          trg_args: etlTargetConfig with the target column names
+          df_seed: optional Pandas DataFrame with the ISIN, date and opening price
+                   columns of trading days before the data
+        """
+
+    @abstractmethod
+    def round(self, data, decimals: int):
+        """
+        Rounds the float columns to decimals
+        """
+
+    @abstractmethod
+    def filter_from_date(self, data, date_column: str, first_date: str):
+        """
+        Returns the rows from first_date ('YYYY-MM-DD') on
+        """
+
+    @abstractmethod
+    def to_pandas(self, data, columns: list):
+        """
+        Returns columns of the data as Pandas DataFrame, e.g. for small state files
+        """
+
+    @abstractmethod
+    def to_arrow(self, data):
+        """
+        Returns the data as pyarrow Table, e.g. for writing partitioned parquet files
+        """
+
+    @abstractmethod
+    def write(self, s3_bucket, data, key: str, file_format: str, compression: str = None,
+              parquet_options: dict = None):
+        """
+        Writes the data to the target bucket
+
+        Parameters:
+          s3_bucket: S3BucketConnector of the target bucket
+          data: data that should be written
+          key: target key of the file
+          file_format: 'csv' or 'parquet'
+          compression: optional compression codec of csv files
+          parquet_options: optional keyword arguments of the parquet writer
+        """
+
+
+class PandasBackend(ComputeBackend):
+    """
+    Backend working on Pandas DataFrames, aggregating with the
+    trg_agg_backend kernel of the target configuration
+    """
+
+    def read_csv(self, s3_bucket, key: str, read_args: dict):
+        return s3_bucket.read_csv_to_df(key, **read_args)
+
+    def empty(self):
+        return pd.DataFrame()
+
+    def is_empty(self, data):
+        return data.empty
+
+    def concat(self, frames: list, schema: dict = None):
+        # Categorical columns get the union of the categories of all files first,
+        # otherwise pandas falls back to object columns. Partial aggregates only
+        # keep some of the source columns.
+        for column, dtype in (schema or {}).items():
+            if dtype == 'category' and len(frames) > 1 and column in frames[0]:
+                categories = union_categoricals([frame[column] for frame in frames]).categories
+                for frame in frames:
+                    frame[column] = frame[column].cat.set_categories(categories)
+        return pd.concat(frames, ignore_index=True)
+
+    def project(self, data, columns: list):
+        # Already done while parsing if the source schema has the same columns
+        if list(data.columns) != list(columns):
+            data = data.loc[:, columns]
+        return data
+
+    def add_time_key(self, data, src_args):
+        return add_time_key(data, src_args)
+
+    def has_column(self, data, column: str):
+        return column in data.columns
+
+    def dropna(self, data):
+        return data.dropna()
+
+    def aggregate(self, data, src_args, trg_args):
+        return AGG_BACKENDS[trg_args.trg_agg_backend](data, src_args, trg_args)
+
+    def partial(self, data, src_args, trg_args):
+        return partial_ohlcv(data, src_args, trg_args)
+
+    def merge_partials(self, data, src_args, trg_args):
+        return merge_ohlcv_partials(data, src_args, trg_args)
+
+    def change_prev_close(self, data, src_args, trg_args, df_seed: pd.DataFrame = None):
+        df_prices = data[[
+            src_args.src_col_isin,
+            src_args.src_col_date,
+            trg_args.trg_col_op_price]]
+        if df_seed is not None:
+            # Seeding the shift with the previous trading days, the seed rows get
+            # negative index labels and are dropped by the assignment below
+            df_prices = pd.concat([df_seed.set_axis(pd.RangeIndex(-len(df_seed), 0), axis=0),
+                                   df_prices])
+        data[trg_args.trg_col_ch_prev_clos] = df_prices\
+            .sort_values(by=[src_args.src_col_date])\
+                .groupby([src_args.src_col_isin], observed=True)[trg_args.trg_col_op_price]\
+                    .shift(1)
+        data[trg_args.trg_col_ch_prev_clos] = (
+            data[trg_args.trg_col_op_price] \
+            - data[trg_args.trg_col_ch_prev_clos]
+            ) / data[trg_args.trg_col_ch_prev_clos ] * 100
+        return data
+
+    def round(self, data, decimals: int):
+        return data.round(decimals=decimals)
+
+    def filter_from_date(self, data, date_column: str, first_date: str):
+        return data[data[date_column] >= first_date].reset_index(drop=True)
+
+    def to_pandas(self, data, columns: list):
+        return data[columns]
+
+    def to_arrow(self, data):
+        return pa.Table.from_pandas(data, preserve_index=False)
+
+    def write(self, s3_bucket, data, key: str, file_format: str, compression: str = None,
+              parquet_options: dict = None):
+        return s3_bucket.write_df_to_s3(data, key, file_format, compression=compression,
+                                        parquet_options=parquet_options)
+
+
+class ArrowBackend(ComputeBackend):
+    """
+    Backend working on pyarrow Tables with Arrow compute functions
+
+    The source files are parsed by the Arrow csv reader and the target file is
+    written from the Table, the data is never converted to pandas. Groups are
+    contiguous segments after one sort by ISIN, date and time: the first and
+    last price are taken at the segment boundaries and minimum, maximum and
+    sum are aggregated per segment number. Dictionary columns are ordered by
+    their first appearance like pandas orders category columns.
+    """
+
+    def read_csv(self, s3_bucket, key: str, read_args: dict):
+        read_args = {name: value for name, value in read_args.items() if name != 'engine'}
+        return s3_bucket.read_csv_to_table(key, **read_args)
+
+    def empty(self):
+        return pa.table({})
+
+    def is_empty(self, data):
+        return data.num_rows == 0
+
+    def concat(self, frames: list, schema: dict = None):
+        # Like the pandas backend, dictionary columns get one dictionary of the
+        # values of all files. Partial aggregates only keep some of the source columns.
+        for column, dtype in (schema or {}).items():
+            if len(frames) > 1 and column in frames[0].column_names:
+                field = pa.field(column, arrow_type(dtype))
+                frames = [frame.set_column(frame.schema.get_field_index(column), field,
+                                           frame[column].cast(field.type))
+                          for frame in frames]
+        data = pa.concat_tables(frames)
+        if schema and 'category' in schema.values():
+            data = data.unify_dictionaries()
+        return data
+
+    def project(self, data, columns: list):
+        if data.column_names != list(columns):
+            data = data.select(columns)
+        return data
+
+    def add_time_key(self, data, src_args):
+        # Parsing the distinct dates and times only, like the pandas backend
+        key = None
+        for column, parse in ((src_args.src_col_date, date_seconds),
+                              (src_args.src_col_time, time_seconds)):
+            encoded = pc.dictionary_encode(self.decode(data[column]))
+            seconds = pa.array(parse(encoded.dictionary.to_numpy(zero_copy_only=False)),
+                               pa.int64())
+            seconds = seconds.take(encoded.indices)
+            key = seconds if key is None else pc.add(key, seconds)
+        return data.append_column(src_args.src_col_time_key, key)
+
+    def has_column(self, data, column: str):
+        return column in data.column_names
+
+    def dropna(self, data):
+        return data.drop_null()
+
+    def aggregate(self, data, src_args, trg_args):
+        return self.aggregate_in_time_order(data, [src_args.src_col_isin, src_args.src_col_date],
+                                            time_column(src_args), {
+            trg_args.trg_col_op_price: (src_args.src_col_start_price, 'first'),
+            trg_args.trg_col_clos_price: (src_args.src_col_start_price, 'last'),
+            trg_args.trg_col_min_price: (src_args.src_col_min_price, 'min'),
+            trg_args.trg_col_max_price: (src_args.src_col_max_price, 'max'),
+            trg_args.trg_col_dail_trad_vol: (src_args.src_col_traded_vol, 'sum')},
+            ordered=src_args.src_presorted and self.time_ordered(data, src_args))
+
+    def partial(self, data, src_args, trg_args):
+        data = self.dropna(self.project(data, source_columns(src_args)))
+        return self.aggregate_in_time_order(data, [src_args.src_col_isin, src_args.src_col_date],
+                                            time_column(src_args), {
+            FIRST_TIME: (time_column(src_args), 'first'),
+            trg_args.trg_col_op_price: (src_args.src_col_start_price, 'first'),
+            LAST_TIME: (time_column(src_args), 'last'),
+            trg_args.trg_col_clos_price: (src_args.src_col_start_price, 'last'),
+            trg_args.trg_col_min_price: (src_args.src_col_min_price, 'min'),
+            trg_args.trg_col_max_price: (src_args.src_col_max_price, 'max'),
+            trg_args.trg_col_dail_trad_vol: (src_args.src_col_traded_vol, 'sum')},
+            ordered=src_args.src_presorted and self.time_ordered(data, src_args))
+
+    def merge_partials(self, data, src_args, trg_args):
+        keys = [src_args.src_col_isin, src_args.src_col_date]
+        merged = self.aggregate_in_time_order(data, keys, FIRST_TIME, {
+            trg_args.trg_col_op_price: (trg_args.trg_col_op_price, 'first'),
+            trg_args.trg_col_min_price: (trg_args.trg_col_min_price, 'min'),
+            trg_args.trg_col_max_price: (trg_args.trg_col_max_price, 'max'),
+            trg_args.trg_col_dail_trad_vol: (trg_args.trg_col_dail_trad_vol, 'sum')})
+        # Both aggregations return the groups in the same order
+        closing = self.aggregate_in_time_order(data, keys, LAST_TIME, {
+            trg_args.trg_col_clos_price: (trg_args.trg_col_clos_price, 'last')})
+        return merged.add_column(3, trg_args.trg_col_clos_price,
+                                 closing[trg_args.trg_col_clos_price])
+
+    def change_prev_close(self, data, src_args, trg_args, df_seed: pd.DataFrame = None):
+        if data.num_rows == 0:
+            return data.append_column(trg_args.trg_col_ch_prev_clos, pa.array([], pa.float64()))
+        # Ordering by ISIN and date, the previous trading day of an ISIN is the previous row
+        order = self.sort_indices(data, [src_args.src_col_isin, src_args.src_col_date])
+        isins = self.decode(data[src_args.src_col_isin]).take(order)
+        op_price = data[trg_args.trg_col_op_price].take(order).combine_chunks()
+        n_rows = len(order)
+        first_of_isin = pa.concat_arrays([
+            pa.array([True]), pc.not_equal(isins.slice(1), isins.slice(0, n_rows - 1))])
+        if df_seed is not None and len(df_seed):
+            # Looking up the seed price of the first trading day of every ISIN
+            seed_price = pc.take(pa.array(df_seed[trg_args.trg_col_op_price], pa.float64()),
+                                 pc.index_in(isins, value_set=pa.array(
+                                     df_seed[src_args.src_col_isin].astype(str), pa.string())))
+        else:
+            seed_price = pa.nulls(n_rows, pa.float64())
+        prev_price = pc.if_else(first_of_isin, seed_price, pa.concat_arrays([
+            pa.nulls(1, op_price.type), op_price.slice(0, n_rows - 1)]))
+        # Scattering the previous prices back to the rows of the data
+        prev_price = prev_price.take(pc.sort_indices(order))
+        op_price = data[trg_args.trg_col_op_price].combine_chunks()
+        return data.append_column(trg_args.trg_col_ch_prev_clos, pc.multiply(pc.divide(
+            pc.subtract(op_price, prev_price), prev_price), 100))
+
+    def round(self, data, decimals: int):
+        # Scaling and rounding to an integer like numpy and pandas do, pc.round
+        # with ndigits keeps values like 0.6699999999999999 that pandas rounds to 0.67
+        for index, field in enumerate(data.schema):
+            if pa.types.is_floating(field.type):
+                data = data.set_column(index, field, self.round_scaled(data[field.name],
+                                                                       decimals))
+        return data
+
+    def filter_from_date(self, data, date_column: str, first_date: str):
+        first_date = pc.cast(pa.scalar(first_date), data.schema.field(date_column).type)
+        return data.filter(pc.greater_equal(data[date_column], first_date))
+
+    def to_pandas(self, data, columns: list):
+        return data.select(columns).to_pandas()
+
+    def to_arrow(self, data):
+        return data
+
+    def write(self, s3_bucket, data, key: str, file_format: str, compression: str = None,
+              parquet_options: dict = None):
+        return s3_bucket.write_table_to_s3(data, key, file_format, compression=compression,
+                                           parquet_options=parquet_options)
+
+    @staticmethod
+    def round_scaled(column, decimals: int):
+        """
+        Rounds a float column to decimals half to even like numpy.round
+        """
+        rounded = pc.round(pc.multiply(column, 10.0 ** decimals) if decimals >= 0
+                           else pc.divide(column, 10.0 ** -decimals),
+                           ndigits=0, round_mode='half_to_even')
+        return (pc.divide(rounded, 10.0 ** decimals) if decimals >= 0
+                else pc.multiply(rounded, 10.0 ** -decimals))
+
+    @staticmethod
+    def decode(column):
+        """
+        Returns the values of a dictionary column, other columns unchanged
+        """
+        if pa.types.is_dictionary(column.type):
+            return pc.cast(column, column.type.value_type).combine_chunks()
+        return column.combine_chunks()
+
+    @classmethod
+    def sort_indices(cls, data: pa.Table, columns: list):
+        """
+        Returns the indices of a stable sort of the data by the columns,
+        dictionary columns are ordered by the first appearance of their values
+        """
+        sort_data = {}
+        for column in columns:
+            values = data[column]
+            if pa.types.is_dictionary(values.type):
+                values = cls.decode(values)
+                values = pc.index_in(values, value_set=pc.unique(values))
+            sort_data[RANK_PREFIX + column] = values
+        return pc.sort_indices(pa.table(sort_data),
+                               sort_keys=[(name, 'ascending') for name in sort_data])
+
+    @classmethod
+    def time_ordered(cls, data: pa.Table, src_args):
+        """
+        Checks in one pass over the rows that the trades are ordered by date
+        and time, like aggregations.time_ordered
+        """
+        n_rows = data.num_rows
+        if n_rows < 2:
+            return True
+        def pairs(column):
+            values = cls.decode(data[column])
+            return values.slice(1), values.slice(0, n_rows - 1)
+        if src_args.src_col_time_key:
+            return pc.all(pc.greater_equal(*pairs(src_args.src_col_time_key))).as_py()
+        dates, prev_dates = pairs(src_args.src_col_date)
+        later_time = pc.and_(pc.equal(dates, prev_dates),
+                             pc.greater_equal(*pairs(src_args.src_col_time)))
+        return pc.all(pc.or_(pc.greater(dates, prev_dates), later_time)).as_py()
+
+    @classmethod
+    def aggregate_in_time_order(cls, data: pa.Table, keys: list, time_column: str,
+                                aggregations: dict, ordered: bool = False):
+        """
+        Groups the rows ordered by time and applies named aggregations
+
+        The rows are ordered by the keys and time with one stable sort, so every
+        group is a contiguous segment whose first and last row are the earliest
+        and latest row, ties keep the input order.
+
+        Parameters:
+          data: pyarrow Table that should be aggregated
+          keys: list of the group key columns
+          time_column: column the rows of a group are ordered by
+          aggregations: mapping of the output columns to tuples of input column and
+                        'first', 'last', 'min', 'max' or 'sum'
+          ordered: the rows are already ordered by time, they are only sorted by the keys
+
+        Returns:
+          table: pyarrow Table with one row per group, in the group
+                 order of the pandas backend
+        """
+        data = data.take(cls.sort_indices(data, keys if ordered else keys + [time_column]))
+        n_rows = data.num_rows
+        boundary = pa.array([True] * min(n_rows, 1), pa.bool_())
+        if n_rows > 1:
+            new_group = None
+            for key in keys:
+                values = cls.decode(data[key])
+                changed = pc.not_equal(values.slice(1), values.slice(0, n_rows - 1))
+                new_group = changed if new_group is None else pc.or_(new_group, changed)
+            boundary = pa.concat_arrays([boundary, new_group])
+        starts = pc.cast(pc.indices_nonzero(boundary), pa.int64())
+        ends = pa.concat_arrays([pc.subtract(starts.slice(1), 1),
+                                 pa.array([n_rows - 1] * min(n_rows, 1), pa.int64())])
+        # Minimum, maximum and sum per segment number, ordered like the segments
+        reductions = [(column, func) for column, func in aggregations.values()
+                      if func in ('min', 'max', 'sum')]
+        reduced = None
+        if reductions:
+            segments = pc.subtract(pc.cumulative_sum(pc.cast(boundary, pa.int64())), 1)
+            reduced = data.select(list({column for column, _ in reductions}))\
+                .append_column(SEGMENT, segments)\
+                    .group_by(SEGMENT).aggregate(reductions).sort_by(SEGMENT)
+        columns = {key: data[key].take(starts) for key in keys}
+        for name, (column, func) in aggregations.items():
+            if func == 'first':
+                columns[name] = data[column].take(starts)
+            elif func == 'last':
+                columns[name] = data[column].take(ends)
+            else:
+                columns[name] = reduced[f'{column}_{func}']
+        return pa.table(columns)
@@ -0,0 +1,241 @@
+"""
+Compaction of the report 1 target files
+"""
+import logging
+from datetime import date, datetime
+
+import numpy as np
+import pandas as pd
+import pyarrow as pa
+
+from tradeETL.common.constants import S3FileTypes, MetaProcessFormat
+from tradeETL.common.manifest import ReportManifest
+from tradeETL.common.partitions import partition_prefix, date_strings
+from tradeETL.common.s3 import S3BucketConnector
+from tradeETL.transformers.etl_transformer import etlSourceConfig, etlTargetConfig,\
+    create_target_key, parquet_write_options
+
+# Helper column with the number of the file a row was read from
+FILE_INDEX = '__file_index'
+
+class ReportCompaction():
+    """
+    Merges the target files of report 1 that runs and re-runs accumulate
+
+    Files with less than trg_compact_rows rows are merged with the files that
+    share their dates, the files of earlier compactions are left alone.
+    Every run writes complete dates, so a date is taken from the latest file
+    that contains it, the keys of later runs sort after the keys of earlier
+    runs with the default trg_key_date_format. New files are written before
+    the merged files are deleted, an interrupted compaction leaves duplicates
+    that the next compaction resolves. With trg_manifest_key the manifest is
+    updated after the merged files are deleted.
+    """
+
+    def __init__( self, s3_bucket_trg: S3BucketConnector, src_args: etlSourceConfig,
+                  trg_args: etlTargetConfig ):
+        """
+        Constructor for the compaction
+
+        Parameters:
+        s3_bucket_trg: connection to the target S3 bucket
+        src_args: NamedTuple class with source configuration data
+        trg_args: NamedTuple class with target configuration data
+        """
+        self._logger = logging.getLogger( __name__ )
+        self.s3_bucket_trg = s3_bucket_trg
+        self.src_args = src_args
+        self.trg_args = trg_args
+
+    def compact(self):
+        """
+        Compacts the date partitions with trg_partitioned, otherwise
+        the files under trg_key
+
+        Returns:
+          keys: list of the deleted file keys
+        """
+        self._logger.info('Compacting the Trade target files started...')
+        if self.trg_args.trg_partitioned:
+            deleted, entries = self._compact_partitions(), []
+        else:
+            deleted, entries = self._compact_files()
+        if self.trg_args.trg_manifest_key and (deleted or entries):
+            ReportManifest.update_manifest(entries, deleted, self.trg_args.trg_manifest_key,
+                                           self.s3_bucket_trg)
+        self._logger.info('Compacting the Trade target files finished, %s files removed.',
+                          len(deleted))
+        return deleted
+
+    def _compact_partitions(self):
+        """
+        Deletes the files of a date partition that a later file replaces
+
+        A partition file holds all rows of its date and is already ordered
+        by ISIN, only the latest file of a partition is kept.
+        """
+        partitions = {}
+        for key in self.s3_bucket_trg.list_files_in_prefix(
+                partition_prefix(self.trg_args.trg_key, self.trg_args.trg_col_date)):
+            partitions.setdefault(key.rsplit('/', 1)[0], []).append(key)
+        deleted = [key for keys in partitions.values() for key in sorted(keys)[:-1]]
+        if deleted:
+            self.s3_bucket_trg.delete_files(deleted)
+        return deleted
+
+    def _compact_files(self):
+        """
+        Merges the parquet files under trg_key that have less than trg_compact_rows
+        rows, together with the files that share dates with them, into files of
+        about trg_compact_rows rows ordered by date and ISIN with row groups of
+        trg_row_group_size, a date is never split across files
+
+        The row counts and date ranges are taken from the file footers, files
+        that an earlier compaction sized are left alone. The merged files are
+        read one group of files with overlapping dates at a time, so the memory
+        is bounded by such a group and trg_compact_rows rows.
+
+        Returns:
+          deleted: list of the keys of the merged files
+          entries: list of the manifest rows of the written files, empty without trg_manifest_key
+        """
+        parquet_suffix = f'.{S3FileTypes.PARQUET.value}'
+        keys = sorted(key for key in self.s3_bucket_trg.list_files_in_prefix(self.trg_args.trg_key)
+                      if key.endswith(parquet_suffix) and key != self.trg_args.trg_manifest_key)
+        groups = [group for group in self._date_groups(keys)
+                  if any(rows < self.trg_args.trg_compact_rows for _, rows in group)]
+        merged = sorted(key for group in groups for key, _ in group)
+        if len(merged) < 2:
+            self._logger.info('There are less than two target files to merge, '
+                              'nothing is compacted.')
+            return [], []
+        written = []
+        entries = []
+        buffered = []
+        for group in groups:
+            buffered.append(self._read_group(sorted(key for key, _ in group)))
+            if sum(len(data_frame) for data_frame in buffered) >= self.trg_args.trg_compact_rows:
+                buffered = self._write_files(pd.concat(buffered, ignore_index=True), written,
+                                             entries, last=False)
+        if buffered:
+            self._write_files(pd.concat(buffered, ignore_index=True), written, entries, last=True)
+        deleted = [key for key in merged if key not in written]
+        self.s3_bucket_trg.delete_files(deleted)
+        return deleted, entries
+
+    def _date_groups(self, keys: list):
+        """
+        Returns the files grouped by overlapping date ranges in date order, a date
+        is only found in the files of one group
+
+        Parameters:
+          keys: list of the keys of the parquet files
+
+        returns:
+          groups: list of lists of tuples of the key and the number of rows of a file
+        """
+        files = []
+        for key in keys:
+            metadata = self.s3_bucket_trg.read_parquet_metadata(key)
+            files.append((*self._date_range(key, metadata), key, metadata.num_rows))
+        groups = []
+        group_end = None
+        for first_date, last_date, key, rows in sorted(files):
+            if group_end is None or first_date > group_end:
+                groups.append([])
+                group_end = last_date
+            groups[-1].append((key, rows))
+            group_end = max(group_end, last_date)
+        return groups
+
+    def _date_range(self, key: str, metadata):
+        """
+        Returns the first and last date ('YYYY-MM-DD') of a parquet file from the
+        statistics of its date column, files without statistics read the column
+
+        Parameters:
+          key: key of the parquet file
+          metadata: pyarrow FileMetaData of the file
+        """
+        column_index = metadata.schema.names.index(self.src_args.src_col_date)
+        statistics = [metadata.row_group(index).column(column_index).statistics
+                      for index in range(metadata.num_row_groups)]
+        if statistics and all(stats is not None and stats.has_min_max for stats in statistics):
+            values = [stats.min for stats in statistics] + [stats.max for stats in statistics]
+            values = [value.strftime(MetaProcessFormat.META_DATE_FORMAT.value)
+                      if isinstance(value, (date, datetime)) else value for value in values]
+        else:
+            values = date_strings(self.s3_bucket_trg.read_parquet_to_table(
+                key, columns=[self.src_args.src_col_date])[self.src_args.src_col_date]).to_pylist()
+        return min(values), max(values)
+
+    def _read_group(self, keys: list):
+        """
+        Reads the files of a date group, every date keeps the rows of the latest file
+        with that date, ordered by date and ISIN
+
+        Parameters:
+          keys: list of the ordered keys of the files with overlapping dates
+        """
+        date_column = self.src_args.src_col_date
+        data_frame = pd.concat([self.s3_bucket_trg.read_parquet_to_df(key).assign(
+            **{FILE_INDEX: index}) for index, key in enumerate(keys)], ignore_index=True)
+        latest = data_frame.groupby(date_column)[FILE_INDEX].transform('max')
+        return data_frame[data_frame[FILE_INDEX] == latest].drop(columns=[FILE_INDEX])\
+            .sort_values(by=[date_column, self.src_args.src_col_isin], kind='stable')\
+                .reset_index(drop=True)
+
+    def _write_files(self, data_frame: pd.DataFrame, written: list, entries: list, last: bool):
+        """
+        Writes the rows in files of about trg_compact_rows rows, the rows after the
+        last full file are returned to be merged with the next groups unless last is set
+
+        Parameters:
+          data_frame: Pandas DataFrame with the merged rows ordered by date and ISIN
+          written: list the keys of the written files are appended to
+          entries: list the manifest rows of the written files are appended to
+          last: writes the remaining rows as well
+
+        returns:
+          buffered: list with the Pandas DataFrame of the remaining rows, empty if none remain
+        """
+        date_column = self.src_args.src_col_date
+        bounds = self._file_bounds(data_frame[date_column])
+        if not last and bounds[-1][1] - bounds[-1][0] < self.trg_args.trg_compact_rows:
+            remaining = bounds.pop()
+        else:
+            remaining = None
+        for start, end in bounds:
+            # The number of the file is appended to the date of the key
+            target_key, _ = create_target_key(
+                self.trg_args.trg_key, f'{self.trg_args.trg_key_date_format}_{len(written):04d}',
+                S3FileTypes.PARQUET.value)
+            table = pa.Table.from_pandas(data_frame.iloc[start:end], preserve_index=False)
+            self.s3_bucket_trg.write_table_to_s3(
+                table, target_key, S3FileTypes.PARQUET.value,
+                row_group_size=self.trg_args.trg_row_group_size,
+                parquet_options=parquet_write_options(self.trg_args))
+            written.append(target_key)
+            if self.trg_args.trg_manifest_key:
+                entries.append(ReportManifest.file_entry(
+                    target_key, table, date_column, self.src_args.src_col_isin,
+                    self.s3_bucket_trg))
+        if remaining is None:
+            return []
+        return [data_frame.iloc[remaining[0]:remaining[1]].reset_index(drop=True)]
+
+    def _file_bounds(self, dates: pd.Series):
+        """
+        Returns the first and last row plus one of every compacted file, a file
+        ends at the first date that starts after trg_compact_rows rows
+
+        Parameters:
+          dates: Pandas Series with the ordered dates of the rows
+        """
+        values = dates.to_numpy()
+        bounds = [0]
+        for start in np.flatnonzero(values[1:] != values[:-1]) + 1:
+            if start - bounds[-1] >= self.trg_args.trg_compact_rows:
+                bounds.append(start)
+        bounds.append(len(values))
+        return list(zip(bounds[:-1], bounds[1:]))
@@ -1,14 +1,31 @@
 """
 Trade etl component
 """
+import asyncio
+import functools
 import logging
+import re
+from concurrent.futures import ThreadPoolExecutor, ProcessPoolExecutor
 from typing import NamedTuple
 import pandas as pd
-from datetime import datetime
+from datetime import datetime, timedelta
 
 
+from tradeETL.common.constants import S3FileTypes, S3Compressions, S3CompressionSuffixes,\
+    ComputeBackends, PrevCloseStateFormat, ParquetCompressions, MetaProcessFormat, IpcCompressions,\
+    AggBackends
+from tradeETL.common.arrow_shm import write_frame_to_shm, read_frame_from_shm, unlink_shm
+from tradeETL.common.custom_exceptions import WrongEngineException, WrongFormatException
 from tradeETL.common.s3 import S3BucketConnector
+from tradeETL.common.s3_async import AsyncS3BucketConnector
 from tradeETL.common.meta_process import MetaProcess
+from tradeETL.common.prev_close_state import PrevCloseState
+from tradeETL.common.manifest import ReportManifest
+from tradeETL.common.partitions import partition_prefix, partition_key, date_partitions
+from tradeETL.transformers.aggregations import first_appearance_rank, order_groups,\
+    source_columns
+from tradeETL.transformers.backends import ComputeBackend, PandasBackend, ArrowBackend,\
+    AGG_BACKENDS
 
 class etlSourceConfig( NamedTuple ):
     """
@@ -24,6 +41,25 @@ class etlSourceConfig( NamedTuple ):
     src_col_min_price: column name for minimum price in source
     src_col_max_price: column name for maximum price in source
     src_col_traded_vol: column name for traded volume in source
+    src_max_workers: maximum number of source files downloaded at the same time,
+                     1 downloads the files one after another
+    src_csv_engine: engine used for parsing the source files, 'pandas' or 'arrow'
+    src_schema: optional mapping of the source columns to their dtypes, e.g.
+                'category', 'float64', 'int64', 'str' or 'date' for a parsed date.
+                Only the columns of the schema are parsed from the source files.
+    src_compression: compression codec of the source files, 'gzip' or 'zstd',
+                     None detects it from the key suffix
+    src_partial_agg: reduces every source file to a partial aggregate per ISIN and day
+                     while extracting, instead of keeping all raw trades
+    src_col_time_key: optional name of an int64 column with date and time as seconds
+                      since the epoch, added while extracting. The trades are ordered
+                      by it instead of the time strings.
+    src_presorted: the source files are ordered by time and their file names end
+                   with the hour, e.g. 2021-04-17_BINS_XETR13.csv. The files of a day
+                   are concatenated by hour and the trades are not sorted by time again
+                   if one pass over the rows confirms the order.
+    src_async: run.py extracts report 1 with etl_report1_async on an asyncio
+               event loop, src_max_workers requests are in flight at the same time
     """
     src_first_extract_date: str
     src_columns: list
@@ -34,6 +70,14 @@ class etlSourceConfig( NamedTuple ):
     src_col_min_price: str
     src_col_max_price: str
     src_col_traded_vol: str
+    src_max_workers: int = 1
+    src_csv_engine: str = 'pandas'
+    src_schema: dict = None
+    src_compression: str = None
+    src_partial_agg: bool = False
+    src_col_time_key: str = None
+    src_presorted: bool = False
+    src_async: bool = False
 
 class etlTargetConfig( NamedTuple ):
     """
@@ -51,6 +95,38 @@ class etlTargetConfig( NamedTuple ):
     trg_key: basic key of target file
     trg_key_date_format: date format of target file key
     trg_format: file format of the target file
+    trg_compression: compression codec of csv target files, 'gzip' or 'zstd', buffer
+                     compression of arrow (Arrow IPC / Feather v2) target files, 'lz4' or 'zstd'
+    trg_agg_backend: backend aggregating the trades per ISIN and day, 'pandas' or 'numpy'.
+                     Not used with src_partial_agg, the partial aggregates are merged by
+                     the compute backend.
+    trg_state_key: optional key of the prior close state file in the target bucket,
+                   when it exists the day before the first extract date is not extracted
+    trg_transform_workers: number of processes the transformation runs in, the data
+                           is partitioned by a hash of the ISIN, 1 runs in this process.
+                           Only used by the pandas compute backend.
+    trg_compute_backend: backend running the whole pipeline from parsing the source files to
+                         writing the target file, 'pandas' or 'arrow' for pyarrow Tables
+                         and Arrow compute functions without pandas conversions
+    trg_partitioned: writes one parquet file per date under the hive-style partition
+                     directory trg_col_date=YYYY-MM-DD next to trg_key, the rows of a file
+                     ordered by ISIN and without the date column
+    trg_row_group_size: maximum number of rows of a parquet row group, None keeps the
+                        default of pyarrow
+    trg_upsert: replaces the date partitions of a run instead of adding files to them,
+                the other files of a written partition are deleted. Needs trg_partitioned.
+    trg_compact_rows: number of rows the compaction of the target files aims at per file,
+                      only files with less rows are merged
+    trg_parquet_compression: compression codec of parquet target files, 'none', 'snappy',
+                             'gzip', 'brotli', 'lz4' or 'zstd'
+    trg_parquet_compression_level: optional level of the parquet compression codec
+    trg_parquet_dictionary: optional list of the columns of parquet target files that are
+                            dictionary encoded, None encodes all columns
+    trg_parquet_data_page_size: optional size of the parquet data pages in bytes
+    trg_parquet_statistics: writes the minimum and maximum of every column chunk
+    trg_parquet_version: parquet format version, '1.0', '2.4' or '2.6'
+    trg_manifest_key: optional key of the manifest in the target bucket that lists every
+                      target file with its rows, size, ETag and date and ISIN range
     """
     trg_col_isin: str
     trg_col_date: str
@@ -63,6 +139,137 @@ class etlTargetConfig( NamedTuple ):
     trg_key: str
     trg_key_date_format: str
     trg_format: str
+    trg_compression: str = None
+    trg_agg_backend: str = 'pandas'
+    trg_state_key: str = None
+    trg_transform_workers: int = 1
+    trg_compute_backend: str = 'pandas'
+    trg_partitioned: bool = False
+    trg_row_group_size: int = None
+    trg_upsert: bool = False
+    trg_compact_rows: int = 1000000
+    trg_parquet_compression: str = 'snappy'
+    trg_parquet_compression_level: int = None
+    trg_parquet_dictionary: list = None
+    trg_parquet_data_page_size: int = None
+    trg_parquet_statistics: bool = True
+    trg_parquet_version: str = '2.4'
+    trg_manifest_key: str = None
+
+# Compute backends by their ComputeBackends value
+COMPUTE_BACKENDS = {
+    ComputeBackends.PANDAS.value: PandasBackend(),
+    ComputeBackends.ARROW.value: ArrowBackend()
+}
+
+def aggregate_report1(data, src_args: etlSourceConfig, trg_args: etlTargetConfig,
+                      df_seed: pd.DataFrame = None, backend: ComputeBackend = None):
+    """
+    Aggregates the extracted data per ISIN and day and calculates the change
+    to the previous trading day, before rounding and removing the day before
+
+    Parameters:
+      data: extracted data of the backend, all trades of an ISIN included
+      src_args: NamedTuple class with source configuration data
+      trg_args: NamedTuple class with target configuration data
+      df_seed: optional Pandas DataFrame with the ISIN, date and opening price
+               columns of the previous trading days seeding the change
+      backend: ComputeBackend running the steps, the pandas backend if not given
+
+    Returns:
+      data: aggregated data with one row per ISIN and day
+    """
+    backend = backend or COMPUTE_BACKENDS[ComputeBackends.PANDAS.value]
+    if src_args.src_partial_agg:
+        # Merging the partial aggregates of the source files
+        data = backend.merge_partials(data, src_args, trg_args)
+    else:
+        if src_args.src_col_time_key and not backend.has_column(data, src_args.src_col_time_key):
+            # The data was not extracted by TradeETL
+            data = backend.add_time_key(data, src_args)
+        # Filtering necessary source columns
+        data = backend.project(data, source_columns(src_args))
+        # Removing rows with missing values
+        data = backend.dropna(data)
+        # Aggregating per ISIN and day -> opening price, closing price,
+        # minimum price, maximum price, traded volume
+        data = backend.aggregate(data, src_args, trg_args)
+    # Change of current day's closing price compared to the
+    # previous trading day's closing price in %
+    return backend.change_prev_close(data, src_args, trg_args, df_seed)
+
+def create_target_key(trg_key: str, trg_key_date_format: str, trg_format: str,
+                      trg_compression: str = None):
+    """
+    Creates the key of a target file from the key prefix and today's date
+
+    Parameters:
+      trg_key: key prefix of the target file
+      trg_key_date_format: format of today's date in the key
+      trg_format: file format, also the key suffix
+      trg_compression: optional compression codec of csv files, adds its suffix,
+                       or buffer compression of arrow files
+
+    Returns:
+      target_key: key of the target file
+      compression: compression codec the file is written with
+    """
+    target_key = f'{trg_key}{datetime.today().strftime(trg_key_date_format)}.{trg_format}'
+    compression = None
+    if trg_compression and trg_format == S3FileTypes.CSV.value:
+        compression = trg_compression
+        target_key += S3CompressionSuffixes[S3Compressions(compression).name].value
+    elif trg_compression and trg_format == S3FileTypes.ARROW.value:
+        # The buffers are compressed inside the file, the key keeps its suffix
+        compression = trg_compression
+    return target_key, compression
+
+def parquet_write_options(trg_args: etlTargetConfig):
+    """
+    Returns the keyword arguments of the parquet writer of the target configuration
+
+    Parameters:
+      trg_args: NamedTuple class with target configuration data
+    """
+    return {
+        'compression': trg_args.trg_parquet_compression,
+        'compression_level': trg_args.trg_parquet_compression_level,
+        'use_dictionary': True if trg_args.trg_parquet_dictionary is None
+                          else list(trg_args.trg_parquet_dictionary),
+        'data_page_size': trg_args.trg_parquet_data_page_size,
+        'write_statistics': trg_args.trg_parquet_statistics,
+        'version': trg_args.trg_parquet_version
+    }
+
+def source_file_hour(key: str):
+    """
+    Returns the hour of a source file from the number its file name ends with,
+    e.g. 13 for '2021-04-17/2021-04-17_BINS_XETR13.csv', -1 without a number
+
+    Parameters:
+      key: key of the source file
+    """
+    hour = re.search(r'(\d+)$', key.rsplit('/', 1)[-1].split('.', 1)[0])
+    return int(hour.group(1)) if hour else -1
+
+def _aggregate_report1_shm(frame_shm: tuple, seed_shm: tuple, src_args: etlSourceConfig,
+                           trg_args: etlTargetConfig):
+    """
+    Runs aggregate_report1 in a worker process on a partition handed over
+    as Arrow IPC stream in shared memory
+
+    Parameters:
+      frame_shm: name and size of the shared memory block with the partition
+      seed_shm: name and size of the block with the seed of the partition or None
+      src_args: NamedTuple class with source configuration data
+      trg_args: NamedTuple class with target configuration data
+
+    Returns:
+      result_shm: name and size of the shared memory block with the result
+    """
+    data_frame = read_frame_from_shm(*frame_shm)
+    df_seed = None if seed_shm is None else read_frame_from_shm(*seed_shm)
+    return write_frame_to_shm(aggregate_report1(data_frame, src_args, trg_args, df_seed))
 
 
 class TradeETL():
@@ -96,115 +303,401 @@ class TradeETL():
             self.src_args.src_first_extract_date, self.meta_key, self.s3_bucket_trg)
         self.meta_update_list = [date for date in self.extract_date_list\
             if date >= self.extract_date]
+        if self.trg_args.trg_compute_backend not in COMPUTE_BACKENDS:
+            self._logger.info('The compute backend %s is not supported',
+                              self.trg_args.trg_compute_backend)
+            raise WrongEngineException
+        self.backend = COMPUTE_BACKENDS[self.trg_args.trg_compute_backend]
+        if self.trg_args.trg_partitioned and \
+            self.trg_args.trg_format != S3FileTypes.PARQUET.value:
+            self._logger.info('Partitioned target files have to be parquet files, not %s',
+                              self.trg_args.trg_format)
+            raise WrongFormatException
+        if self.src_args.src_partial_agg and \
+            self.trg_args.trg_agg_backend != AggBackends.PANDAS.value:
+            self._logger.info('The aggregation backend %s is not used with src_partial_agg',
+                              self.trg_args.trg_agg_backend)
+        # Arrow files compress their buffers, csv files the whole file
+        codecs = IpcCompressions if self.trg_args.trg_format == S3FileTypes.ARROW.value \
+            else S3Compressions
+        if self.trg_args.trg_compression is not None and \
+            self.trg_args.trg_compression not in [codec.value for codec in codecs]:
+            self._logger.info('The compression %s is not supported',
+                              self.trg_args.trg_compression)
+            raise WrongFormatException
+        if self.trg_args.trg_parquet_compression not in \
+            [codec.value for codec in ParquetCompressions]:
+            self._logger.info('The parquet compression %s is not supported',
+                              self.trg_args.trg_parquet_compression)
+            raise WrongFormatException
+        if self.trg_args.trg_upsert and not self.trg_args.trg_partitioned:
+            self._logger.info('Upserts replace date partitions and need trg_partitioned')
+            raise WrongFormatException
+        # Prior close state replacing the extraction of the day before extract_date
+        self.prev_close_state = None
+        self.prev_close_seeded = False
+        self.prev_close_update = None
+        if self.trg_args.trg_state_key and self.extract_date_list:
+            self._read_prev_close_state()
+
 
+    def _read_prev_close_state(self):
+        """
+        Reads the prior close state and removes the day before
+        extract_date from extract_date_list if the state can seed the shift
+
+        A state with dates from extract_date on was written by a run whose meta
+        file update did not succeed, the day before is extracted again then.
+        """
+        self.prev_close_state = PrevCloseState.read_state(self.trg_args.trg_state_key,
+                                                          self.s3_bucket_trg)
+        if self.prev_close_state is None:
+            return
+        if (self.prev_close_state[PrevCloseStateFormat.STATE_DATE_COL.value]
+                >= self.extract_date).any():
+            self._logger.info('The prior close state is ahead of the meta file and is not used.')
+            return
+        self.prev_close_seeded = True
+        self.extract_date_list = [date for date in self.extract_date_list
+                                  if date >= self.extract_date]
 
     def extract( self ):
         """
-        Read the source data and concatenates them to one Pandas DataFrame
+        Read the source data and concatenates them to one Pandas DataFrame,
+        or pyarrow Table with the arrow compute backend
+
+        With src_partial_agg every file is reduced to its partial aggregate
+        per ISIN and day by the download worker that read it.
 
         returns:
           data_frame: Pandas DataFrame with the extracted data
         """
         self._logger.info('Extracting Trade source files started...')
-        files = [key for date in self.extract_date_list\
-                     for key in self.s3_bucket_src.list_files_in_prefix(date)]
+        files = []
+        if self.extract_date_list:
+            files = self._group_source_files(self.s3_bucket_src.list_files_in_date_range(
+                min(self.extract_date_list), max(self.extract_date_list)))
         if not files:
-            data_frame = pd.DataFrame()
+            data_frame = self.backend.empty()
         else:
-            data_frame = pd.concat([self.s3_bucket_src.read_csv_to_df(file)\
-                for file in files], ignore_index=True)
+            read_csv = functools.partial(self.backend.read_csv, self.s3_bucket_src,
+                                         read_args=self._source_read_args())
+            data_frame = self.backend.concat(self._map_source_files(
+                lambda key: self._reduce_source_frame(read_csv(key=key)), files),
+                self.src_args.src_schema)
         self._logger.info('Extracting etl source files finished.')
         return data_frame
 
-    def transform_report1(self, data_frame: pd.DataFrame):
+    async def extract_async(self):
+        """
+        Reads the source data on an asyncio event loop and concatenates
+        them to one Pandas DataFrame
+
+        returns:
+          data_frame: Pandas DataFrame with the extracted data
+        """
+        self._logger.info('Extracting Trade source files started...')
+        async with AsyncS3BucketConnector(self.s3_bucket_src,
+                                          max(self.src_args.src_max_workers, 1)) as s3_bucket_src:
+            files = []
+            if self.extract_date_list:
+                files = self._group_source_files(await s3_bucket_src.list_files_in_date_range(
+                    min(self.extract_date_list), max(self.extract_date_list)))
+            if not files:
+                data_frame = self.backend.empty()
+            else:
+                data_frame = self.backend.concat(await asyncio.gather(*[
+                    self._read_source_file_async(s3_bucket_src, file) for file in files]),
+                    self.src_args.src_schema)
+        self._logger.info('Extracting etl source files finished.')
+        return data_frame
+
+    async def _read_source_file_async(self, s3_bucket_src: AsyncS3BucketConnector, key: str):
+        """
+        Reads a source file and reduces it on a worker thread
+
+        Parameters:
+          s3_bucket_src: AsyncS3BucketConnector of the source bucket
+          key: key of the source file
+        """
+        data_frame = await self.backend.read_csv(s3_bucket_src, key, self._source_read_args())
+        if not (self.src_args.src_partial_agg or self.src_args.src_col_time_key):
+            return data_frame
+        return await asyncio.get_running_loop().run_in_executor(
+            None, self._reduce_source_frame, data_frame)
+
+    def _reduce_source_frame(self, data_frame):
+        """
+        Adds the time key of src_col_time_key and returns the partial aggregate
+        of a source file if src_partial_agg is set, otherwise the data frame itself
+
+        Parameters:
+          data_frame: data of one source file in the type of the compute backend
+        """
+        if self.src_args.src_col_time_key:
+            data_frame = self.backend.add_time_key(data_frame, self.src_args)
+        if not self.src_args.src_partial_agg:
+            return data_frame
+        return self.backend.partial(data_frame, self.src_args, self.trg_args)
+
+    def _group_source_files(self, date_files: dict):
+        """
+        Returns the source file keys of the dates in extract_date_list,
+        the files of a day ordered by their hour with src_presorted
+
+        Parameters:
+          date_files: dictionary of date and file keys as listed by
+                      S3BucketConnector.list_files_in_date_range
+        """
+        if self.src_args.src_presorted:
+            date_files = {date: sorted(keys, key=source_file_hour)
+                          for date, keys in date_files.items()}
+        return [key for date in self.extract_date_list for key in date_files.get(date, [])]
+
+    def _source_read_args(self):
+        """
+        Returns the keyword arguments for reading a source file
+
+        Date and time are read as strings unless the source schema says otherwise,
+        so every csv engine returns the same column types
+        """
+        read_args = {
+            'engine': self.src_args.src_csv_engine,
+            'dtype': {self.src_args.src_col_date: 'str', self.src_args.src_col_time: 'str'},
+            'compression': self.src_args.src_compression
+        }
+        if self.src_args.src_schema:
+            read_args['dtype'].update(self.src_args.src_schema)
+            read_args['usecols'] = list(self.src_args.src_schema)
+        return read_args
+
+    def _map_source_files(self, func, files: list):
+        """
+        Applies func to every source file, concurrently if src_max_workers > 1
+
+        Parameters:
+          func: function that is called with a single source file key
+          files: list of source file keys
+
+        Returns:
+          results: list of the results in the same order as files
+        """
+        max_workers = min(self.src_args.src_max_workers, len(files))
+        if max_workers <= 1:
+            return [func(file) for file in files]
+        # executor.map keeps at most max_workers requests in flight
+        # and yields the results in the order of the keys
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            return list(executor.map(func, files))
+
+    def transform_report1(self, data_frame: pd.DataFrame, decimals: int = 2):
         """
         Applies the necessary transformation to create report 1
 
         Parameter:
-          data_frame: Pandas DataFrame as Input
+          data_frame: Pandas DataFrame as Input, pyarrow Table with the arrow compute backend
+          decimals: number of decimals the report is rounded to, None keeps the
+                    unrounded aggregates, e.g. for the window indicators
 
         Returns:
           data_frame: Transformed Pandas DataFrame as Output
         """
-        if data_frame.empty:
+        if self.backend.is_empty(data_frame):
             self._logger.info('The dataframe is empty. No transformations will be applied.')
             return data_frame
+        if self.trg_args.trg_agg_backend not in AGG_BACKENDS:
+            self._logger.info('The aggregation backend %s is not supported',
+                              self.trg_args.trg_agg_backend)
+            raise WrongEngineException
         self._logger.info('Applying transformations to Trade source data for report 1 started...')
-        # Filtering necessary source columns
-        data_frame = data_frame.loc[:, self.src_args.src_columns]
-        # Removing rows with missing values
-        data_frame.dropna(inplace=True)
-        # Calculating opening price per ISIN and day
-        data_frame[self.trg_args.trg_col_op_price] = data_frame\
-            .sort_values(by=[self.src_args.src_col_time])\
-                .groupby([
-                    self.src_args.src_col_isin,
-                    self.src_args.src_col_date
-                    ])[self.src_args.src_col_start_price]\
-                    .transform('first')
-        # Calculating closing price per ISIN and day
-        data_frame[self.trg_args.trg_col_clos_price] = data_frame\
-            .sort_values(by=[self.src_args.src_col_time])\
-                .groupby([
-                    self.src_args.src_col_isin,
-                    self.src_args.src_col_date
-                    ])[self.src_args.src_col_start_price]\
-                        .transform('last')
-        # Renaming columns
-        data_frame.rename(columns={
-            self.src_args.src_col_min_price: self.trg_args.trg_col_min_price,
-            self.src_args.src_col_max_price: self.trg_args.trg_col_max_price,
-            self.src_args.src_col_traded_vol: self.trg_args.trg_col_dail_trad_vol
-            }, inplace=True)
-        # Aggregating per ISIN and day -> opening price, closing price,
-        # minimum price, maximum price, traded volume
-        data_frame = data_frame.groupby([
-            self.src_args.src_col_isin,
-            self.src_args.src_col_date], as_index=False)\
-                .agg({
-                    self.trg_args.trg_col_op_price: 'min',
-                    self.trg_args.trg_col_clos_price: 'min',
-                    self.trg_args.trg_col_min_price: 'min',
-                    self.trg_args.trg_col_max_price: 'max',
-                    self.trg_args.trg_col_dail_trad_vol: 'sum'})
-        # Change of current day's closing price compared to the
-        # previous trading day's closing price in %
-        data_frame[self.trg_args.trg_col_ch_prev_clos] = data_frame\
-            .sort_values(by=[self.src_args.src_col_date])\
-                .groupby([self.src_args.src_col_isin])[self.trg_args.trg_col_op_price]\
-                    .shift(1)
-        data_frame[self.trg_args.trg_col_ch_prev_clos] = (
-            data_frame[self.trg_args.trg_col_op_price] \
-            - data_frame[self.trg_args.trg_col_ch_prev_clos]
-            ) / data_frame[self.trg_args.trg_col_ch_prev_clos ] * 100
+        df_seed = self._prev_close_seed(data_frame) if self.prev_close_seeded else None
+        if self.trg_args.trg_transform_workers > 1 and isinstance(self.backend, PandasBackend):
+            data_frame = self._aggregate_report1_parallel(data_frame, df_seed)
+        else:
+            data_frame = aggregate_report1(data_frame, self.src_args, self.trg_args, df_seed,
+                                           self.backend)
+        if self.trg_args.trg_state_key:
+            self.prev_close_update = self.backend.to_pandas(data_frame, [
+                self.src_args.src_col_isin,
+                self.src_args.src_col_date,
+                self.trg_args.trg_col_op_price]).set_axis(
+                    [PrevCloseStateFormat.STATE_ISIN_COL.value,
+                     PrevCloseStateFormat.STATE_DATE_COL.value,
+                     PrevCloseStateFormat.STATE_PRICE_COL.value], axis=1)
         # Rounding to 2 decimals
-        data_frame = data_frame.round(decimals=2)
+        if decimals is not None:
+            data_frame = self.backend.round(data_frame, decimals)
         # Removing the day before extract_date
-        data_frame = data_frame[data_frame.Date >= self.extract_date].reset_index(drop=True)
+        data_frame = self.backend.filter_from_date(data_frame, self.src_args.src_col_date,
+                                                   self.extract_date)
         self._logger.info('Applying transformations to Trade source data finished...')
         return data_frame
 
+    def _prev_close_seed(self, data_frame: pd.DataFrame):
+        """
+        Returns the prices of the prior close state of the day before extract_date
+        with the ISIN, date and opening price columns and the date type of the
+        extracted data
+
+        Only the day before is seeded, like the extraction of that day it
+        replaces, so the first day after a non-trading day has no change to
+        the previous day whether a state exists or not.
+
+        Parameters:
+          data_frame: Pandas DataFrame with the extracted data
+        """
+        date_format = MetaProcessFormat.META_DATE_FORMAT.value
+        day_before = (datetime.strptime(self.extract_date, date_format)
+                      - timedelta(days=1)).strftime(date_format)
+        df_seed = self.prev_close_state[
+            self.prev_close_state[PrevCloseStateFormat.STATE_DATE_COL.value] == day_before]\
+                .reset_index(drop=True).set_axis([
+            self.src_args.src_col_isin,
+            self.src_args.src_col_date,
+            self.trg_args.trg_col_op_price], axis=1)
+        if pd.api.types.is_datetime64_any_dtype(data_frame[self.src_args.src_col_date]):
+            df_seed[self.src_args.src_col_date] = pd.to_datetime(
+                df_seed[self.src_args.src_col_date])
+        return df_seed
+
+    def _aggregate_report1_parallel(self, data_frame: pd.DataFrame, df_seed: pd.DataFrame):
+        """
+        Runs aggregate_report1 on partitions of the ISINs in worker processes
+
+        The rows are partitioned by a hash of the ISIN, so all trading days of
+        an ISIN are in the same partition. The partitions are handed to the
+        workers as Arrow IPC streams in shared memory and the results are
+        ordered like the result of a single aggregate_report1 call.
+
+        Parameters:
+          data_frame: Pandas DataFrame with the extracted data
+          df_seed: optional Pandas DataFrame seeding the change to the previous day
+
+        Returns:
+          data_frame: Pandas DataFrame with one row per ISIN and day
+        """
+        keys = [self.src_args.src_col_isin, self.src_args.src_col_date]
+        appearance = {key: first_appearance_rank(data_frame[key]) for key in keys
+                      if isinstance(data_frame[key].dtype, pd.CategoricalDtype)}
+        n_workers = self.trg_args.trg_transform_workers
+        partitions = pd.util.hash_pandas_object(
+            data_frame[self.src_args.src_col_isin], index=False).to_numpy() % n_workers
+        if df_seed is not None:
+            seed_partitions = pd.util.hash_pandas_object(
+                df_seed[self.src_args.src_col_isin], index=False).to_numpy() % n_workers
+        blocks = []
+        results = []
+        try:
+            with ProcessPoolExecutor(max_workers=n_workers) as executor:
+                futures = []
+                for partition in range(n_workers):
+                    mask = partitions == partition
+                    if not mask.any():
+                        continue
+                    frame_shm = write_frame_to_shm(data_frame[mask])
+                    blocks.append(frame_shm[0])
+                    seed_shm = None
+                    if df_seed is not None:
+                        seed_shm = write_frame_to_shm(df_seed[seed_partitions == partition])
+                        blocks.append(seed_shm[0])
+                    futures.append(executor.submit(_aggregate_report1_shm, frame_shm, seed_shm,
+                                                   self.src_args, self.trg_args))
+                for future in futures:
+                    result_shm = future.result()
+                    blocks.append(result_shm[0])
+                    results.append(read_frame_from_shm(*result_shm))
+        finally:
+            # Unlinking the blocks a failed worker did not read
+            for name in blocks:
+                unlink_shm(name)
+        return order_groups(pd.concat(results, ignore_index=True), keys, appearance)
+
     def load(self, data_frame: pd.DataFrame):
         """
         Saves a Pandas DataFrame to the target
 
         Parameter
-          data_frame: Pandas DataFrame as Input
-        """
-        # Creating target key
-        target_key = (
-            f'{self.trg_args.trg_key}'
-            f'{datetime.today().strftime(self.trg_args.trg_key_date_format)}.'
-            f'{self.trg_args.trg_format}'
-        )
-        # Writing to target
-        self.s3_bucket_trg.write_df_to_s3(data_frame, target_key, self.trg_args.trg_format)
+          data_frame: Pandas DataFrame as Input, pyarrow Table with the arrow compute backend
+        """
+        if self.trg_args.trg_partitioned:
+            entries, replaced = self._write_partitions(data_frame)
+        else:
+            # Creating target key
+            target_key, compression = create_target_key(
+                self.trg_args.trg_key, self.trg_args.trg_key_date_format,
+                self.trg_args.trg_format, self.trg_args.trg_compression)
+            # Writing to target
+            self.backend.write(self.s3_bucket_trg, data_frame, target_key,
+                               self.trg_args.trg_format, compression=compression,
+                               parquet_options=parquet_write_options(self.trg_args))
+            entries, replaced = [], []
+            if self.trg_args.trg_manifest_key and not self.backend.is_empty(data_frame):
+                entries.append(ReportManifest.file_entry(
+                    target_key, self.backend.to_arrow(data_frame), self.src_args.src_col_date,
+                    self.src_args.src_col_isin, self.s3_bucket_trg))
         self._logger.info('Trade target data successfully written.')
+        # Updating the manifest before the meta file, so a processed
+        # date is never missing from the manifest
+        if self.trg_args.trg_manifest_key and (entries or replaced):
+            ReportManifest.update_manifest(entries, replaced, self.trg_args.trg_manifest_key,
+                                           self.s3_bucket_trg)
+            self._logger.info('Trade target manifest successfully updated.')
+        # Updating prior close state before the meta file, so the
+        # state is never behind the dates recorded as processed
+        if self.trg_args.trg_state_key and self.prev_close_update is not None:
+            PrevCloseState.update_state(self.prev_close_update, self.prev_close_state,
+                                        self.trg_args.trg_state_key, self.s3_bucket_trg)
+            self._logger.info('Trade prior close state successfully updated.')
         # Updating meta file
         MetaProcess.update_meta_file(self.meta_update_list, self.meta_key, self.s3_bucket_trg)
         self._logger.info('Trade meta file successfully updated.')
         return True
 
+    def _write_partitions(self, data_frame):
+        """
+        Writes one parquet file per date to its hive-style partition,
+        ordered by ISIN with the row groups of trg_row_group_size
+
+        With trg_upsert the other files of a partition are deleted after its
+        new file is written, so a failed run leaves duplicates and never
+        a partition without data.
+
+        Parameter
+          data_frame: Pandas DataFrame as Input, pyarrow Table with the arrow compute backend
+
+        Returns:
+          entries: list of the manifest rows of the written files, empty without trg_manifest_key
+          replaced: list of the keys of the deleted files
+        """
+        entries, replaced = [], []
+        if self.backend.is_empty(data_frame):
+            self._logger.info('The dataframe is empty! No file will be written!')
+            return entries, replaced
+        parquet_options = parquet_write_options(self.trg_args)
+        for date, table in date_partitions(self.backend.to_arrow(data_frame),
+                                           self.src_args.src_col_date,
+                                           self.src_args.src_col_isin):
+            target_key = partition_key(self.trg_args.trg_key, self.trg_args.trg_key_date_format,
+                                       self.trg_args.trg_format, self.trg_args.trg_col_date,
+                                       date)
+            self.s3_bucket_trg.write_table_to_s3(table, target_key, self.trg_args.trg_format,
+                                                 row_group_size=self.trg_args.trg_row_group_size,
+                                                 parquet_options=parquet_options)
+            if self.trg_args.trg_manifest_key:
+                entries.append(ReportManifest.file_entry(
+                    target_key, table, self.src_args.src_col_date, self.src_args.src_col_isin,
+                    self.s3_bucket_trg, date=date))
+            if self.trg_args.trg_upsert:
+                prefix = partition_prefix(self.trg_args.trg_key, self.trg_args.trg_col_date, date)
+                partition_keys = [key for key in self.s3_bucket_trg.list_files_in_prefix(prefix)
+                                  if key != target_key]
+                if partition_keys:
+                    self.s3_bucket_trg.delete_files(partition_keys)
+                    replaced.extend(partition_keys)
+                    self._logger.info('Replaced %s files of partition %s.',
+                                      len(partition_keys), date)
+        return entries, replaced
+
     def etl_report1(self):
         """
         Extract, transform and load to create report 1
@@ -217,6 +710,19 @@ class TradeETL():
         self.load(data_frame)
         return True
 
+    async def etl_report1_async(self):
+        """
+        Extract, transform and load to create report 1 with the
+        extraction running on the asyncio event loop
+        """
+        # Extraction
+        data_frame = await self.extract_async()
+        # Transformation
+        data_frame = self.transform_report1(data_frame)
+        # Load
+        self.load(data_frame)
+        return True
+
 
 
 
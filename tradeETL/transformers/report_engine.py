@@ -0,0 +1,213 @@
+"""
+Declarative reports sharing the extraction of report 1
+"""
+import logging
+from typing import NamedTuple
+
+import pandas as pd
+
+from tradeETL.common.constants import ReportFunctions
+from tradeETL.common.custom_exceptions import WrongReportException
+from tradeETL.transformers.aggregations import aggregate_sorted, first_appearance_rank,\
+    source_columns, time_column, time_ordered
+from tradeETL.transformers.etl_transformer import TradeETL, create_target_key,\
+    parquet_write_options
+from tradeETL.transformers.window_engine import WindowEngine
+
+class etlReportConfig( NamedTuple ):
+    """
+    Class for the configuration of a declarative report
+
+    Parameters:
+    trg_name: name of the report in the log messages
+    trg_group_keys: source columns the trades are grouped by, e.g. ISIN and date
+    trg_aggregations: mapping of the report columns to a list of source column and
+                      aggregation, 'first' and 'last' return the earliest and latest
+                      trade, 'min', 'max', 'sum', 'mean' and 'count' are supported
+    trg_key: key prefix of the target file
+    trg_key_date_format: format of today's date in the target key
+    trg_format: file format of the target file, parquet files are written with the
+                trg_parquet_* options of the target configuration
+    trg_lags: optional mapping of report columns to a list of a report column and the
+              group keys partitioning it, the column gets the value of the previous
+              row of the partition ordered by the other group keys
+    trg_derived: optional mapping of report columns to DataFrame.eval expressions
+                 over the report columns, evaluated in the given order
+    trg_columns: optional list of the report columns written to the target file
+    trg_decimals: decimals the float columns are rounded to, None keeps them
+    trg_compression: optional compression codec of csv target files
+    """
+    trg_name: str
+    trg_group_keys: list
+    trg_aggregations: dict
+    trg_key: str
+    trg_key_date_format: str
+    trg_format: str
+    trg_lags: dict = None
+    trg_derived: dict = None
+    trg_columns: list = None
+    trg_decimals: int = 2
+    trg_compression: str = None
+
+class ReportEngine():
+    """
+    Runs report 1, the declarative reports and the rolling window
+    indicators over one extraction of the source files
+    """
+
+    def __init__( self, trade_etl: TradeETL, reports: list,
+                  window_engine: WindowEngine = None ):
+        """
+        Constructor for the report engine
+
+        Parameters:
+        trade_etl: TradeETL extracting the source files and creating report 1
+        reports: list of etlReportConfig of the declarative reports
+        window_engine: optional WindowEngine computing indicators from report 1
+        """
+        self._logger = logging.getLogger( __name__ )
+        self.trade_etl = trade_etl
+        self.src_args = trade_etl.src_args
+        self.reports = reports
+        self.window_engine = window_engine
+        self._check_reports()
+
+    def _check_reports(self):
+        """
+        Checks the report configurations before anything is extracted
+        """
+        if self.reports and self.src_args.src_partial_agg:
+            self._logger.info('The declarative reports need the trades, '
+                              'src_partial_agg is not supported')
+            raise WrongReportException
+        functions = [function.value for function in ReportFunctions]
+        for report in self.reports:
+            for _, function in report.trg_aggregations.values():
+                if function not in functions:
+                    self._logger.info('The aggregation %s of report %s is not supported',
+                                      function, report.trg_name)
+                    raise WrongReportException
+            for _, *partition in (report.trg_lags or {}).values():
+                if not [key for key in report.trg_group_keys if key not in partition]:
+                    self._logger.info('The lags of report %s need a group key to order by',
+                                      report.trg_name)
+                    raise WrongReportException
+            if report.trg_lags and self.trade_etl.prev_close_seeded:
+                self._logger.info('The day before %s is not extracted, the lags of report %s '
+                                  'are missing on that day', self.trade_etl.extract_date,
+                                  report.trg_name)
+
+    def transform(self, data):
+        """
+        Creates the declarative reports from the extracted data
+
+        The trades are ordered by date and time once and every report groups
+        the ordered trades, the data is not sorted per report. With src_presorted
+        trades that are already ordered are not sorted at all.
+
+        Parameters:
+          data: extracted data of TradeETL.extract
+
+        Returns:
+          reports: dictionary of the report names and their Pandas DataFrames
+        """
+        if self.trade_etl.backend.is_empty(data):
+            self._logger.info('The dataframe is empty. No reports will be created.')
+            return {}
+        self._logger.info('Applying transformations to Trade source data for the reports started...')
+        data_frame = self.trade_etl.backend.to_pandas(data, source_columns(self.src_args))
+        data_frame = data_frame.dropna()
+        keys = {key for report in self.reports for key in report.trg_group_keys}
+        appearance = {key: first_appearance_rank(data_frame[key]) for key in keys
+                      if isinstance(data_frame[key].dtype, pd.CategoricalDtype)}
+        # Ordering by date and time, reports without the date key group trades of several days
+        if not (self.src_args.src_presorted and time_ordered(data_frame, self.src_args)):
+            if self.src_args.src_presorted:
+                self._logger.info('The source files are not ordered by time, '
+                                  'the trades are sorted.')
+            order = [time_column(self.src_args)] if self.src_args.src_col_time_key \
+                else [self.src_args.src_col_date, self.src_args.src_col_time]
+            data_frame = data_frame.sort_values(by=order, kind='stable')
+        reports = {report.trg_name: self._transform_report(data_frame, appearance, report)
+                   for report in self.reports}
+        self._logger.info('Applying transformations to Trade source data for the reports finished...')
+        return reports
+
+    def _transform_report(self, data_frame: pd.DataFrame, appearance: dict,
+                          report: etlReportConfig):
+        """
+        Creates a declarative report from the trades ordered by time
+
+        The day before extract_date is only used for the lags of reports grouped
+        by date, other reports aggregate the trades from extract_date on.
+
+        Parameters:
+          data_frame: Pandas DataFrame with the trades ordered by time
+          appearance: mapping of the category keys to their first_appearance_rank
+          report: etlReportConfig of the report
+        """
+        date_column = self.src_args.src_col_date
+        by_date = date_column in report.trg_group_keys
+        if not by_date:
+            data_frame = data_frame[data_frame[date_column] >= self.trade_etl.extract_date]
+        df_report = aggregate_sorted(data_frame, report.trg_group_keys, {
+            column: tuple(aggregation) for column, aggregation
+            in report.trg_aggregations.items()}, appearance)
+        for column, (value_column, *partition) in (report.trg_lags or {}).items():
+            order = [key for key in report.trg_group_keys if key not in partition]
+            df_report[column] = df_report.sort_values(by=order, kind='stable')\
+                .groupby(partition, observed=True)[value_column].shift(1)
+        for column, expression in (report.trg_derived or {}).items():
+            df_report[column] = df_report.eval(expression)
+        if report.trg_decimals is not None:
+            df_report = df_report.round(decimals=report.trg_decimals)
+        if by_date:
+            df_report = df_report[df_report[date_column] >= self.trade_etl.extract_date]\
+                .reset_index(drop=True)
+        if report.trg_columns:
+            df_report = df_report[report.trg_columns]
+        return df_report
+
+    def load(self, reports: dict):
+        """
+        Saves the declarative reports to the target
+
+        Parameters:
+          reports: dictionary of the report names and their Pandas DataFrames
+        """
+        # The reports are written with the parquet writer options of report 1
+        parquet_options = parquet_write_options(self.trade_etl.trg_args)
+        for report in self.reports:
+            if report.trg_name not in reports:
+                continue
+            target_key, compression = create_target_key(
+                report.trg_key, report.trg_key_date_format, report.trg_format,
+                report.trg_compression)
+            self.trade_etl.s3_bucket_trg.write_df_to_s3(reports[report.trg_name], target_key,
+                                                        report.trg_format,
+                                                        compression=compression,
+                                                        parquet_options=parquet_options)
+            self._logger.info('Trade report %s successfully written.', report.trg_name)
+        return True
+
+    def etl_reports(self):
+        """
+        Extract once, transform and load report 1, the declarative
+        reports and the rolling window indicators
+        """
+        # Extraction shared by all reports
+        data = self.trade_etl.extract()
+        # Transformation
+        reports = self.transform(data)
+        df_report1 = self.trade_etl.transform_report1(data, decimals=None)
+        if self.window_engine is not None:
+            # The indicators are computed from the unrounded prices
+            df_windows = self.window_engine.transform(df_report1)
+        if not self.trade_etl.backend.is_empty(df_report1):
+            df_report1 = self.trade_etl.backend.round(df_report1, 2)
+        # Load, report 1 last as it updates the meta file
+        self.load(reports)
+        if self.window_engine is not None:
+            self.window_engine.load(df_windows)
+        self.trade_etl.load(df_report1)
+        return True
@@ -0,0 +1,296 @@
+"""
+Rolling window indicators of report 1 with a carried window state
+"""
+import logging
+from typing import NamedTuple
+
+import numpy as np
+import pandas as pd
+
+from tradeETL.common.constants import WindowStateFormat, MetaProcessFormat
+from tradeETL.common.window_state import WindowState
+from tradeETL.transformers.etl_transformer import TradeETL, create_target_key,\
+    parquet_write_options
+
+# Helper column with the row of report 1 of the days of a run
+REPORT_ROW = '__report_row'
+# Columns of the window state per ISIN, the last closing price and the running sums
+SUM_COLUMNS = [
+    WindowStateFormat.STATE_LAST_CLOSE_COL.value,
+    WindowStateFormat.STATE_DAYS_COL.value,
+    WindowStateFormat.STATE_CLOSE_SUM_COL.value,
+    WindowStateFormat.STATE_VOLUME_SUM_COL.value,
+    WindowStateFormat.STATE_TURNOVER_SUM_COL.value,
+    WindowStateFormat.STATE_RETURNS_COL.value,
+    WindowStateFormat.STATE_RETURN_SUM_COL.value,
+    WindowStateFormat.STATE_RETURN_SQ_SUM_COL.value]
+# Sums that are reset when their count drops to zero
+DAY_SUMS = {
+    WindowStateFormat.STATE_DAYS_COL.value: [
+        WindowStateFormat.STATE_CLOSE_SUM_COL.value,
+        WindowStateFormat.STATE_VOLUME_SUM_COL.value,
+        WindowStateFormat.STATE_TURNOVER_SUM_COL.value],
+    WindowStateFormat.STATE_RETURNS_COL.value: [
+        WindowStateFormat.STATE_RETURN_SUM_COL.value,
+        WindowStateFormat.STATE_RETURN_SQ_SUM_COL.value]}
+
+class etlWindowConfig( NamedTuple ):
+    """
+    Class for the configuration of the rolling window indicators
+
+    Parameters:
+    trg_window_days: number of trading days of the exchange the windows span
+    trg_state_key: key of the rolling window state file
+    trg_key: key prefix of the target file
+    trg_key_date_format: format of today's date in the target key
+    trg_format: file format of the target file, parquet files are written with the
+                trg_parquet_* options of the target configuration
+    trg_min_days: minimum number of trading days of an indicator, trg_window_days if None
+    trg_col_moving_avg: column name for the moving average of the closing price
+    trg_col_volatility: column name for the standard deviation of the daily
+                        log returns of the closing price in %
+    trg_col_vwap: column name for the volume weighted average price, weighted
+                  with the typical price (maximum + minimum + closing) / 3 of a day
+    trg_compression: optional compression codec of csv target files
+    """
+    trg_window_days: int
+    trg_state_key: str
+    trg_key: str
+    trg_key_date_format: str
+    trg_format: str
+    trg_min_days: int = None
+    trg_col_moving_avg: str = 'moving_avg_closing_price_eur'
+    trg_col_volatility: str = 'volatility_%'
+    trg_col_vwap: str = 'vwap_eur'
+    trg_compression: str = None
+
+class WindowEngine():
+    """
+    Computes rolling window indicators per ISIN from the daily aggregates of report 1
+
+    The windows span the last trg_window_days trading days of the exchange, an
+    ISIN without trades on a day has no values of that day in its windows. The
+    window state has running sums per ISIN: a day of a run adds its values and
+    subtracts the values of the day leaving the window, read from the day file
+    written when that day was added. So neither the state nor the cost of a run
+    grow with the window length or the history.
+    """
+
+    def __init__( self, trade_etl: TradeETL, window_args: etlWindowConfig ):
+        """
+        Constructor for the window engine
+
+        Parameters:
+        trade_etl: TradeETL creating report 1
+        window_args: NamedTuple class with the window configuration data
+        """
+        self._logger = logging.getLogger( __name__ )
+        self.trade_etl = trade_etl
+        self.window_args = window_args
+        self.window_state = WindowState.read_state( window_args.trg_state_key,
+                                                    trade_etl.s3_bucket_trg )
+        self.window_update = None
+
+    def transform(self, data):
+        """
+        Computes the indicators of the days of report 1
+
+        Parameters:
+          data: unrounded report 1 of TradeETL.transform_report1 with decimals=None
+
+        Returns:
+          data_frame: Pandas DataFrame with the ISIN, date and indicator columns
+                      in the row order of report 1
+        """
+        backend = self.trade_etl.backend
+        if backend.is_empty(data):
+            self._logger.info('The dataframe is empty. No window indicators will be computed.')
+            return pd.DataFrame()
+        self._logger.info('Computing the window indicators started...')
+        src_args = self.trade_etl.src_args
+        trg_args = self.trade_etl.trg_args
+        state_key = self.window_args.trg_state_key
+        window_days = self.window_args.trg_window_days
+        df_report = backend.to_pandas(data, [
+            src_args.src_col_isin, src_args.src_col_date, trg_args.trg_col_clos_price,
+            trg_args.trg_col_min_price, trg_args.trg_col_max_price,
+            trg_args.trg_col_dail_trad_vol])
+        df_days = self._report_days(df_report)
+        isin_col = WindowStateFormat.STATE_ISIN_COL.value
+        days = {day: df_day.reset_index(drop=True) for day, df_day
+                in df_days.groupby(WindowStateFormat.STATE_DATE_COL.value, sort=True)}
+        run_dates = list(days)
+        df_base, base_as_of = self._base_state(run_dates[0])
+        # The dates of the window before the run, day files after base_as_of are of failed runs
+        window_dates = [] if base_as_of is None else [
+            day for day in WindowState.list_days(state_key, self.trade_etl.s3_bucket_trg)
+            if day <= base_as_of][-window_days:]
+        dates = window_dates + run_dates
+        df_sums = df_base
+        indicators = np.full((len(df_days), 3), np.nan)
+        for index in range(len(window_dates), len(dates)):
+            df_day = days[dates[index]]
+            isins = df_day[isin_col].to_numpy()
+            df_sums = df_sums.reindex(df_sums.index.union(isins))
+            close = df_day[WindowStateFormat.STATE_CLOSE_COL.value].to_numpy()
+            last_close = df_sums.loc[isins, WindowStateFormat.STATE_LAST_CLOSE_COL.value]
+            df_day[WindowStateFormat.STATE_RETURN_COL.value] = np.log(close
+                                                                      / last_close.to_numpy())
+            df_sums = self._add_day(df_sums, df_day, 1)
+            if index >= window_days:
+                leaving = dates[index - window_days]
+                df_sums = self._add_day(df_sums, days[leaving] if leaving in days else
+                                        WindowState.read_day(state_key, leaving,
+                                                             self.trade_etl.s3_bucket_trg), -1)
+            df_sums.loc[isins, WindowStateFormat.STATE_LAST_CLOSE_COL.value] = close
+            indicators[df_day[REPORT_ROW].to_numpy()] = self._indicators(df_sums.loc[isins])
+        df_windows = df_report[[src_args.src_col_isin, src_args.src_col_date]].copy()
+        for index, column in enumerate((self.window_args.trg_col_moving_avg,
+                                        self.window_args.trg_col_volatility,
+                                        self.window_args.trg_col_vwap)):
+            df_windows[column] = indicators[:, index]
+        self.window_update = (df_sums, run_dates[-1], df_base, base_as_of,
+                              {day: df_day.drop(columns=[REPORT_ROW])
+                               for day, df_day in days.items()},
+                              window_dates + run_dates)
+        self._logger.info('Computing the window indicators finished...')
+        return df_windows.round(decimals=2).reset_index(drop=True)
+
+    def _report_days(self, df_report: pd.DataFrame):
+        """
+        Returns the closing price, traded volume and turnover of the days of report 1
+
+        Parameters:
+          df_report: Pandas DataFrame with the columns of report 1 the indicators need
+        """
+        src_args = self.trade_etl.src_args
+        trg_args = self.trade_etl.trg_args
+        dates = df_report[src_args.src_col_date]
+        if pd.api.types.is_datetime64_any_dtype(dates):
+            dates = dates.dt.strftime(MetaProcessFormat.META_DATE_FORMAT.value)
+        return pd.DataFrame({
+            WindowStateFormat.STATE_ISIN_COL.value:
+                df_report[src_args.src_col_isin].astype(str).to_numpy(),
+            WindowStateFormat.STATE_DATE_COL.value: dates.astype(str).to_numpy(),
+            WindowStateFormat.STATE_CLOSE_COL.value:
+                df_report[trg_args.trg_col_clos_price].to_numpy(),
+            WindowStateFormat.STATE_VOLUME_COL.value:
+                df_report[trg_args.trg_col_dail_trad_vol].to_numpy(),
+            WindowStateFormat.STATE_TURNOVER_COL.value: (
+                (df_report[trg_args.trg_col_max_price] + df_report[trg_args.trg_col_min_price]
+                 + df_report[trg_args.trg_col_clos_price]) / 3
+                * df_report[trg_args.trg_col_dail_trad_vol]).to_numpy(),
+            WindowStateFormat.STATE_RETURN_COL.value: np.nan,
+            REPORT_ROW: np.arange(len(df_report))})
+
+    def _base_state(self, first_date: str):
+        """
+        Returns the sums per ISIN the run starts from
+
+        The state has the sums as of the last run and as of the run before. If
+        the last run is not before the first day of the run, its meta file update
+        did not succeed and the run starts from the sums before it.
+
+        Parameters:
+          first_date: first date of the run ('YYYY-MM-DD')
+
+        Returns:
+          df_sums: Pandas DataFrame with the SUM_COLUMNS indexed by ISIN
+          as_of: date the sums are as of, None without sums
+        """
+        df_state = self.window_state
+        if df_state is not None:
+            date_col = WindowStateFormat.STATE_DATE_COL.value
+            versions = sorted(df_state[date_col].unique(), reverse=True)
+            for as_of in versions:
+                if as_of < first_date:
+                    if as_of != versions[0]:
+                        self._logger.info('The rolling window state is ahead of the meta '
+                                          'file, the state before the last run is used.')
+                    return df_state[df_state[date_col] == as_of]\
+                        .set_index(WindowStateFormat.STATE_ISIN_COL.value)[SUM_COLUMNS], as_of
+            self._logger.info('The rolling window state is ahead of the meta file '
+                              'and is not used.')
+        return pd.DataFrame(columns=SUM_COLUMNS, dtype='float64'), None
+
+    @staticmethod
+    def _add_day(df_sums: pd.DataFrame, df_day: pd.DataFrame, sign: int):
+        """
+        Adds the values of a day to the sums of its ISINs or subtracts them
+
+        Parameters:
+          df_sums: Pandas DataFrame with the SUM_COLUMNS indexed by ISIN,
+                   with a row for every ISIN of the day
+          df_day: Pandas DataFrame with the columns of a day file
+          sign: 1 to add the day, -1 to subtract it
+        """
+        isins = df_day[WindowStateFormat.STATE_ISIN_COL.value].to_numpy()
+        log_return = df_day[WindowStateFormat.STATE_RETURN_COL.value].to_numpy()
+        has_return = ~np.isnan(log_return)
+        log_return = np.where(has_return, log_return, 0)
+        columns = SUM_COLUMNS[1:]
+        values = np.column_stack([
+            np.ones(len(df_day)),
+            df_day[WindowStateFormat.STATE_CLOSE_COL.value].to_numpy(),
+            df_day[WindowStateFormat.STATE_VOLUME_COL.value].to_numpy(),
+            df_day[WindowStateFormat.STATE_TURNOVER_COL.value].to_numpy(),
+            has_return, log_return, log_return ** 2])
+        df_sums.loc[isins, columns] = df_sums.loc[isins, columns].fillna(0).to_numpy() \
+            + sign * values
+        # Sums of a window without values are reset, the rounding errors of the
+        # subtractions are not carried on
+        for count_col, sum_cols in DAY_SUMS.items():
+            empty = df_sums[count_col] == 0
+            df_sums.loc[empty, sum_cols] = 0.0
+        return df_sums
+
+    def _indicators(self, df_sums: pd.DataFrame):
+        """
+        Returns the moving average, volatility in % and VWAP of the sums, NaN
+        if the window has less than trg_min_days days or log returns
+        """
+        min_days = self.window_args.trg_min_days or self.window_args.trg_window_days
+        n_days = df_sums[WindowStateFormat.STATE_DAYS_COL.value].to_numpy()
+        n_returns = df_sums[WindowStateFormat.STATE_RETURNS_COL.value].to_numpy()
+        return_sum = df_sums[WindowStateFormat.STATE_RETURN_SUM_COL.value].to_numpy()
+        with np.errstate(divide='ignore', invalid='ignore'):
+            moving_avg = df_sums[WindowStateFormat.STATE_CLOSE_SUM_COL.value].to_numpy() / n_days
+            variance = (df_sums[WindowStateFormat.STATE_RETURN_SQ_SUM_COL.value].to_numpy()
+                        - return_sum ** 2 / n_returns) / (n_returns - 1)
+            volatility = np.sqrt(np.maximum(variance, 0)) * 100
+            vwap = df_sums[WindowStateFormat.STATE_TURNOVER_SUM_COL.value].to_numpy() \
+                / df_sums[WindowStateFormat.STATE_VOLUME_SUM_COL.value].to_numpy()
+        enough_days = n_days >= min_days
+        return np.column_stack([
+            np.where(enough_days, moving_avg, np.nan),
+            np.where((n_returns >= min_days) & (n_returns > 1), volatility, np.nan),
+            np.where(enough_days, vwap, np.nan)])
+
+    def load(self, df_windows: pd.DataFrame):
+        """
+        Saves the window indicators and the window state to the target
+
+        Parameter
+          df_windows: Pandas DataFrame of the transform method
+        """
+        target_key, compression = create_target_key(
+            self.window_args.trg_key, self.window_args.trg_key_date_format,
+            self.window_args.trg_format, self.window_args.trg_compression)
+        self.trade_etl.s3_bucket_trg.write_df_to_s3(df_windows, target_key,
+                                                    self.window_args.trg_format,
+                                                    compression=compression,
+                                                    parquet_options=parquet_write_options(
+                                                        self.trade_etl.trg_args))
+        self._logger.info('Trade window indicators successfully written.')
+        if self.window_update is not None:
+            df_sums, as_of, df_base, base_as_of, days, keep_dates = self.window_update
+            # The day files are written before and removed after the sums that need them
+            WindowState.write_days(days, self.window_args.trg_state_key,
+                                   self.trade_etl.s3_bucket_trg)
+            WindowState.write_state(df_sums, as_of, df_base, base_as_of,
+                                    self.window_args.trg_state_key,
+                                    self.trade_etl.s3_bucket_trg)
+            WindowState.remove_days(keep_dates, self.window_args.trg_state_key,
+                                    self.trade_etl.s3_bucket_trg)
+            self._logger.info('Trade rolling window state successfully updated.')
+        return True